@@ -7,9 +7,18 @@ meta_article_data.csv의 Title을 기준으로 abstract-depression-set.txt에서
 해당하는 abstract를 찾아서 매칭합니다.
 """
 
+import argparse
 import csv
+import hashlib
+import heapq
+import json
+import math
 import os
 import re
+import sqlite3
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from difflib import SequenceMatcher
 
@@ -32,54 +41,239 @@ def normalize_title(title):
     
     return normalized
 
+# 키워드 추출 시 제외할 일반적인 stopwords
+STOPWORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
+    'of', 'with', 'by', 'from', 'up', 'about', 'into', 'through', 'during',
+    'before', 'after', 'above', 'below', 'between', 'among', 'is', 'are',
+    'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does',
+    'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can',
+    'using', 'based', 'study', 'research', 'analysis', 'trial', 'systematic',
+    'review', 'meta'
+})
+
 def extract_keywords(title, min_length=4):
     """제목에서 핵심 키워드 추출"""
     if not title:
         return []
     
-    # 일반적인 stopwords 제거
-    stopwords = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-        'of', 'with', 'by', 'from', 'up', 'about', 'into', 'through', 'during',
-        'before', 'after', 'above', 'below', 'between', 'among', 'is', 'are',
-        'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does',
-        'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can',
-        'using', 'based', 'study', 'research', 'analysis', 'trial', 'systematic',
-        'review', 'meta'
-    }
-    
     normalized = normalize_title(title)
     words = normalized.split()
     
     # stopwords가 아니고 최소 길이 이상인 단어들만 추출
-    keywords = [word for word in words if word not in stopwords and len(word) >= min_length]
+    keywords = [word for word in words if word not in STOPWORDS and len(word) >= min_length]
     
     return keywords
 
-def calculate_similarity(title1, title2):
-    """두 제목 간의 유사도 계산"""
-    # 정규화된 제목으로 직접 비교
-    norm1 = normalize_title(title1)
-    norm2 = normalize_title(title2)
+# 제목 하나의 매칭용 특징 (정규화 문자열, 키워드 집합, 키워드 문자 trigram 집합)
+TitleFeatures = namedtuple('TitleFeatures', ['normalized', 'keywords', 'grams'])
+
+# 특징 계산 설정 (키워드 최소 길이, 문자 n-gram 길이)
+FEATURE_KEYWORD_MIN_LENGTH = 4
+FEATURE_GRAM_SIZE = 3
+
+# normalize_title/build_title_features의 계산 방식을 바꾸면 올려서 저장된 특징 캐시를 버림
+FEATURE_CACHE_VERSION = 1
+
+def build_title_features(title):
+    """제목의 매칭용 특징을 한 번에 계산"""
+    normalized = normalize_title(title)
+    words = normalized.split()
+    keywords = [word for word in words
+                if word not in STOPWORDS and len(word) >= FEATURE_KEYWORD_MIN_LENGTH]
+    
+    # 키워드가 없으면 모든 단어의 trigram 사용
+    grams = set()
+    for word in keywords or words:
+        padded = f' {word} '
+        for i in range(len(padded) - FEATURE_GRAM_SIZE + 1):
+            grams.add(padded[i:i + FEATURE_GRAM_SIZE])
+    
+    return TitleFeatures(normalized, frozenset(keywords), frozenset(grams))
+
+def similarity_from_features(features1, features2, matcher=None):
+    """
+    미리 계산한 특징으로 calculate_similarity와 같은 유사도 계산
     
+    matcher에 features2.normalized를 seq2로 둔 SequenceMatcher를 넘기면 seq2 분석 결과를 재사용한다.
+    """
     # 완전 일치
-    if norm1 == norm2:
+    if features1.normalized == features2.normalized:
         return 1.0
     
     # 시퀀스 매처로 유사도 계산
-    similarity = SequenceMatcher(None, norm1, norm2).ratio()
-    
-    # 키워드 기반 유사도도 계산
-    keywords1 = set(extract_keywords(title1))
-    keywords2 = set(extract_keywords(title2))
+    if matcher is None:
+        matcher = SequenceMatcher(None, features1.normalized, features2.normalized)
+    else:
+        matcher.set_seq1(features1.normalized)
+    similarity = matcher.ratio()
     
+    # 키워드 기반 유사도와 가중 평균
+    keywords1, keywords2 = features1.keywords, features2.keywords
     if keywords1 and keywords2:
-        keyword_similarity = len(keywords1.intersection(keywords2)) / len(keywords1.union(keywords2))
-        # 전체 유사도와 키워드 유사도의 가중 평균
+        keyword_similarity = len(keywords1 & keywords2) / len(keywords1 | keywords2)
         similarity = (similarity * 0.6) + (keyword_similarity * 0.4)
     
     return similarity
 
+def feature_cache_key():
+    """특징 캐시 키 (캐시 버전과 STOPWORDS, 키워드 최소 길이, n-gram 길이의 해시)"""
+    params = {
+        'version': FEATURE_CACHE_VERSION,
+        'stopwords': sorted(STOPWORDS),
+        'keyword_min_length': FEATURE_KEYWORD_MIN_LENGTH,
+        'gram_size': FEATURE_GRAM_SIZE
+    }
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()
+
+def build_feature_store(abstracts_dict, cache_path=None):
+    """
+    abstracts_dict 제목들의 특징 저장소 생성 (정규화 제목 -> TitleFeatures)
+    
+    cache_path가 있으면 저장된 특징을 불러와 재사용한다. 특징 계산 설정이 바뀐 캐시는 버리고,
+    캐시 내용이 abstracts_dict의 제목들과 달라졌을 때만 현재 제목들의 특징으로 다시 저장한다.
+    """
+    cached = {}
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or data.get('feature_key') != feature_cache_key():
+                print(f"⚠️  제목 특징 캐시의 계산 설정이 달라 다시 계산합니다: {cache_path}")
+            else:
+                for title, (normalized, keywords, grams) in data['titles'].items():
+                    cached[title] = TitleFeatures(normalized, frozenset(keywords), frozenset(grams))
+                print(f"📦 제목 특징 캐시 로드: {len(cached)}개 ({cache_path})")
+        except Exception as e:
+            print(f"⚠️  제목 특징 캐시 로드 실패: {e}")
+            cached = {}
+    
+    store = {}
+    computed = 0
+    for title in abstracts_dict:
+        if title in cached:
+            store[title] = cached[title]
+        else:
+            store[title] = build_title_features(title)
+            computed += 1
+    
+    # 새 제목이 있거나 현재 제목에 없는 항목이 캐시에 남아 있으면 현재 제목들만 저장
+    if cache_path and (computed or len(cached) != len(store) - computed):
+        save_feature_store(store, cache_path)
+    
+    return store
+
+def save_feature_store(store, cache_path):
+    """특징 저장소를 JSON으로 저장 (특징 계산 설정 키 포함)"""
+    cache_dir = os.path.dirname(cache_path)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    serializable = {
+        'feature_key': feature_cache_key(),
+        'titles': {
+            title: [features.normalized, sorted(features.keywords), sorted(features.grams)]
+            for title, features in store.items()
+        }
+    }
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(serializable, f, ensure_ascii=False)
+    print(f"💾 제목 특징 캐시 저장: {len(store)}개 ({cache_path})")
+
+def calculate_similarity(title1, title2):
+    """두 제목 간의 유사도 계산"""
+    return similarity_from_features(build_title_features(title1), build_title_features(title2))
+
+class TitleIndex:
+    """
+    제목 퍼지 매칭용 문자 trigram 역색인
+    
+    abstracts_dict 전체를 한 번만 색인하고, 질의 제목과 trigram을 많이 공유하는 상위 top_k개 후보에 대해서만
+    정확한 유사도를 계산한다. 제목 특징은 features(build_feature_store 결과)를 재사용한다.
+    """
+    
+    def __init__(self, abstracts_dict, top_k=50, max_posting_ratio=0.1, features=None):
+        if features is None:
+            features = build_feature_store(abstracts_dict)
+        
+        self.titles = list(abstracts_dict.keys())
+        self.records = list(abstracts_dict.values())
+        self.features = [features[title] for title in self.titles]
+        self.top_k = top_k
+        self._matchers = {}
+        
+        self.postings = defaultdict(list)
+        for title_id, title_features in enumerate(self.features):
+            for gram in title_features.grams:
+                self.postings[gram].append(title_id)
+        
+        # 너무 흔한 trigram은 후보 선별에 도움이 안 되므로 다른 trigram이 있으면 건너뜀
+        total = len(self.titles)
+        self.max_posting = max(50, int(total * max_posting_ratio))
+        self.weights = {gram: math.log(1 + total / len(ids)) for gram, ids in self.postings.items()}
+    
+    def candidates(self, query_features):
+        """trigram 가중 공유 점수 상위 top_k개 후보 id (공유 점수가 높은 순)"""
+        grams = [gram for gram in query_features.grams if gram in self.postings]
+        selective = [gram for gram in grams if len(self.postings[gram]) <= self.max_posting]
+        
+        scores = defaultdict(float)
+        for gram in selective or grams:
+            weight = self.weights[gram]
+            for title_id in self.postings[gram]:
+                scores[title_id] += weight
+        
+        top = heapq.nlargest(self.top_k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [title_id for title_id, _ in top]
+    
+    def closest(self, normalized_title):
+        """
+        후보 중 가장 유사한 레코드와 유사도 (후보가 없으면 (None, 0))
+        
+        SequenceMatcher의 빠른 상한(real_quick_ratio, quick_ratio)으로 현재 최고 점수를 넘을 수 없는
+        후보는 정확한 비교를 생략한다. 동점이면 abstracts_dict에서 앞선 제목을 고른다.
+        """
+        query_features = build_title_features(normalized_title)
+        closest_id = None
+        closest_similarity = 0
+        
+        for title_id in self.candidates(query_features):
+            candidate = self.features[title_id]
+            
+            if candidate.normalized == query_features.normalized:
+                similarity = 1.0
+            else:
+                # 후보 제목별 SequenceMatcher를 재사용해 seq2 분석을 한 번만 수행
+                matcher = self._matchers.get(title_id)
+                if matcher is None:
+                    matcher = SequenceMatcher(None, '', candidate.normalized)
+                    self._matchers[title_id] = matcher
+                matcher.set_seq1(query_features.normalized)
+                
+                if closest_id is not None:
+                    keyword_bound = None
+                    if query_features.keywords and candidate.keywords:
+                        keyword_bound = (len(query_features.keywords & candidate.keywords) /
+                                         len(query_features.keywords | candidate.keywords))
+                    
+                    def cannot_win(ratio_bound):
+                        bound = ratio_bound if keyword_bound is None else ratio_bound * 0.6 + keyword_bound * 0.4
+                        return bound < closest_similarity or (bound == closest_similarity and title_id > closest_id)
+                    
+                    if cannot_win(matcher.real_quick_ratio()) or cannot_win(matcher.quick_ratio()):
+                        continue
+                
+                similarity = similarity_from_features(query_features, candidate, matcher)
+            
+            if (similarity > closest_similarity or
+                    (similarity == closest_similarity and closest_id is not None and title_id < closest_id)):
+                closest_similarity = similarity
+                closest_id = title_id
+        
+        if closest_id is None:
+            return None, 0
+        return self.records[closest_id], closest_similarity
+
 def parse_single_record_v2(record_text, number):
     """
     extract_abstract_v2.py의 파싱 로직 재사용
@@ -220,73 +414,341 @@ def parse_single_record_v2(record_text, number):
                 abstract = re.sub(r'\s+', ' ', raw_abstract).strip()
                 break
     
+    # 5. PMID 추출
+    pmid_match = re.search(r'^PMID:\s*(\d+)', record_text, re.MULTILINE)
+    pmid = pmid_match.group(1) if pmid_match else None
+    
     return {
         'number': number,
         'title': title,
         'abstract': abstract,
-        'doi': doi
+        'doi': doi,
+        'pmid': pmid
     }
 
-def load_abstracts_from_text(text_file_path):
-    """abstract-depression-set.txt에서 모든 abstract 로드"""
+RECORD_HEADER = re.compile(r'(\d+)\.\s')
+
+def iter_record_texts(text_file_path):
+    """
+    텍스트 덤프를 한 줄씩 읽으며 순차 번호 레코드의 (번호, 레코드 텍스트)를 하나씩 반환
+    
+    "1. ", "2. " ... 처럼 기대하는 다음 번호로 시작하는 줄만 레코드 경계로 보므로
+    본문 중간의 번호 목록은 기존과 같이 무시된다. 메모리에는 현재 레코드 하나만 유지한다.
+    """
+    expected_num = 1
+    current_num = None
+    current_lines = []
+    
+    with open(text_file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            header = RECORD_HEADER.match(line)
+            if header and int(header.group(1)) == expected_num:
+                if current_num is not None:
+                    yield current_num, ''.join(current_lines).strip()
+                current_num = expected_num
+                current_lines = [line]
+                expected_num += 1
+            elif current_num is not None:
+                current_lines.append(line)
+    
+    if current_num is not None:
+        yield current_num, ''.join(current_lines).strip()
+
+def iter_abstract_records(text_file_path):
+    """텍스트 덤프에서 제목이 있는 레코드를 파싱되는 대로 하나씩 반환"""
+    for number, record_text in iter_record_texts(text_file_path):
+        try:
+            result = parse_single_record_v2(record_text, number)
+        except Exception as e:
+            print(f"Error parsing record {number}: {e}")
+            continue
+        
+        if result and result['title']:
+            yield result
+
+LONE_CR = re.compile(rb'\r(?!\n)')
+
+def find_record_byte_ranges(text_file_path):
+    """
+    순차 번호 레코드의 (번호, 시작 바이트, 끝 바이트) 목록
+    
+    텍스트 모드와 같이 \\r\\n, \\n, 단독 \\r을 모두 줄 경계로 보고 iter_record_texts와 같은 경계를 찾는다.
+    """
+    starts = []
+    expected_num = 1
+    offset = 0
+    
+    with open(text_file_path, 'rb') as f:
+        for raw_line in f:
+            line_starts = [0] + [m.end() for m in LONE_CR.finditer(raw_line)]
+            for line_start in line_starts:
+                prefix = raw_line[line_start:line_start + 32].decode('utf-8', errors='ignore')
+                header = RECORD_HEADER.match(prefix)
+                if header and int(header.group(1)) == expected_num:
+                    starts.append((expected_num, offset + line_start))
+                    expected_num += 1
+            offset += len(raw_line)
+    
+    return [
+        (number, start, starts[i + 1][1] if i + 1 < len(starts) else offset)
+        for i, (number, start) in enumerate(starts)
+    ]
+
+def parse_record_range(args):
+    """워커에서 레코드 바이트 구간 묶음을 읽어 파싱 (제목이 있는 결과만 순서대로 반환)"""
+    text_file_path, ranges = args
+    if not ranges:
+        return []
+    
+    base = ranges[0][1]
+    with open(text_file_path, 'rb') as f:
+        f.seek(base)
+        data = f.read(ranges[-1][2] - base)
+    
+    results = []
+    for number, start, end in ranges:
+        record_text = data[start - base:end - base].decode('utf-8')
+        record_text = record_text.replace('\r\n', '\n').replace('\r', '\n').strip()
+        try:
+            result = parse_single_record_v2(record_text, number)
+        except Exception as e:
+            print(f"Error parsing record {number}: {e}")
+            continue
+        
+        if result and result['title']:
+            results.append(result)
+    return results
+
+def load_abstracts_from_text(text_file_path, workers=1):
+    """
+    abstract-depression-set.txt에서 모든 abstract 로드
+    
+    workers가 1보다 크면 레코드 바이트 구간을 연속된 묶음으로 나눠 프로세스 풀에서 파싱하고,
+    묶음 순서대로 병합해 순차 파싱과 같은 결과를 만든다.
+    """
+    if workers > 1:
+        return load_abstracts_parallel(text_file_path, workers)
+    
+    print("📖 abstract-depression-set.txt에서 데이터 파싱 중...")
+    
+    abstracts_dict = {}
+    record_count = 0
+    
     try:
-        with open(text_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        for number, record_text in iter_record_texts(text_file_path):
+            record_count += 1
+            
+            # 진행 상황 표시 (100개마다)
+            if record_count % 100 == 0 or record_count == 1:
+                print(f"  📊 Abstract 파싱 진행: {record_count}개 레코드")
+            
+            try:
+                result = parse_single_record_v2(record_text, number)
+                if result and result['title']:
+                    abstracts_dict[normalize_title(result['title'])] = result
+            except Exception as e:
+                print(f"Error parsing record {number}: {e}")
+                continue
     except Exception as e:
         print(f"Error reading {text_file_path}: {e}")
         return {}
     
-    print("📖 abstract-depression-set.txt에서 데이터 파싱 중...")
-    
-    # V2 파서와 동일한 로직으로 레코드 분할
-    record_positions = []
-    for match in re.finditer(r'^(\d+)\.\s+', content, re.MULTILINE):
-        number = int(match.group(1))
-        start_pos = match.start()
-        record_positions.append((start_pos, number))
+    print(f"✅ {record_count}개의 순차적 레코드 파싱 완료")
+    print(f"📚 {len(abstracts_dict)}개의 제목-추상 매핑 생성")
+    return abstracts_dict
+
+def parse_records_parallel(text_file_path, workers):
+    """프로세스 풀로 레코드를 병렬 파싱해 제목이 있는 레코드를 파일 순서대로 반환"""
+    ranges = find_record_byte_ranges(text_file_path)
+    print(f"✅ {len(ranges)}개의 순차적 레코드 발견")
     
-    # 순차적 번호만 필터링
-    sequential_positions = []
-    expected_num = 1
+    # 워커당 여러 묶음으로 나눠 레코드 길이 편차에 따른 부하 불균형 완화
+    chunk_count = min(len(ranges), workers * 4) or 1
+    chunk_size = -(-len(ranges) // chunk_count)
+    chunks = [(text_file_path, ranges[i:i + chunk_size]) for i in range(0, len(ranges), chunk_size)]
     
-    for pos, num in record_positions:
-        if num == expected_num:
-            sequential_positions.append((pos, num))
-            expected_num += 1
+    records = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map은 제출 순서대로 결과를 돌려주므로 파일 순서가 유지됨
+        for done, results in enumerate(executor.map(parse_record_range, chunks), 1):
+            records.extend(results)
+            print(f"  📊 Abstract 파싱 진행: {done}/{len(chunks)} 묶음")
+    return records
+
+def load_abstracts_parallel(text_file_path, workers):
+    """프로세스 풀로 레코드를 병렬 파싱해 제목-추상 매핑 생성"""
+    print(f"📖 abstract-depression-set.txt에서 데이터 병렬 파싱 중... (워커 {workers}개)")
     
-    print(f"✅ {len(sequential_positions)}개의 순차적 레코드 발견")
+    try:
+        records = parse_records_parallel(text_file_path, workers)
+    except Exception as e:
+        print(f"Error reading {text_file_path}: {e}")
+        return {}
     
-    # 각 레코드 파싱
+    # 같은 제목은 순차 파싱과 같이 뒤 레코드가 덮어씀
     abstracts_dict = {}
-    total_records = len(sequential_positions)
+    for record in records:
+        abstracts_dict[normalize_title(record['title'])] = record
     
-    for i, (start_pos, number) in enumerate(sequential_positions):
-        # 진행 상황 표시 (100개마다)
-        if (i + 1) % 100 == 0 or i == 0:
-            progress = ((i + 1) / total_records) * 100
-            print(f"  📊 Abstract 파싱 진행: {i + 1}/{total_records} ({progress:.1f}%)")
+    print(f"📚 {len(abstracts_dict)}개의 제목-추상 매핑 생성")
+    return abstracts_dict
+
+def file_sha256(path):
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class AbstractIndex:
+    """
+    파싱된 abstract 레코드의 SQLite 색인
+    
+    원본 덤프별로 크기, 수정 시각, 내용 해시를 기록해 두고 바뀐 덤프만 다시 파싱한다.
+    크기와 수정 시각이 같으면 해시 계산도 생략하고, 수정 시각만 바뀐 경우에는 해시로 내용 변경 여부를 확인한다.
+    """
+    
+    # 레코드 필드나 파싱 규칙이 바뀌면 올려서 기존 색인을 다시 만들게 함
+    SCHEMA_VERSION = 2
+    
+    def __init__(self, index_path):
+        index_dir = os.path.dirname(index_path)
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
         
-        try:
-            # 레코드 끝 위치 결정
-            if i < len(sequential_positions) - 1:
-                end_pos = sequential_positions[i + 1][0]
-            else:
-                end_pos = len(content)
+        self.conn = sqlite3.connect(index_path)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self.conn.executescript("DROP TABLE IF EXISTS sources; DROP TABLE IF EXISTS records;")
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                sha256 TEXT NOT NULL,
+                record_count INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS records (
+                source TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                number INTEGER,
+                title TEXT,
+                abstract TEXT,
+                doi TEXT,
+                pmid TEXT,
+                PRIMARY KEY (source, seq)
+            );
+        """)
+        self.conn.commit()
+    
+    def ensure_source(self, text_file_path, workers=1):
+        """덤프가 색인에 최신 상태로 있는지 확인하고, 없거나 바뀌었으면 파싱해 저장 (재파싱 여부 반환)"""
+        source = os.path.abspath(text_file_path)
+        stat = os.stat(source)
+        row = self.conn.execute(
+            "SELECT size, mtime, sha256 FROM sources WHERE path = ?", (source,)
+        ).fetchone()
+        
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime:
+            return False
+        
+        sha256 = file_sha256(source)
+        if row and row[0] == stat.st_size and row[2] == sha256:
+            # 내용은 같고 수정 시각만 바뀐 경우
+            self.conn.execute("UPDATE sources SET mtime = ? WHERE path = ?", (stat.st_mtime, source))
+            self.conn.commit()
+            return False
+        
+        print(f"📖 색인 갱신: {text_file_path} 파싱 중...")
+        if workers > 1:
+            records = parse_records_parallel(source, workers)
+        else:
+            records = list(iter_abstract_records(source))
+        
+        with self.conn:
+            self.conn.execute("DELETE FROM records WHERE source = ?", (source,))
+            self.conn.executemany(
+                "INSERT INTO records (source, seq, number, title, abstract, doi, pmid) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(source, seq, r['number'], r['title'], r['abstract'], r['doi'], r['pmid'])
+                 for seq, r in enumerate(records)]
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sources (path, size, mtime, sha256, record_count) VALUES (?, ?, ?, ?, ?)",
+                (source, stat.st_size, stat.st_mtime, sha256, len(records))
+            )
+        print(f"💾 색인 저장: {len(records)}개 레코드")
+        return True
+    
+    def load_records(self, text_file_path):
+        """덤프 하나의 레코드를 파일 순서대로 반환"""
+        source = os.path.abspath(text_file_path)
+        rows = self.conn.execute(
+            "SELECT number, title, abstract, doi, pmid FROM records WHERE source = ? ORDER BY seq", (source,)
+        )
+        return [{'number': number, 'title': title, 'abstract': abstract, 'doi': doi, 'pmid': pmid}
+                for number, title, abstract, doi, pmid in rows]
+    
+    def close(self):
+        self.conn.close()
+
+def load_abstracts_indexed(text_file_paths, index_path, workers=1):
+    """
+    여러 덤프를 색인을 통해 로드해 하나의 제목-추상 매핑으로 합침
+    
+    새로 추가되었거나 내용이 바뀐 덤프만 파싱하고, 같은 제목은 뒤에 오는 덤프의 레코드가 덮어쓴다.
+    """
+    index = AbstractIndex(index_path)
+    abstracts_dict = {}
+    
+    try:
+        for text_file_path in text_file_paths:
+            try:
+                reparsed = index.ensure_source(text_file_path, workers=workers)
+            except Exception as e:
+                print(f"Error reading {text_file_path}: {e}")
+                continue
             
-            record_text = content[start_pos:end_pos].strip()
+            records = index.load_records(text_file_path)
+            if not reparsed:
+                print(f"📦 색인에서 로드: {text_file_path} ({len(records)}개 레코드)")
             
-            # 파싱 실행
-            result = parse_single_record_v2(record_text, number)
-            if result and result['title']:
-                abstracts_dict[normalize_title(result['title'])] = result
-                
-        except Exception as e:
-            print(f"Error parsing record {number}: {e}")
-            continue
+            for record in records:
+                abstracts_dict[normalize_title(record['title'])] = record
+    finally:
+        index.close()
     
     print(f"📚 {len(abstracts_dict)}개의 제목-추상 매핑 생성")
     return abstracts_dict
 
+def benchmark_parsing(text_file_path, worker_counts=(1, 2, 4), repeat=3):
+    """순차/병렬 파싱 시간 비교 (각 설정의 최소 시간과 순차 대비 속도 향상 출력)"""
+    print(f"\n⏱️  파싱 벤치마크: {text_file_path} (반복 {repeat}회)")
+    
+    timings = {}
+    reference = None
+    for workers in worker_counts:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            abstracts_dict = load_abstracts_from_text(text_file_path, workers=workers)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        
+        if reference is None:
+            reference = abstracts_dict
+        elif abstracts_dict != reference:
+            print(f"⚠️  워커 {workers}개 결과가 순차 파싱과 다릅니다")
+        timings[workers] = best
+    
+    print(f"\n📊 === 파싱 벤치마크 결과 (CPU {os.cpu_count()}개) ===")
+    for workers, elapsed in timings.items():
+        print(f"  워커 {workers}개: {elapsed:.2f}초 (x{timings[worker_counts[0]] / elapsed:.2f})")
+    
+    return timings
+
 def load_meta_data(csv_file_path):
     """meta_article_data.csv 로드"""
     try:
@@ -297,12 +759,52 @@ def load_meta_data(csv_file_path):
         print(f"Error reading {csv_file_path}: {e}")
         return []
 
-def match_titles_and_extract(meta_data, abstracts_dict, similarity_threshold=0.7):
-    """제목 매칭 및 Abstract 추출"""
+def normalize_doi(doi):
+    """DOI 정규화 (소문자, doi.org URL/접두어와 끝 마침표 제거)"""
+    if not doi:
+        return ""
+    
+    normalized = doi.strip().lower()
+    normalized = re.sub(r'^(https?://(dx\.)?doi\.org/|doi:\s*)', '', normalized)
+    return normalized.rstrip('.')
+
+def build_identifier_indexes(abstracts_dict):
+    """
+    DOI/PMID -> 레코드 해시 색인 (같은 식별자가 여러 번 나오면 먼저 나온 레코드 사용)
+    
+    PMID 색인은 메타 데이터에 PMID 컬럼이 있을 때만 쓰인다 (PubMed CSV 내보내기 등).
+    기본 입력인 meta_article_empty_abstract_data.csv에는 PMID 컬럼이 없어 DOI로만 조인한다.
+    """
+    doi_index = {}
+    pmid_index = {}
+    for record in abstracts_dict.values():
+        doi = normalize_doi(record.get('doi'))
+        if doi:
+            doi_index.setdefault(doi, record)
+        pmid = (record.get('pmid') or '').strip()
+        if pmid:
+            pmid_index.setdefault(pmid, record)
+    return doi_index, pmid_index
+
+def match_titles_and_extract(meta_data, abstracts_dict, similarity_threshold=0.7, top_k=50,
+                             features=None):
+    """
+    제목 매칭 및 Abstract 추출
+    
+    DOI, PMID(메타 데이터에 PMID 컬럼이 있을 때) 해시 조인으로 먼저 매칭하고, 식별자로 찾지 못한 행만
+    정확한 제목 매칭과 퍼지 매칭(trigram 색인 상위 top_k개 후보만 비교)으로 넘긴다.
+    매칭 결과에는 meta_data의 행 번호(row_index)를 함께 기록한다.
+    features에 build_feature_store 결과를 넘기면 abstract 제목 전처리를 생략한다.
+    """
     
     print(f"\\n🔍 제목 매칭 시작 (임계값: {similarity_threshold})")
     
+    title_index = None
+    doi_index, pmid_index = build_identifier_indexes(abstracts_dict)
+    
     matches = {
+        'doi': [],
+        'pmid': [],
         'exact': [],
         'fuzzy': [],
         'no_match': []
@@ -326,8 +828,29 @@ def match_titles_and_extract(meta_data, abstracts_dict, similarity_threshold=0.7
             existing_abstracts += 1
             continue
         
+        # 0. DOI/PMID 해시 조인
+        identifier_stage = None
+        matched_data = doi_index.get(normalize_doi(row.get('DOI')))
+        if matched_data:
+            identifier_stage = 'doi'
+        else:
+            matched_data = pmid_index.get((row.get('PMID') or '').strip())
+            if matched_data:
+                identifier_stage = 'pmid'
+        
+        if identifier_stage:
+            row['Abstract'] = matched_data['abstract']
+            matches[identifier_stage].append({
+                'row_index': i,
+                'meta_title': meta_title,
+                'matched_title': matched_data['title'],
+                'similarity': 1.0
+            })
+            new_abstracts += 1
+            continue
+        
         if not meta_title:
-            matches['no_match'].append({'row': row, 'reason': 'Empty title'})
+            matches['no_match'].append({'row_index': i, 'row': row, 'reason': 'Empty title'})
             continue
         
         normalized_meta_title = normalize_title(meta_title)
@@ -340,6 +863,7 @@ def match_titles_and_extract(meta_data, abstracts_dict, similarity_threshold=0.7
                 row['DOI'] = matched_data['doi']
             
             matches['exact'].append({
+                'row_index': i,
                 'meta_title': meta_title,
                 'matched_title': matched_data['title'],
                 'similarity': 1.0
@@ -347,42 +871,29 @@ def match_titles_and_extract(meta_data, abstracts_dict, similarity_threshold=0.7
             new_abstracts += 1
             continue
         
-        # 2. 퍼지 매칭 시도
-        best_match = None
-        best_similarity = 0
+        # 2. 퍼지 매칭 시도 - 색인 후보 중 가장 유사한 제목을 한 번에 찾음
+        if title_index is None:
+            title_index = TitleIndex(abstracts_dict, top_k=top_k, features=features)
         
-        for abstract_title_norm, abstract_data in abstracts_dict.items():
-            similarity = calculate_similarity(normalized_meta_title, abstract_title_norm)
-            
-            if similarity > best_similarity and similarity >= similarity_threshold:
-                best_similarity = similarity
-                best_match = abstract_data
-        
-        if best_match:
-            row['Abstract'] = best_match['abstract']
-            if not row.get('DOI') and best_match.get('doi'):
-                row['DOI'] = best_match['doi']
+        closest_match, closest_similarity = title_index.closest(normalized_meta_title)
+        
+        if closest_match and closest_similarity >= similarity_threshold:
+            row['Abstract'] = closest_match['abstract']
+            if not row.get('DOI') and closest_match.get('doi'):
+                row['DOI'] = closest_match['doi']
             
             matches['fuzzy'].append({
+                'row_index': i,
                 'meta_title': meta_title,
-                'matched_title': best_match['title'],
-                'similarity': best_similarity
+                'matched_title': closest_match['title'],
+                'similarity': closest_similarity
             })
             new_abstracts += 1
         else:
             # 매칭 실패 시에도 가장 유사한 제목 기록 (검토용)
-            closest_match = None
-            closest_similarity = 0
-            
-            # 가장 유사한 제목 찾기 (임계값 미만이지만)
-            for abstract_title_norm, abstract_data in abstracts_dict.items():
-                similarity = calculate_similarity(normalized_meta_title, abstract_title_norm)
-                if similarity > closest_similarity:
-                    closest_similarity = similarity
-                    closest_match = abstract_data
-            
             matches['no_match'].append({
-                'row': row, 
+                'row_index': i,
+                'row': row,
                 'reason': f'No match above {similarity_threshold}',
                 'closest_match_title': closest_match['title'] if closest_match else '',
                 'closest_similarity': closest_similarity
@@ -392,6 +903,8 @@ def match_titles_and_extract(meta_data, abstracts_dict, similarity_threshold=0.7
     print(f"\\n📊 === 매칭 결과 통계 ===")
     print(f"📁 전체 메타 데이터: {len(meta_data)}")
     print(f"📈 기존 Abstract: {existing_abstracts}")
+    print(f"🔗 DOI 매칭: {len(matches['doi'])}")
+    print(f"🔗 PMID 매칭: {len(matches['pmid'])}")
     print(f"✅ 정확한 매칭: {len(matches['exact'])}")
     print(f"🔍 퍼지 매칭: {len(matches['fuzzy'])}")
     print(f"❌ 매칭 실패: {len(matches['no_match'])}")
@@ -415,19 +928,20 @@ def save_results(meta_data, matches, output_dir):
         base_fieldnames = list(meta_data[0].keys())
         extended_fieldnames = base_fieldnames + ['Matched_Title', 'Match_Type', 'Match_Similarity', 'Match_Status']
         
-        # 매칭 정보를 딕셔너리로 변환
-        exact_matches = {match['meta_title']: match for match in matches['exact']}
-        fuzzy_matches = {match['meta_title']: match for match in matches['fuzzy']}
-        no_matches = {item['row'].get('Title', ''): item for item in matches['no_match'] if 'row' in item}
+        # 매칭 정보를 행 번호 -> (매칭 유형, 매칭 정보) 딕셔너리로 변환
+        # (제목이 비었거나 같은 제목의 행이 여러 개여도 행마다 자기 매칭 정보를 씀)
+        row_matches = {}
+        for match_type, label in (('doi', 'DOI'), ('pmid', 'PMID'), ('exact', 'Exact'), ('fuzzy', 'Fuzzy')):
+            for match in matches.get(match_type, []):
+                row_matches[match['row_index']] = (label, match)
+        no_matches = {item['row_index']: item for item in matches['no_match']}
         
         try:
             with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
                 writer = csv.DictWriter(f, fieldnames=extended_fieldnames, quoting=csv.QUOTE_ALL)
                 writer.writeheader()
                 
-                for row in meta_data:
-                    title = row.get('Title', '')
-                    
+                for row_index, row in enumerate(meta_data):
                     # 원본 데이터를 복사하고 매칭 정보 추가
                     output_row = row.copy()
                     
@@ -436,27 +950,23 @@ def save_results(meta_data, matches, output_dir):
                         if isinstance(value, str):
                             # 너무 긴 텍스트 필드 체크 (10000자 이상)
                             if len(value) > 10000:
-                                print(f"⚠️  경고: 행 {meta_data.index(row)+1}, 필드 '{key}'가 비정상적으로 긺 ({len(value)}자)")
+                                print(f"⚠️  경고: 행 {row_index+1}, 필드 '{key}'가 비정상적으로 긺 ({len(value)}자)")
                                 # 첫 5000자만 유지
                                 output_row[key] = value[:5000] + "... [TRUNCATED]"
                             
                             # 개행 문자를 공백으로 변환
                             output_row[key] = value.replace('\n', ' ').replace('\r', ' ')
                     
-                    if title in exact_matches:
-                        output_row['Match_Type'] = 'Exact'
-                        output_row['Match_Similarity'] = exact_matches[title]['similarity']
-                        output_row['Match_Status'] = 'Success'
-                        output_row['Matched_Title'] = exact_matches[title]['matched_title']
-                    elif title in fuzzy_matches:
-                        output_row['Match_Type'] = 'Fuzzy'
-                        output_row['Match_Similarity'] = fuzzy_matches[title]['similarity']
+                    if row_index in row_matches:
+                        match_type, match = row_matches[row_index]
+                        output_row['Match_Type'] = match_type
+                        output_row['Match_Similarity'] = match['similarity']
                         output_row['Match_Status'] = 'Success'
-                        output_row['Matched_Title'] = fuzzy_matches[title]['matched_title']
-                    elif title in no_matches:
+                        output_row['Matched_Title'] = match['matched_title']
+                    elif row_index in no_matches:
                         output_row['Match_Type'] = 'None'
                         output_row['Match_Similarity'] = 0.0
-                        output_row['Match_Status'] = f"Failed: {no_matches[title]['reason']}"
+                        output_row['Match_Status'] = f"Failed: {no_matches[row_index]['reason']}"
                         output_row['Matched_Title'] = ''
                     else:
                         # 기존에 Abstract가 있었던 경우
@@ -508,23 +1018,44 @@ def save_results(meta_data, matches, output_dir):
 
 def main():
     """메인 함수"""
-    
-    print("=== 제목 기반 Abstract 추출 시작 ===")
+    parser = argparse.ArgumentParser(description='제목 기반 Abstract 추출')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='레코드 파싱에 사용할 프로세스 수 (기본: 1, 순차 파싱)')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='추출 대신 순차/병렬 파싱 속도만 비교')
+    parser.add_argument('--feature-cache', type=str, default=None,
+                        help='abstract 제목 특징을 저장/재사용할 JSON 경로')
+    parser.add_argument('--dumps', nargs='+', default=None,
+                        help='abstract 텍스트 덤프 경로들 (기본: abstract-depression-set.txt)')
+    parser.add_argument('--index', type=str, default=None,
+                        help='파싱 결과 색인 SQLite 경로 (기본: output/abstract_index.sqlite)')
+    parser.add_argument('--no-index', action='store_true',
+                        help='색인 없이 매번 덤프를 다시 파싱')
+    args = parser.parse_args()
     
     # 파일 경로 설정
     script_dir = os.path.dirname(os.path.abspath(__file__))
     meta_csv_path = os.path.join(script_dir, '../data/meta_article_empty_abstract_data.csv')
     abstracts_txt_path = os.path.join(script_dir, 'abstract-depression-set.txt')
     output_dir = os.path.join(script_dir, 'output')
+    dump_paths = args.dumps or [abstracts_txt_path]
+    index_path = args.index or os.path.join(output_dir, 'abstract_index.sqlite')
+    
+    if args.benchmark:
+        benchmark_parsing(abstracts_txt_path, worker_counts=(1, 2, max(4, args.workers)))
+        return
+    
+    print("=== 제목 기반 Abstract 추출 시작 ===")
     
     # 파일 존재 확인
     if not os.path.exists(meta_csv_path):
         print(f"Error: {meta_csv_path} 파일을 찾을 수 없습니다.")
         return
     
-    if not os.path.exists(abstracts_txt_path):
-        print(f"Error: {abstracts_txt_path} 파일을 찾을 수 없습니다.")
-        return
+    for dump_path in dump_paths:
+        if not os.path.exists(dump_path):
+            print(f"Error: {dump_path} 파일을 찾을 수 없습니다.")
+            return
     
     # 1. 데이터 로드
     print("\\n📁 데이터 로딩...")
@@ -534,13 +1065,20 @@ def main():
         return
     print(f"✅ 메타 데이터: {len(meta_data)} rows")
     
-    abstracts_dict = load_abstracts_from_text(abstracts_txt_path)
+    if args.no_index:
+        abstracts_dict = {}
+        for dump_path in dump_paths:
+            abstracts_dict.update(load_abstracts_from_text(dump_path, workers=args.workers))
+    else:
+        abstracts_dict = load_abstracts_indexed(dump_paths, index_path, workers=args.workers)
     if not abstracts_dict:
         print("Abstract 데이터 로딩 실패")
         return
     
     # 2. 제목 매칭 및 추출
-    matches = match_titles_and_extract(meta_data, abstracts_dict, similarity_threshold=0.7)
+    features = build_feature_store(abstracts_dict, cache_path=args.feature_cache)
+    matches = match_titles_and_extract(meta_data, abstracts_dict, similarity_threshold=0.7,
+                                       features=features)
     
     # 3. 결과 저장
     complete_file, failed_file = save_results(meta_data, matches, output_dir)
@@ -8,19 +8,33 @@ LLM 기반 2차 키워드 필터링 시스템
 """
 
 import pandas as pd
+import asyncio
 import json
+import hashlib
 import logging
 import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from dotenv import load_dotenv
 
+import tiktoken
+
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage
 from langchain_core.output_parsers import PydanticOutputParser
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from result_store import (KEYWORD_CATEGORIES, hybrid_result_stats, load_results, occurrence_key, paper_key,
+                          rescued_mask, save_results, unique_keywords, unique_paper_keys)
 
 # 환경변수 로드
 load_dotenv()
@@ -32,6 +46,32 @@ if sys.stdout.encoding != 'utf-8':
 if sys.stderr.encoding != 'utf-8':
     sys.stderr.reconfigure(encoding='utf-8')
 
+# 규칙 기반 결과 컬럼 (입력에 논문이 하나도 없을 때 결과 스키마용)
+RULE_RESULT_COLUMNS = ['DOI', 'Title', 'Authors', 'Journal/Book', 'Publication Year', 'Abstract',
+                       *(f"{category}_keywords" for category in KEYWORD_CATEGORIES), 'result']
+
+# LLM 응답 키 → 최종 결과 컬럼 (컬럼 순서대로)
+LLM_OUTPUT_COLUMNS = {
+    'depression_keywords': 'llm_depression_keywords',
+    'mobile_keywords': 'llm_mobile_keywords',
+    'behavioral_keywords': 'llm_behavioral_keywords',
+    'result': 'llm_result',
+    'depression_highlight': 'llm_depression_highlight',
+    'mobile_highlight': 'llm_mobile_highlight',
+    'behavioral_highlight': 'llm_behavioral_highlight',
+    'reason': 'llm_reason'
+}
+
+# 규칙 기반에서 이미 포함된 논문의 LLM 결과 컬럼 값
+INCLUDED_LLM_RESULT = {
+    'llm_result': 'not_processed',
+    'llm_reason': '이미 규칙 기반에서 포함됨',
+    'final_result': 'include'
+}
+
+# 스트리밍 재검토에서 LLM 검토 없이 끝난 행(include, 저널에서 재개)을 모아 한 번에 기록하는 최대 행 수
+STREAM_FLUSH_ROWS = 1000
+
 class LLMKeywordResult(BaseModel):
     """LLM 키워드 분석 결과 모델"""
     depression_keywords: str = Field(description="발견된 우울증 관련 키워드들 (쉼표로 구분)")
@@ -42,15 +82,405 @@ class LLMKeywordResult(BaseModel):
     mobile_highlight: str = Field(description="모바일/디지털 키워드가 발견된 원문 문장들")
     behavioral_highlight: str = Field(description="행동활성화/치료 키워드가 발견된 원문 문장들")
     reason: str = Field(description="포함/제외 판단의 구체적인 이유 (한글로 작성)")
+    
+    @field_validator('result')
+    @classmethod
+    def _check_result(cls, value: str) -> str:
+        """포함/제외 결정은 include 또는 exclude만 허용 (대소문자/공백 정규화)"""
+        value = value.strip().lower()
+        if value not in ('include', 'exclude'):
+            raise ValueError(f"알 수 없는 결정: {value!r}")
+        return value
+
+class LLMBatchKeywordResult(LLMKeywordResult):
+    """배치 요청에서 논문 하나의 분석 결과 (paper_id로 입력 논문과 매핑)"""
+    paper_id: str = Field(description="입력에 주어진 논문 ID (그대로 복사)")
+
+class LLMBatchResult(BaseModel):
+    """배치 요청 전체 결과"""
+    results: List[LLMBatchKeywordResult] = Field(description="입력 논문별 분석 결과 목록")
+
+class LLMResponseCache:
+    """
+    SQLite 기반 LLM 응답 캐시
+    
+    모델명, 렌더링된 프롬프트, temperature의 해시를 키로 파싱된 LLMKeywordResult를 저장한다.
+    배치 요청으로 얻은 결과는 단일 논문 프롬프트가 아니라 배치 표시가 붙은 배치 프롬프트(해당 논문 블록만
+    렌더링)를 키로 저장하므로, 단일 요청 실행은 배치 응답을 받지 않는다. 배치 요청을 보낼 때는 단일 키를 먼저
+    조회하고 없으면 배치 키를 조회한다 (배치 키는 배치 크기나 배치 내 위치와 무관).
+    항목 수가 max_entries를 넘으면 가장 오래 사용되지 않은 항목부터 삭제한다.
+    """
+    
+    def __init__(self, db_path: str = "cache/llm_response_cache.sqlite", max_entries: int = 100000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self.conn.commit()
+        self._size = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: Optional[float]) -> str:
+        """모델명, 렌더링된 프롬프트, temperature로 캐시 키 생성"""
+        payload = json.dumps([model, prompt, temperature], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """캐시 조회 (적중 시 마지막 사용 시각 갱신)"""
+        row = self.conn.execute("SELECT result FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        return json.loads(row[0])
+    
+    def put(self, key: str, model: str, result: Dict):
+        """파싱된 결과 저장 후 용량 초과분 삭제"""
+        now = time.time()
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO responses (key, model, result, created_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, model, json.dumps(result, ensure_ascii=False), now, now)
+        )
+        self._size += cursor.rowcount
+        
+        if self._size > self.max_entries:
+            overflow = self._size - self.max_entries
+            self.conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                (overflow,)
+            )
+            self._size -= overflow
+        
+        self.conn.commit()
+    
+    def stats(self) -> Dict[str, int]:
+        """적중/미스 횟수와 저장 항목 수"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': self._size}
+    
+    def close(self):
+        self.conn.close()
+
+class ReviewJournal:
+    """
+    LLM 2차 검토 결과의 추가 전용(JSONL) 체크포인트 저널
+    
+    논문별 결과를 검토가 끝나는 즉시 한 줄씩 덧붙이고, 논문 고유 ID(DOI, 없으면 제목 해시)로 조회한다.
+    같은 ID가 입력에 여러 번 나오면 두 번째부터 '#순번'을 붙인 ID로 따로 기록한다.
+    입력 순서가 바뀌거나 동시 작업이 순서 없이 끝나도 이미 검토한 논문만 정확히 건너뛸 수 있다.
+    """
+    
+    def __init__(self, path: str, flush_interval: int = 5):
+        self.path = path
+        self.flush_interval = max(1, flush_interval)
+        self.entries: Dict[str, Dict] = {}
+        self._file = None
+        self._unflushed = 0
+        
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 중단 시점에 덜 기록된 줄은 다시 검토
+                        continue
+                    self.entries[entry['paper_id']] = entry['result']
+    
+    @staticmethod
+    def paper_id(row) -> str:
+        """논문 고유 ID (정규화한 DOI, DOI가 없으면 정규화한 제목의 해시)"""
+        return paper_key(row)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def get(self, paper_id: str) -> Optional[Dict]:
+        return self.entries.get(paper_id)
+    
+    def append(self, paper_id: str, result: Dict):
+        """논문 결과 한 줄 추가 (flush_interval편마다 디스크에 반영)"""
+        if self._file is None:
+            # 덜 기록된 마지막 줄이 있으면 새 줄과 섞이지 않도록 줄바꿈부터 추가
+            needs_newline = False
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    needs_newline = f.read(1) != b'\n'
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if needs_newline:
+                self._file.write('\n')
+        
+        entry = {'paper_id': paper_id, 'result': result}
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=self._json_default) + '\n')
+        self.entries[paper_id] = result
+        
+        self._unflushed += 1
+        if self._unflushed >= self.flush_interval:
+            self.flush()
+    
+    @staticmethod
+    def _json_default(value):
+        # numpy 스칼라(연도 등)는 파이썬 값으로 저장
+        return value.item() if hasattr(value, 'item') else str(value)
+    
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+        self._unflushed = 0
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._unflushed = 0
+    
+    def remove(self):
+        """저널 닫고 파일 삭제 (전체 검토 완료 후)"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class StreamResultWriter:
+    """
+    스트리밍 LLM 2차 검토 결과를 창(window) 단위로 최종 결과 CSV에 이어서 기록
+    
+    첫 창에서 헤더(와 BOM)를 쓰고 이후 창은 같은 컬럼으로 맞춰 덧붙인다.
+    전체 결과 대신 hybrid_result_stats 누적 건수와 구제된 논문의 고유 키워드만 메모리에 유지한다.
+    """
+    
+    def __init__(self, path: Optional[str], header: Callable[[], List[str]]):
+        if path and Path(path).suffix.lower() != '.csv':
+            raise ValueError(f"스트리밍 재검토 결과는 CSV로만 저장할 수 있습니다: {path}")
+        self.path = path
+        self.header = header
+        self.columns: Optional[List[str]] = None
+        self.stats = {'total': 0, 'rule_include': 0, 'final_include': 0, 'final_exclude': 0,
+                      'llm_processed': 0, 'llm_rescued': 0}
+        self.rescued_keywords: Dict[str, List[str]] = {category: [] for category in KEYWORD_CATEGORIES}
+    
+    def write(self, rows: List[Dict]):
+        """결과 행 추가 (첫 기록에서 header()로 컬럼을 정함, path가 None이면 집계만)"""
+        is_first = self.columns is None
+        if is_first:
+            self.columns = self.header()
+        window = pd.DataFrame(rows).reindex(columns=self.columns)
+        
+        if self.path:
+            window.to_csv(self.path, mode='w' if is_first else 'a', header=is_first, index=False,
+                          encoding='utf-8-sig' if is_first else 'utf-8')
+        
+        for key, value in hybrid_result_stats(window).items():
+            self.stats[key] += value
+        for category, keywords in unique_keywords(window[rescued_mask(window)]).items():
+            known = self.rescued_keywords[category]
+            known.extend(keyword for keyword in keywords if keyword not in known)
+    
+    def close(self):
+        """기록한 창이 없으면 헤더만 있는 결과 파일 생성"""
+        if self.columns is None:
+            self.write([])
+
+class LLMRateLimiter:
+    """
+    분당 요청 수(RPM)와 분당 토큰 수(TPM) 기준 LLM 호출 스케줄러
+    
+    최근 60초 동안 보낸 요청과 토큰을 기록해 예산을 넘지 않도록 호출을 지연시키고,
+    속도 제한 오류가 나면 지터가 섞인 지수 백오프 동안 모든 호출을 함께 멈춘다.
+    """
+    
+    WINDOW_SECONDS = 60.0
+    
+    def __init__(self, model_name: str, requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None, expected_output_tokens: int = 1000,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.expected_output_tokens = expected_output_tokens
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        
+        self._history = deque()  # (시각, 토큰 수)
+        self._window_tokens = 0
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+        
+        try:
+            self.encoding = tiktoken.encoding_for_model(model_name)
+        except Exception:
+            try:
+                self.encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                # 인코딩 파일을 받을 수 없는 환경에서는 글자 수 기반 추정 사용
+                self.encoding = None
+    
+    def count_tokens(self, text: str, responses: int = 1) -> int:
+        """프롬프트 토큰 수 + 예상 출력 토큰 수 (responses개 결과 기준)"""
+        if self.encoding is not None:
+            prompt_tokens = len(self.encoding.encode(text, disallowed_special=()))
+        else:
+            prompt_tokens = len(text) // 4 + 1
+        return prompt_tokens + self.expected_output_tokens * responses
+    
+    def _reserve(self, tokens: int) -> float:
+        """예산 안이면 기록 후 0 반환, 아니면 기다려야 할 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._cooldown_until:
+                return self._cooldown_until - now
+            
+            while self._history and now - self._history[0][0] >= self.WINDOW_SECONDS:
+                self._window_tokens -= self._history.popleft()[1]
+            
+            wait = 0.0
+            if self.requests_per_minute and len(self._history) >= self.requests_per_minute:
+                oldest = self._history[len(self._history) - self.requests_per_minute][0]
+                wait = max(wait, oldest + self.WINDOW_SECONDS - now)
+            
+            if self.tokens_per_minute and self._history:
+                # 한 요청이 예산 전체보다 크면 창이 비었을 때 단독으로 보냄
+                excess = self._window_tokens + min(tokens, self.tokens_per_minute) - self.tokens_per_minute
+                if excess > 0:
+                    released = 0
+                    for sent_at, sent_tokens in self._history:
+                        released += sent_tokens
+                        if released >= excess:
+                            wait = max(wait, sent_at + self.WINDOW_SECONDS - now)
+                            break
+            
+            if wait > 0:
+                return wait
+            
+            self._history.append((now, tokens))
+            self._window_tokens += tokens
+            return 0.0
+    
+    def acquire(self, tokens: int):
+        """예산이 생길 때까지 대기 (동기)"""
+        wait = self._reserve(tokens)
+        while wait > 0:
+            time.sleep(wait)
+            wait = self._reserve(tokens)
+    
+    async def aacquire(self, tokens: int):
+        """예산이 생길 때까지 대기 (비동기)"""
+        wait = self._reserve(tokens)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self._reserve(tokens)
+    
+    @staticmethod
+    def is_rate_limit_error(error: Exception) -> bool:
+        """속도 제한(429) 오류 여부"""
+        if getattr(error, 'status_code', None) == 429 or type(error).__name__ == 'RateLimitError':
+            return True
+        message = str(error).lower()
+        return 'rate limit' in message or 'rate_limit' in message
+    
+    def backoff(self, attempt: int) -> float:
+        """지터가 섞인 지수 백오프 시간을 계산하고 그동안 모든 호출을 멈춤"""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(delay / 2, delay)
+        with self._lock:
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+        return delay
+
+class RuleEvidenceTriage:
+    """
+    규칙 기반 근거로 exclude 논문의 구제 가능성을 점수화하는 사전 선별기
+    
+    카테고리별로 규칙 기반 키워드가 있으면 1점, 없지만 제목/초록에 유사 어휘가 보이면 0.5점을 준다.
+    skip_below 미만은 LLM 검토 없이 제외하고, cheap_below 미만은 저렴한 모델로 보낸다.
+    """
+    
+    CATEGORY_COLUMNS = {
+        'depression': 'depression_keywords',
+        'mobile': 'mobile_keywords',
+        'behavioral': 'behavioral_keywords'
+    }
+    
+    # 정확한 키워드는 아니지만 LLM이 구제할 여지를 보여주는 유사 어휘
+    NEAR_MISS_PATTERNS = {
+        'depression': r'depress|dysthymi|anhedoni|low mood|mood disorder',
+        'mobile': r'phone|mobile|\bapps?\b|digital|online|internet|\bweb|m-?health|e-?health|text messag|\bsms\b|tablet',
+        'behavioral': r'behavio|activation|activity schedul|pleasant activit'
+    }
+    
+    def __init__(self, skip_below: float = 1.0, cheap_below: Optional[float] = None):
+        self.skip_below = skip_below
+        self.cheap_below = cheap_below
+    
+    def score(self, df: pd.DataFrame) -> pd.Series:
+        """논문별 구제 가능성 점수 (0 ~ 3)"""
+        text = (df['Title'].fillna('').astype(str) + ' ' + df['Abstract'].fillna('').astype(str)).str.lower()
+        
+        scores = pd.Series(0.0, index=df.index)
+        for category, column in self.CATEGORY_COLUMNS.items():
+            if column in df.columns:
+                has_rule_hit = df[column].fillna('').astype(str).str.strip().ne('')
+            else:
+                has_rule_hit = pd.Series(False, index=df.index)
+            has_near_miss = text.str.contains(self.NEAR_MISS_PATTERNS[category], regex=True)
+            scores += has_rule_hit * 1.0 + (~has_rule_hit & has_near_miss) * 0.5
+        return scores
+    
+    def routes(self, df: pd.DataFrame) -> List[str]:
+        """논문별 처리 경로 ('skip', 'cheap', 'full')"""
+        routes = []
+        for value in self.score(df):
+            if value < self.skip_below:
+                routes.append('skip')
+            elif self.cheap_below is not None and value < self.cheap_below:
+                routes.append('cheap')
+            else:
+                routes.append('full')
+        return routes
 
 class LLMSecondaryFilter:
-    def __init__(self, model_name: str = "gpt-4o", debug: bool = False):
+    def __init__(self, model_name: str = "gpt-4o", debug: bool = False,
+                 llm: Optional[BaseChatModel] = None,
+                 cache_path: Optional[str] = "cache/llm_response_cache.sqlite",
+                 cache_max_entries: int = 100000,
+                 requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None,
+                 triage: Optional[RuleEvidenceTriage] = None,
+                 cheap_model_name: Optional[str] = None,
+                 cheap_llm: Optional[BaseChatModel] = None):
         """
         LLM 2차 필터 초기화
         
         Args:
             model_name: 사용할 OpenAI 모델명
             debug: 디버그 모드 활성화
+            llm: 사용할 채팅 모델 (지정하지 않으면 ChatOpenAI 생성, 테스트 시 가짜 모델 주입용)
+            cache_path: LLM 응답 캐시 SQLite 경로 (None이면 캐시 비활성화)
+            cache_max_entries: 캐시 최대 항목 수
+            requests_per_minute: 분당 최대 요청 수 (None이면 제한 없음)
+            tokens_per_minute: 분당 최대 토큰 수 (None이면 제한 없음)
+            triage: exclude 논문 사전 선별기 (None이면 모든 논문을 LLM으로 검토)
+            cheap_model_name: 사전 선별에서 'cheap'으로 분류된 논문을 검토할 모델명
+            cheap_llm: 'cheap' 논문용 채팅 모델 (cheap_model_name 대신 직접 주입)
         """
         self.model_name = model_name
         self.debug = debug
@@ -76,11 +506,33 @@ class LLMSecondaryFilter:
             self.logger.addHandler(console_handler)
         
         # LangChain LLM 초기화
-        self.llm = ChatOpenAI(
+        self.llm = llm if llm is not None else ChatOpenAI(
             model_name=model_name,
             temperature=0.0
         )
         
+        # 호출 속도 제한 스케줄러 초기화
+        self.rate_limiter = LLMRateLimiter(model_name, requests_per_minute, tokens_per_minute)
+        
+        # 응답 캐시 초기화
+        self.cache = LLMResponseCache(cache_path, cache_max_entries) if cache_path else None
+        # 캐시 키의 모델 식별자 앞에 붙는 검토 단계 표시 (저렴한 모델 필터는 'cheap:')
+        self.cache_tier = ''
+        
+        # 사전 선별 설정 ('cheap' 경로는 별도 모델의 필터 인스턴스로 처리)
+        self.triage = triage
+        self.triage_stats: Dict[str, int] = {}
+        self.cheap_filter = None
+        if cheap_model_name or cheap_llm is not None:
+            self.cheap_filter = LLMSecondaryFilter(
+                model_name=cheap_model_name or model_name, debug=debug, llm=cheap_llm,
+                cache_path=None, requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute
+            )
+            # 캐시 인스턴스 공유 (같은 파일을 따로 열면 항목 수 계산이 어긋남)
+            # 모델명을 알 수 없는 주입 모델도 전체 모델과 키가 겹치지 않도록 단계 표시를 붙임
+            self.cheap_filter.cache = self.cache
+            self.cheap_filter.cache_tier = 'cheap:'
+        
         # 출력 파서 초기화
         self.parser = PydanticOutputParser(pydantic_object=LLMKeywordResult)
         
@@ -88,6 +540,10 @@ class LLMSecondaryFilter:
         self.template = self._load_template()
         self.prompt = self._create_prompt_template()
         
+        # 배치 모드용 파서/프롬프트 (파서는 형식 지시문용, 응답은 항목별로 검증)
+        self.batch_parser = PydanticOutputParser(pydantic_object=LLMBatchResult)
+        self.batch_prompt = self._create_batch_prompt_template()
+        
         self.logger.info(f"LLMSecondaryFilter 초기화 완료 - 모델: {model_name}")
     
     def _load_template(self) -> str:
@@ -136,30 +592,188 @@ class LLMSecondaryFilter:
             partial_variables={"format_instructions": self.parser.get_format_instructions()}
         )
     
+    def _create_batch_prompt_template(self) -> PromptTemplate:
+        """
+        배치 프롬프트 템플릿 생성
+        
+        단일 논문 템플릿의 논문 정보와 기존 키워드 자리를 {papers} 블록으로 바꾸고,
+        논문별 결과를 paper_id와 함께 목록으로 반환하도록 지시를 추가한다.
+        """
+        template = self.template.replace("**Title:** {title}\n\n**Abstract:** {abstract}", "{papers}")
+        template = re.sub(
+            r"(### 기존 규칙 기반 결과 참고사항\n)(?:- .*\{existing_\w+\}.*\n)+",
+            r"\1- 각 논문 블록에 적힌 기존 키워드 참고\n",
+            template
+        )
+        template += """
+## 배치 처리 지시사항
+
+- 위 "Paper Information to Analyze"에는 여러 논문이 `### Paper ID: ...` 블록으로 주어집니다.
+- 각 논문을 서로 독립적으로 평가하고, 위의 단일 논문 JSON 예시 대신 아래 형식에 따라 `results` 목록으로 응답하세요.
+- 모든 논문에 대해 정확히 하나의 결과를 반환하고, `paper_id`에는 입력된 ID를 그대로 적으세요.
+"""
+        
+        prompt = PromptTemplate.from_template(
+            template,
+            partial_variables={"format_instructions": self.batch_parser.get_format_instructions()}
+        )
+        if set(prompt.input_variables) != {"papers"}:
+            raise ValueError(f"배치 템플릿 생성 실패 - 남은 변수: {prompt.input_variables}")
+        return prompt
+    
+    def _format_batch_papers(self, articles: List[Dict[str, str]]) -> str:
+        """배치 요청에 넣을 논문 블록 생성 (paper_id는 배치 내 순번)"""
+        blocks = []
+        for paper_id, article in enumerate(articles, 1):
+            blocks.append(
+                f"### Paper ID: {paper_id}\n\n"
+                f"**Title:** {article['title']}\n\n"
+                f"**Abstract:** {article['abstract']}\n\n"
+                f"- 기존 우울증 키워드: {article.get('existing_depression', '')}\n"
+                f"- 기존 모바일/디지털 키워드: {article.get('existing_mobile', '')}\n"
+                f"- 기존 행동활성화/치료 키워드: {article.get('existing_behavioral', '')}"
+            )
+        return "\n\n".join(blocks)
+    
+    def _parse_batch_items(self, response_text: str) -> List:
+        """배치 응답에서 논문별 결과 항목 목록 추출 ({"results": [...]} 객체 또는 JSON 목록, 항목은 검증 전)"""
+        for opening, closing in (("{", "}"), ("[", "]")):
+            try:
+                parsed = json.loads(self._extract_json_text(response_text, opening, closing))
+            except (json.JSONDecodeError, ValueError):
+                continue
+            if isinstance(parsed, dict):
+                parsed = parsed.get('results')
+            if isinstance(parsed, list):
+                return parsed
+        
+        self.logger.error(f"배치 응답 파싱 실패: {response_text[:200]}")
+        return []
+    
+    def _map_batch_results(self, items: List, count: int) -> Dict[int, Dict]:
+        """배치 결과 항목을 하나씩 검증해 paper_id 기준으로 입력 위치에 매핑
+        
+        검증에 실패한 항목과 알 수 없거나 중복된 ID는 무시한다 (해당 논문은 단일 요청으로 재시도).
+        """
+        mapped = {}
+        for item in items:
+            try:
+                item = LLMBatchKeywordResult(**item)
+            except (ValidationError, TypeError) as e:
+                self.logger.warning(f"배치 결과 항목 검증 실패: {e}")
+                continue
+            
+            paper_id = item.paper_id.strip()
+            if not paper_id.isdigit():
+                continue
+            position = int(paper_id) - 1
+            if 0 <= position < count and position not in mapped:
+                result_dict = item.model_dump()
+                del result_dict['paper_id']
+                mapped[position] = result_dict
+        return mapped
+    
+    def _cache_key(self, title: str, abstract: str, existing_depression: str,
+                   existing_mobile: str, existing_behavioral: str) -> Optional[str]:
+        """렌더링된 프롬프트 기준 캐시 키 (캐시 비활성화 시 None)"""
+        if self.cache is None:
+            return None
+        
+        rendered = self.prompt.format(
+            title=title, 
+            abstract=abstract,
+            existing_depression_keywords=existing_depression,
+            existing_mobile_keywords=existing_mobile,
+            existing_behavioral_keywords=existing_behavioral
+        )
+        return LLMResponseCache.make_key(self._cache_model_id(), rendered,
+                                         getattr(self.llm, 'temperature', None))
+    
+    def _batch_cache_key(self, article: Dict[str, str]) -> Optional[str]:
+        """배치 응답 캐시 키 (배치 표시 + 이 논문 블록만 넣어 렌더링한 배치 프롬프트, 캐시 비활성화 시 None)"""
+        if self.cache is None:
+            return None
+        
+        rendered = "[batch]\n" + self.batch_prompt.format(papers=self._format_batch_papers([article]))
+        return LLMResponseCache.make_key(self._cache_model_id(), rendered,
+                                         getattr(self.llm, 'temperature', None))
+    
+    def _cache_model_id(self) -> str:
+        """캐시 키에 쓰는 모델 식별자 (검토 단계 + 모델 클래스 + 모델명)"""
+        return f"{self.cache_tier}{type(self.llm).__name__}:{getattr(self.llm, 'model_name', self.model_name)}"
+    
+    def _call_llm(self, call, prompt_tokens: int):
+        """속도 제한 예산 안에서 LLM 호출 (속도 제한 오류는 백오프 후 재시도)"""
+        max_retries = self.rate_limiter.max_retries
+        for attempt in range(max_retries + 1):
+            self.rate_limiter.acquire(prompt_tokens)
+            try:
+                return call()
+            except Exception as e:
+                if attempt == max_retries or not LLMRateLimiter.is_rate_limit_error(e):
+                    raise
+                delay = self.rate_limiter.backoff(attempt)
+                self.logger.warning(f"속도 제한 발생, {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries}): {e}")
+    
+    async def _acall_llm(self, call, prompt_tokens: int):
+        """속도 제한 예산 안에서 LLM 비동기 호출 (call은 코루틴을 반환)"""
+        max_retries = self.rate_limiter.max_retries
+        for attempt in range(max_retries + 1):
+            await self.rate_limiter.aacquire(prompt_tokens)
+            try:
+                return await call()
+            except Exception as e:
+                if attempt == max_retries or not LLMRateLimiter.is_rate_limit_error(e):
+                    raise
+                delay = self.rate_limiter.backoff(attempt)
+                self.logger.warning(f"속도 제한 발생, {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries}): {e}")
+    
     def process_single_article(self, title: str, abstract: str, 
                              existing_depression: str = "",
                              existing_mobile: str = "",
                              existing_behavioral: str = "") -> Optional[Dict]:
-        """단일 논문 처리"""
+        """단일 논문 처리 (캐시 적중 시 LLM 호출 생략)"""
+        cache_key = self._cache_key(title, abstract, existing_depression,
+                                    existing_mobile, existing_behavioral)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.logger.info(f"캐시 적중: {title[:50]}... -> {cached.get('result', 'unknown')}")
+                return cached
+        
+        result_dict = self._review_article(title, abstract, existing_depression,
+                                           existing_mobile, existing_behavioral)
+        
+        if cache_key and result_dict:
+            self.cache.put(cache_key, self._cache_model_id(), result_dict)
+        return result_dict
+    
+    def _review_article(self, title: str, abstract: str, existing_depression: str,
+                        existing_mobile: str, existing_behavioral: str) -> Optional[Dict]:
+        """LLM 호출로 단일 논문 검토"""
+        prompt_values = {
+            "title": title, 
+            "abstract": abstract,
+            "existing_depression_keywords": existing_depression,
+            "existing_mobile_keywords": existing_mobile,
+            "existing_behavioral_keywords": existing_behavioral
+        }
+        formatted_prompt = self.prompt.format(**prompt_values)
+        prompt_tokens = self.rate_limiter.count_tokens(formatted_prompt)
+        
         try:
             if self.debug:
                 self.logger.info(f"논문 2차 검토 중: {title[:50]}...")
             
             # LangChain 체인 실행
             chain = self.prompt | self.llm | self.parser
-            result = chain.invoke({
-                "title": title, 
-                "abstract": abstract,
-                "existing_depression_keywords": existing_depression,
-                "existing_mobile_keywords": existing_mobile,
-                "existing_behavioral_keywords": existing_behavioral
-            })
+            result = self._call_llm(lambda: chain.invoke(prompt_values), prompt_tokens)
             
             if self.debug:
                 self.logger.info(f"LLM 원본 응답: {result}")
             
             # Pydantic 모델을 dict로 변환
-            result_dict = result.dict()
+            result_dict = result.model_dump()
             
             self.logger.info(f"2차 검토 완료: {title[:50]}... -> {result_dict.get('result', 'unknown')}")
             return result_dict
@@ -169,14 +783,9 @@ class LLMSecondaryFilter:
             
             # 파싱 실패 시 직접 LLM 호출로 재시도
             try:
-                formatted_prompt = self.prompt.format(
-                    title=title, 
-                    abstract=abstract,
-                    existing_depression_keywords=existing_depression,
-                    existing_mobile_keywords=existing_mobile,
-                    existing_behavioral_keywords=existing_behavioral
+                response = self._call_llm(
+                    lambda: self.llm.invoke([HumanMessage(content=formatted_prompt)]), prompt_tokens
                 )
-                response = self.llm.invoke([HumanMessage(content=formatted_prompt)])
                 
                 # JSON 응답 파싱 시도
                 response_text = response.content
@@ -191,36 +800,218 @@ class LLMSecondaryFilter:
             
             return None
     
-    def _parse_fallback_response(self, response_text: str) -> Optional[Dict]:
-        """응답 파싱 실패 시 백업 파싱 함수"""
+    async def aprocess_single_article(self, title: str, abstract: str,
+                                      existing_depression: str = "",
+                                      existing_mobile: str = "",
+                                      existing_behavioral: str = "") -> Optional[Dict]:
+        """단일 논문 비동기 처리 (process_single_article과 동일한 캐시/재시도 흐름)"""
+        cache_key = self._cache_key(title, abstract, existing_depression,
+                                    existing_mobile, existing_behavioral)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.logger.info(f"캐시 적중: {title[:50]}... -> {cached.get('result', 'unknown')}")
+                return cached
+        
+        result_dict = await self._areview_article(title, abstract, existing_depression,
+                                                  existing_mobile, existing_behavioral)
+        
+        if cache_key and result_dict:
+            self.cache.put(cache_key, self._cache_model_id(), result_dict)
+        return result_dict
+    
+    async def _areview_article(self, title: str, abstract: str, existing_depression: str,
+                               existing_mobile: str, existing_behavioral: str) -> Optional[Dict]:
+        """LLM 비동기 호출로 단일 논문 검토"""
+        prompt_values = {
+            "title": title, 
+            "abstract": abstract,
+            "existing_depression_keywords": existing_depression,
+            "existing_mobile_keywords": existing_mobile,
+            "existing_behavioral_keywords": existing_behavioral
+        }
+        formatted_prompt = self.prompt.format(**prompt_values)
+        prompt_tokens = self.rate_limiter.count_tokens(formatted_prompt)
+        
         try:
-            # JSON 블록 추출
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            else:
-                # JSON 형태 텍스트 찾기
-                json_start = response_text.find("{")
-                json_end = response_text.rfind("}") + 1
-                if json_start != -1 and json_end != 0:
-                    json_text = response_text[json_start:json_end]
-                else:
-                    json_text = response_text
+            if self.debug:
+                self.logger.info(f"논문 2차 검토 중: {title[:50]}...")
             
-            return json.loads(json_text)
+            # LangChain 체인 비동기 실행
+            chain = self.prompt | self.llm | self.parser
+            result = await self._acall_llm(lambda: chain.ainvoke(prompt_values), prompt_tokens)
+            
+            if self.debug:
+                self.logger.info(f"LLM 원본 응답: {result}")
+            
+            result_dict = result.model_dump()
+            
+            self.logger.info(f"2차 검토 완료: {title[:50]}... -> {result_dict.get('result', 'unknown')}")
+            return result_dict
+                
+        except Exception as e:
+            self.logger.error(f"논문 2차 검토 중 오류 발생 '{title[:50]}...': {e}")
+            
+            # 파싱 실패 시 직접 LLM 호출로 재시도
+            try:
+                response = await self._acall_llm(
+                    lambda: self.llm.ainvoke([HumanMessage(content=formatted_prompt)]), prompt_tokens
+                )
+                
+                result_dict = self._parse_fallback_response(response.content)
+                
+                if result_dict:
+                    self.logger.info(f"재시도 성공: {title[:50]}... -> {result_dict.get('result', 'unknown')}")
+                    return result_dict
+                
+            except Exception as e2:
+                self.logger.error(f"재시도도 실패: {e2}")
+            
+            return None
+    
+    def _lookup_cache(self, articles: List[Dict[str, str]]):
+        """캐시 조회 후 (결과 목록, 미스 논문의 (위치, 단일 캐시 키, 배치 캐시 키) 목록) 반환
+        
+        단일 논문 프롬프트 결과를 먼저 찾고, 2편 이상이라 배치 요청을 보낼 때만 이전 배치 요청의 결과도 찾는다.
+        """
+        results: List[Optional[Dict]] = [None] * len(articles)
+        pending = []
+        for position, article in enumerate(articles):
+            cache_key = self._cache_key(**article)
+            batch_key = self._batch_cache_key(article) if len(articles) > 1 else None
+            cached = self.cache.get(cache_key) if cache_key else None
+            if cached is None and batch_key:
+                cached = self.cache.get(batch_key)
+            if cached is not None:
+                self.logger.info(f"캐시 적중: {article['title'][:50]}... -> {cached.get('result', 'unknown')}")
+                results[position] = cached
+            else:
+                pending.append((position, cache_key, batch_key))
+        return results, pending
+    
+    def _store_result(self, cache_key: Optional[str], result_dict: Optional[Dict]):
+        """성공한 결과만 캐시에 저장"""
+        if cache_key and result_dict:
+            self.cache.put(cache_key, self._cache_model_id(), result_dict)
+    
+    def process_batch(self, articles: List[Dict[str, str]]) -> List[Optional[Dict]]:
+        """
+        여러 논문을 한 번의 요청으로 처리
+        
+        articles는 process_single_article 인자 이름을 키로 갖는 dict 목록이다.
+        결과는 paper_id로 입력 순서에 다시 매핑하며, 배치 응답에서 빠졌거나 검증에 실패한
+        논문만 단일 요청으로 재시도한다. 배치 응답은 배치 캐시 키로, 단일 재시도 결과는
+        단일 논문 프롬프트 캐시 키로 저장한다.
+        """
+        results, pending = self._lookup_cache(articles)
+        
+        if len(pending) > 1:
+            batch_articles = [articles[position] for position, _, _ in pending]
+            mapped = self._review_batch(batch_articles)
+            for offset, (position, _, batch_key) in enumerate(pending):
+                if offset in mapped:
+                    results[position] = mapped[offset]
+                    self._store_result(batch_key, mapped[offset])
+        
+        # 배치에서 결과를 얻지 못한 논문은 개별 재시도
+        for position, cache_key, _ in pending:
+            if results[position] is None:
+                results[position] = self._review_article(**articles[position])
+                self._store_result(cache_key, results[position])
+        
+        return results
+    
+    def _review_batch(self, articles: List[Dict[str, str]]) -> Dict[int, Dict]:
+        """LLM 한 번 호출로 여러 논문 검토 (배치 내 위치 -> 결과)"""
+        papers = self._format_batch_papers(articles)
+        prompt_tokens = self.rate_limiter.count_tokens(self.batch_prompt.format(papers=papers), len(articles))
+        
+        try:
+            chain = self.batch_prompt | self.llm
+            response = self._call_llm(lambda: chain.invoke({"papers": papers}), prompt_tokens)
+        except Exception as e:
+            self.logger.error(f"배치 검토 중 오류 발생 ({len(articles)}편): {e}")
+            return {}
+        
+        # 응답 전체가 아니라 항목별로 검증해 올바른 결과는 살림
+        mapped = self._map_batch_results(self._parse_batch_items(response.content), len(articles))
+        self.logger.info(f"배치 검토 완료: {len(mapped)}/{len(articles)}편 결과 매핑")
+        return mapped
+    
+    async def aprocess_batch(self, articles: List[Dict[str, str]]) -> List[Optional[Dict]]:
+        """여러 논문을 한 번의 비동기 요청으로 처리 (process_batch와 동일한 흐름)"""
+        results, pending = self._lookup_cache(articles)
+        
+        if len(pending) > 1:
+            batch_articles = [articles[position] for position, _, _ in pending]
+            mapped = await self._areview_batch(batch_articles)
+            for offset, (position, _, batch_key) in enumerate(pending):
+                if offset in mapped:
+                    results[position] = mapped[offset]
+                    self._store_result(batch_key, mapped[offset])
+        
+        for position, cache_key, _ in pending:
+            if results[position] is None:
+                results[position] = await self._areview_article(**articles[position])
+                self._store_result(cache_key, results[position])
+        
+        return results
+    
+    async def _areview_batch(self, articles: List[Dict[str, str]]) -> Dict[int, Dict]:
+        """LLM 비동기 호출 한 번으로 여러 논문 검토 (배치 내 위치 -> 결과)"""
+        papers = self._format_batch_papers(articles)
+        prompt_tokens = self.rate_limiter.count_tokens(self.batch_prompt.format(papers=papers), len(articles))
+        
+        try:
+            chain = self.batch_prompt | self.llm
+            response = await self._acall_llm(lambda: chain.ainvoke({"papers": papers}), prompt_tokens)
+        except Exception as e:
+            self.logger.error(f"배치 검토 중 오류 발생 ({len(articles)}편): {e}")
+            return {}
+        
+        # 응답 전체가 아니라 항목별로 검증해 올바른 결과는 살림
+        mapped = self._map_batch_results(self._parse_batch_items(response.content), len(articles))
+        self.logger.info(f"배치 검토 완료: {len(mapped)}/{len(articles)}편 결과 매핑")
+        return mapped
+    
+    @staticmethod
+    def _extract_json_text(response_text: str, opening: str = "{", closing: str = "}") -> str:
+        """응답 텍스트에서 JSON 부분 추출 (```json 블록, 없으면 처음 opening부터 마지막 closing까지)"""
+        # JSON 블록 추출
+        if "```json" in response_text:
+            json_start = response_text.find("```json") + 7
+            json_end = response_text.find("```", json_start)
+            return response_text[json_start:json_end].strip()
+        
+        # JSON 형태 텍스트 찾기
+        json_start = response_text.find(opening)
+        json_end = response_text.rfind(closing) + 1
+        if json_start != -1 and json_end != 0:
+            return response_text[json_start:json_end]
+        return response_text
+    
+    def _parse_fallback_response(self, response_text: str) -> Optional[Dict]:
+        """응답 파싱 실패 시 백업 파싱 함수 (LLMKeywordResult 검증을 통과한 결과만 반환)"""
+        try:
+            json_text = self._extract_json_text(response_text)
+            return LLMKeywordResult(**json.loads(json_text)).model_dump()
         
-        except (json.JSONDecodeError, ValueError) as e:
+        except (json.JSONDecodeError, ValidationError, ValueError, TypeError) as e:
             self.logger.error(f"백업 파싱 실패: {e}")
             self.logger.error(f"응답 텍스트: {response_text}")
             return None
     
-    def process_exclude_papers(self, input_file: str, output_file: str, 
-                             checkpoint_interval: int = 5) -> pd.DataFrame:
-        """exclude된 논문들만 LLM으로 재검토"""
-        # 입력 데이터 로드
-        self.logger.info(f"규칙 기반 결과 파일 로드: {input_file}")
-        df = pd.read_csv(input_file, encoding='utf-8-sig')
+    def _load_review_targets(self, rule_results: Union[str, pd.DataFrame, Iterable[Dict]]):
+        """규칙 기반 결과(파일 경로, DataFrame, 레코드 이터레이터)를 (include 논문, exclude 논문)으로 분리"""
+        if isinstance(rule_results, (str, os.PathLike)):
+            self.logger.info(f"규칙 기반 결과 파일 로드: {rule_results}")
+            df = load_results(rule_results)
+        elif isinstance(rule_results, pd.DataFrame):
+            df = rule_results
+        else:
+            df = pd.DataFrame(list(rule_results))
+        if df.empty and 'result' not in df.columns:
+            df = pd.DataFrame(columns=RULE_RESULT_COLUMNS)
         
         # exclude된 논문들만 필터링
         exclude_df = df[df['result'] == 'exclude'].copy()
@@ -230,166 +1021,518 @@ class LLMSecondaryFilter:
         self.logger.info(f"기존 include 논문 수: {len(include_df)}")
         self.logger.info(f"LLM 재검토 대상(exclude) 논문 수: {len(exclude_df)}")
         
-        if len(exclude_df) == 0:
-            self.logger.info("재검토 대상 논문이 없습니다.")
-            return df
+        return df, include_df, exclude_df
+    
+    def _open_journal(self, output_file: Optional[str], flush_interval: int) -> Optional[ReviewJournal]:
+        """결과 파일에 대응하는 체크포인트 저널 열기 (결과를 저장하지 않으면 저널도 없음)"""
+        if not output_file:
+            return None
+        
+        journal = ReviewJournal(f"{output_file}.journal.jsonl", flush_interval)
+        if len(journal):
+            self.logger.info(f"체크포인트 저널에서 재개: {len(journal)}개 논문 처리 완료")
+        return journal
+    
+    def _paper_ids(self, exclude_df: pd.DataFrame) -> List[str]:
+        """논문 행별 고유 ID (같은 논문이 여러 번 나오면 두 번째부터 '#순번' 추가)"""
+        return unique_paper_keys(exclude_df).tolist()
+    
+    def _row_inputs(self, row: pd.Series) -> Dict[str, str]:
+        """논문 행에서 LLM 입력값 추출 (process_single_article 인자와 같은 이름)"""
+        return {
+            'title': str(row.get('Title', '')),
+            'abstract': str(row.get('Abstract', '')),
+            'existing_depression': str(row.get('depression_keywords', '')),
+            'existing_mobile': str(row.get('mobile_keywords', '')),
+            'existing_behavioral': str(row.get('behavioral_keywords', ''))
+        }
+    
+    def _has_title_and_abstract(self, inputs: Dict[str, str]) -> bool:
+        """제목과 초록이 모두 있는지 확인"""
+        title, abstract = inputs['title'], inputs['abstract']
+        return not (not title or not abstract or title == 'nan' or abstract == 'nan')
+    
+    def _build_result(self, row: pd.Series, inputs: Dict[str, str],
+                      llm_result: Optional[Dict], failure_reason: str) -> Dict:
+        """원본 데이터와 LLM 결과 병합 (llm_result가 없으면 failure_reason으로 exclude 처리)"""
+        result = {
+            'DOI': row.get('DOI', ''),
+            'Title': inputs['title'],
+            'Authors': row.get('Authors', ''),
+            'Journal/Book': row.get('Journal/Book', ''),
+            'Publication Year': row.get('Publication Year', ''),
+            'Abstract': inputs['abstract'],
+            'rule_depression_keywords': inputs['existing_depression'],
+            'rule_mobile_keywords': inputs['existing_mobile'],
+            'rule_behavioral_keywords': inputs['existing_behavioral'],
+            'rule_result': 'exclude'
+        }
         
-        results = []
-        checkpoint_path = f"{output_file}.checkpoint"
+        outcome = llm_result or {'reason': failure_reason}
+        for key, column in LLM_OUTPUT_COLUMNS.items():
+            result[column] = outcome.get(key, 'exclude' if key == 'result' else '')
+        result['final_result'] = result['llm_result']
         
-        # 체크포인트 로드
-        start_idx = 0
-        if os.path.exists(checkpoint_path):
-            try:
-                checkpoint_df = pd.read_csv(checkpoint_path, encoding='utf-8-sig')
-                results = checkpoint_df.to_dict('records')
-                start_idx = len(results)
-                self.logger.info(f"체크포인트에서 재개: {start_idx}개 논문 처리 완료")
-            except Exception as e:
-                self.logger.warning(f"체크포인트 로드 실패: {e}")
+        return result
+    
+    def _triage_routes(self, exclude_df: pd.DataFrame, pending: Optional[Sequence[int]] = None,
+                       accumulate: bool = False) -> List[str]:
+        """논문별 처리 경로 계산 및 사전 선별 통계 기록 (accumulate면 기존 통계에 누적)
+        
+        pending: 아직 검토하지 않은 논문 행 번호 (None이면 전체), 절감량 추정에 사용
+        """
+        if self.triage is None:
+            self.triage_stats = {}
+            return ['full'] * len(exclude_df)
         
-        total_exclude = len(exclude_df)
-        self.logger.info(f"{total_exclude - start_idx}개 논문 LLM 재검토 시작 (인덱스 {start_idx}부터)")
+        routes = self.triage.routes(exclude_df)
+        if self.cheap_filter is None:
+            routes = ['full' if route == 'cheap' else route for route in routes]
         
-        # exclude된 논문들 처리
-        for idx in range(start_idx, total_exclude):
+        # 아직 처리하지 않은 논문 기준으로 절감량 추정
+        if pending is None:
+            pending = range(len(exclude_df))
+        skipped = [idx for idx in pending if routes[idx] == 'skip']
+        saved_tokens = 0
+        for idx in skipped:
+            inputs = self._row_inputs(exclude_df.iloc[idx])
+            rendered = self.prompt.format(
+                title=inputs['title'], 
+                abstract=inputs['abstract'],
+                existing_depression_keywords=inputs['existing_depression'],
+                existing_mobile_keywords=inputs['existing_mobile'],
+                existing_behavioral_keywords=inputs['existing_behavioral']
+            )
+            saved_tokens += self.rate_limiter.count_tokens(rendered)
+        
+        stats = {
+            'skipped_count': len(skipped),
+            'cheap_model_count': sum(1 for idx in pending if routes[idx] == 'cheap'),
+            'full_review_count': sum(1 for idx in pending if routes[idx] == 'full'),
+            'saved_requests': len(skipped),
+            'estimated_saved_tokens': saved_tokens
+        }
+        if accumulate and self.triage_stats:
+            self.triage_stats = {key: self.triage_stats[key] + value for key, value in stats.items()}
+            return routes
+        
+        self.triage_stats = stats
+        self.logger.info(f"사전 선별: {len(skipped)}편 LLM 검토 생략, "
+                         f"{self.triage_stats['cheap_model_count']}편 저렴한 모델로 검토, "
+                         f"예상 절감 토큰 약 {saved_tokens}개")
+        return routes
+    
+    def _prepare_rows(self, exclude_df: pd.DataFrame, indices: Sequence[int], routes: List[str]):
+        """논문 행별 입력 추출 (LLM 검토가 필요 없는 논문은 바로 결과 생성, 나머지는 None)"""
+        rows, inputs_list, results = [], [], []
+        for idx in indices:
             row = exclude_df.iloc[idx]
-            title = str(row.get('Title', ''))
-            abstract = str(row.get('Abstract', ''))
+            inputs = self._row_inputs(row)
+            rows.append(row)
+            inputs_list.append(inputs)
             
-            existing_depression = str(row.get('depression_keywords', ''))
-            existing_mobile = str(row.get('mobile_keywords', ''))
-            existing_behavioral = str(row.get('behavioral_keywords', ''))
-            
-            if not title or not abstract or title == 'nan' or abstract == 'nan':
+            if not self._has_title_and_abstract(inputs):
                 self.logger.warning(f"제목 또는 초록 누락 - 행 {idx}")
-                result = {
-                    'DOI': row.get('DOI', ''),
-                    'Title': title,
-                    'Authors': row.get('Authors', ''),
-                    'Journal/Book': row.get('Journal/Book', ''),
-                    'Publication Year': row.get('Publication Year', ''),
-                    'Abstract': abstract,
-                    'rule_depression_keywords': existing_depression,
-                    'rule_mobile_keywords': existing_mobile,
-                    'rule_behavioral_keywords': existing_behavioral,
-                    'rule_result': 'exclude',
-                    'llm_depression_keywords': '',
-                    'llm_mobile_keywords': '',
-                    'llm_behavioral_keywords': '',
-                    'llm_result': 'exclude',
-                    'llm_depression_highlight': '',
-                    'llm_mobile_highlight': '',
-                    'llm_behavioral_highlight': '',
-                    'llm_reason': '제목 또는 초록 누락',
-                    'final_result': 'exclude'
-                }
+                results.append(self._build_result(row, inputs, None, '제목 또는 초록 누락'))
+            elif routes[idx] == 'skip':
+                result = self._build_result(row, inputs, None, '사전 선별에서 제외 (규칙 기반 근거 부족)')
+                result['llm_result'] = 'skipped'
+                results.append(result)
             else:
-                # LLM 처리
-                llm_result = self.process_single_article(
-                    title, abstract, 
-                    existing_depression, existing_mobile, existing_behavioral
-                )
-                
-                if llm_result:
-                    # 원본 데이터와 결과 병합
-                    result = {
-                        'DOI': row.get('DOI', ''),
-                        'Title': title,
-                        'Authors': row.get('Authors', ''),
-                        'Journal/Book': row.get('Journal/Book', ''),
-                        'Publication Year': row.get('Publication Year', ''),
-                        'Abstract': abstract,
-                        'rule_depression_keywords': existing_depression,
-                        'rule_mobile_keywords': existing_mobile,
-                        'rule_behavioral_keywords': existing_behavioral,
-                        'rule_result': 'exclude',
-                        'llm_depression_keywords': llm_result.get('depression_keywords', ''),
-                        'llm_mobile_keywords': llm_result.get('mobile_keywords', ''),
-                        'llm_behavioral_keywords': llm_result.get('behavioral_keywords', ''),
-                        'llm_result': llm_result.get('result', 'exclude'),
-                        'llm_depression_highlight': llm_result.get('depression_highlight', ''),
-                        'llm_mobile_highlight': llm_result.get('mobile_highlight', ''),
-                        'llm_behavioral_highlight': llm_result.get('behavioral_highlight', ''),
-                        'llm_reason': llm_result.get('reason', ''),
-                        'final_result': llm_result.get('result', 'exclude')
-                    }
-                else:
-                    result = {
-                        'DOI': row.get('DOI', ''),
-                        'Title': title,
-                        'Authors': row.get('Authors', ''),
-                        'Journal/Book': row.get('Journal/Book', ''),
-                        'Publication Year': row.get('Publication Year', ''),
-                        'Abstract': abstract,
-                        'rule_depression_keywords': existing_depression,
-                        'rule_mobile_keywords': existing_mobile,
-                        'rule_behavioral_keywords': existing_behavioral,
-                        'rule_result': 'exclude',
-                        'llm_depression_keywords': '',
-                        'llm_mobile_keywords': '',
-                        'llm_behavioral_keywords': '',
-                        'llm_result': 'exclude',
-                        'llm_depression_highlight': '',
-                        'llm_mobile_highlight': '',
-                        'llm_behavioral_highlight': '',
-                        'llm_reason': 'LLM 처리 실패',
-                        'final_result': 'exclude'
-                    }
+                results.append(None)
+        return rows, inputs_list, results
+    
+    def _review_rows(self, exclude_df: pd.DataFrame, indices: Sequence[int], routes: List[str]) -> List[Dict]:
+        """논문 행들을 검토 (경로별로 2편 이상이면 한 번의 배치 요청)"""
+        rows, inputs_list, results = self._prepare_rows(exclude_df, indices, routes)
+        
+        for route, reviewer in (('full', self), ('cheap', self.cheap_filter)):
+            targets = [i for i, idx in enumerate(indices) if results[i] is None and routes[idx] == route]
+            if targets:
+                llm_results = reviewer.process_batch([inputs_list[i] for i in targets])
+                for i, llm_result in zip(targets, llm_results):
+                    results[i] = self._build_result(rows[i], inputs_list[i], llm_result, 'LLM 처리 실패')
+        return results
+    
+    async def _areview_rows(self, exclude_df: pd.DataFrame, indices: Sequence[int],
+                            routes: List[str]) -> List[Dict]:
+        """논문 행들을 비동기로 검토 (경로별로 2편 이상이면 한 번의 배치 요청)"""
+        rows, inputs_list, results = self._prepare_rows(exclude_df, indices, routes)
+        
+        for route, reviewer in (('full', self), ('cheap', self.cheap_filter)):
+            targets = [i for i, idx in enumerate(indices) if results[i] is None and routes[idx] == route]
+            if targets:
+                llm_results = await reviewer.aprocess_batch([inputs_list[i] for i in targets])
+                for i, llm_result in zip(targets, llm_results):
+                    results[i] = self._build_result(rows[i], inputs_list[i], llm_result, 'LLM 처리 실패')
+        return results
+    
+    def process_exclude_papers(self, input_file: Union[str, pd.DataFrame, Iterable[Dict]],
+                             output_file: Optional[str] = None,
+                             checkpoint_interval: int = 5,
+                             max_concurrency: int = 1,
+                             batch_size: int = 1) -> pd.DataFrame:
+        """
+        exclude된 논문들만 LLM으로 재검토
+        
+        논문별 결과는 완료되는 즉시 체크포인트 저널({output_file}.journal.jsonl)에 추가되고,
+        다시 실행하면 저널에 있는 논문(DOI 또는 제목 해시로 식별)은 검토하지 않는다.
+        
+        Args:
+            input_file: 규칙 기반 결과 파일 경로 (.csv, .parquet, .feather), 결과 DataFrame,
+                또는 결과 레코드(dict) 이터레이터 (이터레이터는 모두 받은 뒤 검토 시작,
+                받는 대로 검토하고 결과를 이어서 기록하려면 stream_exclude_papers 사용)
+            output_file: 최종 결과 파일 경로 (형식은 확장자로 결정, None이면 저장/체크포인트 생략)
+            checkpoint_interval: 체크포인트 저널을 디스크에 반영하는 간격 (논문 수)
+            max_concurrency: 1보다 크면 비동기로 동시에 보낼 최대 요청 수
+                (이미 실행 중인 이벤트 루프 안에서는 aprocess_exclude_papers를 await해야 함)
+            batch_size: 한 요청에 묶어 보낼 논문 수 (1이면 논문별 요청)
+        """
+        if max_concurrency > 1:
+            self._check_no_running_loop('process_exclude_papers', 'aprocess_exclude_papers')
+            return asyncio.run(self.aprocess_exclude_papers(
+                input_file, output_file, checkpoint_interval, max_concurrency, batch_size
+            ))
+        
+        _, include_df, exclude_df = self._load_review_targets(input_file)
+        
+        if len(exclude_df) == 0:
+            self.logger.info("재검토 대상 논문이 없습니다.")
+            return self._finalize_results(include_df, [], output_file, None)
+        
+        journal = self._open_journal(output_file, checkpoint_interval)
+        paper_ids = self._paper_ids(exclude_df)
+        pending = self._pending_rows(paper_ids, journal)
+        routes = self._triage_routes(exclude_df, pending)
+        
+        self.logger.info(f"{len(pending)}개 논문 LLM 재검토 시작 "
+                         f"({len(exclude_df) - len(pending)}개는 저널에서 재개, 배치 크기 {batch_size})")
+        
+        # exclude된 논문들 처리
+        reviewed: Dict[int, Dict] = {}
+        try:
+            for batch_start in range(0, len(pending), batch_size):
+                indices = pending[batch_start:batch_start + batch_size]
+                for idx, result in zip(indices, self._review_rows(exclude_df, indices, routes)):
+                    reviewed[idx] = result
+                    if journal is not None:
+                        journal.append(paper_ids[idx], result)
+        finally:
+            if journal is not None:
+                journal.close()
+        
+        results = self._collect_results(paper_ids, reviewed, journal)
+        return self._finalize_results(include_df, results, output_file, journal)
+    
+    def _pending_rows(self, paper_ids: List[str], journal: Optional[ReviewJournal]) -> List[int]:
+        """저널에 결과가 없는 논문 행 번호"""
+        if journal is None:
+            return list(range(len(paper_ids)))
+        return [idx for idx, paper_id in enumerate(paper_ids) if journal.get(paper_id) is None]
+    
+    def _collect_results(self, paper_ids: List[str], reviewed: Dict[int, Dict],
+                         journal: Optional[ReviewJournal]) -> List[Dict]:
+        """이번에 검토한 결과와 저널의 결과를 입력 순서대로 모음"""
+        return [reviewed[idx] if idx in reviewed else journal.get(paper_id)
+                for idx, paper_id in enumerate(paper_ids)]
+    
+    @staticmethod
+    def _check_no_running_loop(method: str, async_method: str):
+        """실행 중인 이벤트 루프 안에서 asyncio.run을 중첩 호출하지 않도록 확인"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        raise RuntimeError(f"실행 중인 이벤트 루프(노트북, 비동기 서버 등) 안에서는 동시 검토를 "
+                           f"{method}로 실행할 수 없습니다. await {async_method}(...)를 사용하세요.")
+    
+    def _include_result(self, record: Dict) -> Dict:
+        """규칙 기반 include 논문 레코드를 최종 결과 행으로 변환 (_finalize_results와 같은 컬럼)"""
+        result = dict(record)
+        for category in KEYWORD_CATEGORIES:
+            result[f"rule_{category}_keywords"] = record.get(f"{category}_keywords", '')
+        result['rule_result'] = record.get('result', 'include')
+        result.update({column: '' for column in LLM_OUTPUT_COLUMNS.values()})
+        result.update(INCLUDED_LLM_RESULT)
+        return result
+    
+    def _stream_columns(self, rule_columns: List[str]) -> List[str]:
+        """스트리밍 결과 파일 컬럼 (include 논문 결과 컬럼 뒤에 재검토 결과에만 있는 컬럼)"""
+        columns = list(self._include_result(dict.fromkeys(rule_columns, '')))
+        reviewed_columns = self._build_result({}, self._row_inputs({}), None, '')
+        return columns + [column for column in reviewed_columns if column not in columns]
+    
+    def _stream_windows(self, records: Iterable[Dict], journal: Optional[ReviewJournal],
+                        batch_size: int, columns: List[str]):
+        """규칙 기반 결과 레코드를 받는 대로 검토 창으로 묶어 반환
+        
+        창은 (rows, targets)로, rows는 입력 순서대로의 결과 행(검토할 논문 자리는 None),
+        targets는 검토할 논문의 (rows 내 위치, 논문 ID, 레코드) 목록이다.
+        검토할 exclude 논문이 batch_size편 모이거나 행이 STREAM_FLUSH_ROWS개 모이면 창을 닫는다.
+        columns: 첫 레코드의 컬럼을 여기에 기록
+        """
+        rows, targets = [], []
+        occurrences: Dict[str, int] = {}  # 논문 키별로 지금까지 나온 횟수
+        
+        for record in records:
+            if not columns:
+                columns.extend(record)
+            if record.get('result') == 'include':
+                rows.append(self._include_result(record))
+            elif record.get('result') == 'exclude':
+                key = ReviewJournal.paper_id(record)
+                paper_id = occurrence_key(key, occurrences.get(key, 0))
+                occurrences[key] = occurrences.get(key, 0) + 1
+                # 저널에 이미 결과가 있는 논문은 그 결과를 그대로 기록
+                done = journal.get(paper_id) if journal is not None else None
+                rows.append(done)
+                if done is None:
+                    targets.append((len(rows) - 1, paper_id, record))
+            else:
+                continue
             
-            results.append(result)
+            if len(targets) >= batch_size or len(rows) >= STREAM_FLUSH_ROWS:
+                yield rows, targets
+                rows, targets = [], []
+        
+        if rows:
+            yield rows, targets
+    
+    def _window_routes(self, targets: List[Tuple[int, str, Dict]]) -> Tuple[pd.DataFrame, List[str]]:
+        """검토 창의 논문 DataFrame과 처리 경로 (사전 선별 통계는 누적)"""
+        window = pd.DataFrame([record for _, _, record in targets])
+        return window, self._triage_routes(window, accumulate=True)
+    
+    def _fill_window(self, rows: List[Optional[Dict]], targets: List[Tuple[int, str, Dict]],
+                     results: List[Dict], journal: Optional[ReviewJournal]):
+        """검토 결과를 창의 자리에 채우고 체크포인트 저널에 추가"""
+        for (position, paper_id, _), result in zip(targets, results):
+            rows[position] = result
+            if journal is not None:
+                journal.append(paper_id, result)
+    
+    def _open_stream(self, output_file: Optional[str], checkpoint_interval: int):
+        """스트리밍 재검토용 결과 기록기, 체크포인트 저널, 입력 컬럼 목록(첫 레코드에서 채움)"""
+        columns: List[str] = []
+        writer = StreamResultWriter(output_file, lambda: self._stream_columns(columns or RULE_RESULT_COLUMNS))
+        journal = self._open_journal(output_file, checkpoint_interval)
+        self.triage_stats = {}
+        return writer, journal, columns
+    
+    def _finish_stream(self, writer: StreamResultWriter, journal: Optional[ReviewJournal]) -> Dict:
+        """스트리밍 재검토 마무리 (헤더만 있는 파일 보장, 저널 정리, 요약 로그)"""
+        writer.close()
+        if journal is not None:
+            journal.remove()
+        
+        stats = writer.stats
+        if stats['total'] == stats['rule_include']:
+            self.logger.info("재검토 대상 논문이 없습니다.")
+        self._log_review_summary(writer.path, stats['rule_include'], stats['llm_rescued'],
+                                 stats['final_exclude'])
+        return {**stats, 'rescued_keywords': writer.rescued_keywords}
+    
+    def stream_exclude_papers(self, records: Iterable[Dict], output_file: Optional[str] = None,
+                              checkpoint_interval: int = 5,
+                              max_concurrency: int = 1,
+                              batch_size: int = 1) -> Dict:
+        """
+        규칙 기반 결과 레코드를 받는 대로 재검토하고 창 단위로 최종 결과 CSV에 이어서 기록
+        
+        include 논문은 그대로, exclude 논문은 batch_size편씩 검토가 끝나는 대로 입력 순서대로 기록하므로
+        규칙 기반 단계가 끝나기 전에 LLM 검토를 시작하고, 전체 결과를 메모리에 모으지 않는다.
+        체크포인트 저널은 process_exclude_papers와 같아서 중단 후 다시 실행하면 검토한 논문을 건너뛴다.
+        
+        Args:
+            records: 규칙 기반 결과 레코드(dict) 이터레이터
+            output_file: 최종 결과 CSV 경로 (None이면 저장/체크포인트 생략, 집계만)
+            checkpoint_interval: 체크포인트 저널을 디스크에 반영하는 간격 (논문 수)
+            max_concurrency: 1보다 크면 비동기로 동시에 보낼 최대 요청 수
+                (이미 실행 중인 이벤트 루프 안에서는 astream_exclude_papers를 await해야 함)
+            batch_size: 한 요청에 묶어 보낼 논문 수 (1이면 논문별 요청)
             
-            # 체크포인트 저장
-            if (idx + 1) % checkpoint_interval == 0:
-                checkpoint_df = pd.DataFrame(results)
-                checkpoint_df.to_csv(checkpoint_path, index=False, encoding='utf-8-sig')
-                self.logger.info(f"체크포인트 저장: {idx + 1}/{total_exclude}개 논문 처리 완료")
+        Returns:
+            hybrid_result_stats와 같은 누적 건수와 'rescued_keywords'(구제된 논문의 카테고리별 고유 키워드)
+        """
+        if max_concurrency > 1:
+            self._check_no_running_loop('stream_exclude_papers', 'astream_exclude_papers')
+            return asyncio.run(self.astream_exclude_papers(
+                records, output_file, checkpoint_interval, max_concurrency, batch_size
+            ))
         
+        writer, journal, columns = self._open_stream(output_file, checkpoint_interval)
+        self.logger.info(f"규칙 기반 결과를 받는 대로 LLM 재검토 시작 (배치 크기 {batch_size})")
+        
+        try:
+            for rows, targets in self._stream_windows(records, journal, batch_size, columns):
+                if targets:
+                    window, routes = self._window_routes(targets)
+                    self._fill_window(rows, targets, self._review_rows(window, range(len(window)), routes),
+                                      journal)
+                writer.write(rows)
+        finally:
+            if journal is not None:
+                journal.close()
+        
+        return self._finish_stream(writer, journal)
+    
+    async def astream_exclude_papers(self, records: Iterable[Dict], output_file: Optional[str] = None,
+                                     checkpoint_interval: int = 5,
+                                     max_concurrency: int = 8,
+                                     batch_size: int = 1) -> Dict:
+        """
+        stream_exclude_papers의 비동기 버전 (검토 창을 최대 max_concurrency개 요청으로 동시에 검토)
+        
+        레코드를 받는 대로 창을 만들어 검토를 시작하고, 끝난 창은 입력 순서대로 기록한다.
+        진행 중인 창은 max_concurrency * 2개까지만 두어 읽기가 검토보다 앞서 나가지 않도록 한다.
+        """
+        writer, journal, columns = self._open_stream(output_file, checkpoint_interval)
+        self.logger.info(f"규칙 기반 결과를 받는 대로 LLM 비동기 재검토 시작 "
+                         f"(동시 요청 {max_concurrency}개, 배치 크기 {batch_size})")
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def review(rows: List[Optional[Dict]], targets: List[Tuple[int, str, Dict]]):
+            if targets:
+                window, routes = self._window_routes(targets)
+                async with semaphore:
+                    results = await self._areview_rows(window, range(len(window)), routes)
+                self._fill_window(rows, targets, results, journal)
+            return rows
+        
+        in_flight = deque()
+        try:
+            for rows, targets in self._stream_windows(records, journal, batch_size, columns):
+                in_flight.append(asyncio.create_task(review(rows, targets)))
+                # 새 창의 요청을 시작시킨 뒤, 앞에서부터 끝난 창을 기록
+                await asyncio.sleep(0)
+                while in_flight and (in_flight[0].done() or len(in_flight) >= max_concurrency * 2):
+                    writer.write(await in_flight.popleft())
+            while in_flight:
+                writer.write(await in_flight.popleft())
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if journal is not None:
+                journal.close()
+        
+        return self._finish_stream(writer, journal)
+    
+    async def aprocess_exclude_papers(self, input_file: Union[str, pd.DataFrame, Iterable[Dict]],
+                                      output_file: Optional[str] = None,
+                                      checkpoint_interval: int = 5,
+                                      max_concurrency: int = 8,
+                                      batch_size: int = 1) -> pd.DataFrame:
+        """
+        exclude된 논문들을 비동기로 동시에 LLM 재검토
+        
+        최대 max_concurrency개 요청을 동시에 보내고, 결과는 입력 순서대로 기록한다.
+        체크포인트 저널에는 완료된 순서대로 논문 ID와 함께 추가되므로 동기 버전과 같은 방식으로 재개된다.
+        
+        Args:
+            input_file: 규칙 기반 결과 파일 경로 (.csv, .parquet, .feather), 결과 DataFrame,
+                또는 결과 레코드(dict) 이터레이터 (이터레이터는 모두 받은 뒤 검토 시작)
+            output_file: 최종 결과 파일 경로 (형식은 확장자로 결정, None이면 저장/체크포인트 생략)
+            checkpoint_interval: 체크포인트 저널을 디스크에 반영하는 간격 (논문 수)
+            max_concurrency: 동시에 보낼 최대 요청 수
+            batch_size: 한 요청에 묶어 보낼 논문 수 (1이면 논문별 요청)
+        """
+        _, include_df, exclude_df = self._load_review_targets(input_file)
+        
+        if len(exclude_df) == 0:
+            self.logger.info("재검토 대상 논문이 없습니다.")
+            return self._finalize_results(include_df, [], output_file, None)
+        
+        journal = self._open_journal(output_file, checkpoint_interval)
+        paper_ids = self._paper_ids(exclude_df)
+        pending = self._pending_rows(paper_ids, journal)
+        routes = self._triage_routes(exclude_df, pending)
+        
+        self.logger.info(f"{len(pending)}개 논문 LLM 비동기 재검토 시작 "
+                         f"({len(exclude_df) - len(pending)}개는 저널에서 재개, "
+                         f"동시 요청 {max_concurrency}개, 배치 크기 {batch_size})")
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        reviewed: Dict[int, Dict] = {}
+        
+        async def review(indices: List[int]):
+            async with semaphore:
+                return indices, await self._areview_rows(exclude_df, indices, routes)
+        
+        tasks = [asyncio.create_task(review(pending[batch_start:batch_start + batch_size]))
+                 for batch_start in range(0, len(pending), batch_size)]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                indices, batch_results = await next_done
+                for idx, result in zip(indices, batch_results):
+                    reviewed[idx] = result
+                    if journal is not None:
+                        journal.append(paper_ids[idx], result)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if journal is not None:
+                journal.close()
+        
+        results = self._collect_results(paper_ids, reviewed, journal)
+        return self._finalize_results(include_df, results, output_file, journal)
+    
+    def _finalize_results(self, include_df: pd.DataFrame, results: List[Dict],
+                          output_file: Optional[str], journal: Optional[ReviewJournal]) -> pd.DataFrame:
+        """재검토 결과와 기존 include 논문 병합 후 저장 (output_file이 None이면 저장 생략)"""
         # 처리된 exclude 논문들과 기존 include 논문들 병합
         exclude_results_df = pd.DataFrame(results)
         
-        # include 논문들을 위한 컬럼 추가
-        include_with_llm = include_df.copy()
-        include_with_llm['rule_depression_keywords'] = include_with_llm['depression_keywords']
-        include_with_llm['rule_mobile_keywords'] = include_with_llm['mobile_keywords']
-        include_with_llm['rule_behavioral_keywords'] = include_with_llm['behavioral_keywords']
-        include_with_llm['rule_result'] = include_with_llm['result']
-        include_with_llm['llm_depression_keywords'] = ''
-        include_with_llm['llm_mobile_keywords'] = ''
-        include_with_llm['llm_behavioral_keywords'] = ''
-        include_with_llm['llm_result'] = 'not_processed'
-        include_with_llm['llm_depression_highlight'] = ''
-        include_with_llm['llm_mobile_highlight'] = ''
-        include_with_llm['llm_behavioral_highlight'] = ''
-        include_with_llm['llm_reason'] = '이미 규칙 기반에서 포함됨'
-        include_with_llm['final_result'] = 'include'
+        # include 논문들을 위한 컬럼 추가 (컬럼 단위로 한 번에 할당)
+        include_columns = {f"rule_{category}_keywords": include_df[f"{category}_keywords"]
+                           for category in KEYWORD_CATEGORIES}
+        include_columns['rule_result'] = include_df['result']
+        include_columns.update({column: '' for column in LLM_OUTPUT_COLUMNS.values()})
+        include_columns.update(INCLUDED_LLM_RESULT)
+        include_with_llm = include_df.assign(**include_columns)
         
         # 최종 결과 병합
         final_df = pd.concat([include_with_llm, exclude_results_df], ignore_index=True)
         
         # 최종 결과 저장
-        final_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+        if output_file:
+            save_results(final_df, output_file)
         
-        # 체크포인트 파일 정리
-        if os.path.exists(checkpoint_path):
-            os.remove(checkpoint_path)
-        
-        self.logger.info(f"LLM 2차 검토 완료. 결과 저장: {output_file}")
+        # 체크포인트 저널 정리
+        if journal is not None:
+            journal.remove()
         
         # 요약 통계
-        llm_include_count = sum(1 for r in results if r['final_result'] == 'include')
-        llm_exclude_count = len(results) - llm_include_count
-        total_include = len(include_df) + llm_include_count
-        total_exclude = llm_exclude_count
+        llm_include_count = int((exclude_results_df['final_result'] == 'include').sum()) if results else 0
+        self._log_review_summary(output_file, len(include_df), llm_include_count,
+                                 len(results) - llm_include_count)
+        
+        return final_df
+    
+    def _log_review_summary(self, output_file: Optional[str], include_count: int,
+                            llm_include_count: int, llm_exclude_count: int):
+        """LLM 2차 검토 요약 로그 (사전 선별, 캐시 통계 포함)"""
+        if output_file:
+            self.logger.info(f"LLM 2차 검토 완료. 결과 저장: {output_file}")
+        else:
+            self.logger.info("LLM 2차 검토 완료 (결과 파일 저장 생략)")
         
         self.logger.info(f"=== LLM 2차 검토 요약 ===")
-        self.logger.info(f"기존 규칙 기반 include: {len(include_df)}개")
+        self.logger.info(f"기존 규칙 기반 include: {include_count}개")
         self.logger.info(f"LLM 2차 검토에서 include로 변경: {llm_include_count}개")
         self.logger.info(f"LLM 2차 검토에서도 exclude: {llm_exclude_count}개")
-        self.logger.info(f"최종 include: {total_include}개")
-        self.logger.info(f"최종 exclude: {total_exclude}개")
+        self.logger.info(f"최종 include: {include_count + llm_include_count}개")
+        self.logger.info(f"최종 exclude: {llm_exclude_count}개")
         
-        return final_df
+        if self.triage_stats:
+            self.logger.info(f"사전 선별로 LLM 검토 생략: {self.triage_stats['skipped_count']}개 "
+                             f"(예상 절감 토큰 약 {self.triage_stats['estimated_saved_tokens']}개)")
+        
+        if self.cache is not None:
+            cache_stats = self.cache.stats()
+            self.logger.info(f"LLM 캐시 적중: {cache_stats['hits']}회, 미스: {cache_stats['misses']}회, "
+                             f"저장 항목: {cache_stats['entries']}개")
 
 def main():
     """메인 실행 함수"""
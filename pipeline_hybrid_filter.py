@@ -7,23 +7,34 @@
 """
 
 import pandas as pd
+import argparse
 import logging
 import os
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from pathlib import Path
 
 from rule_based_filter import RuleBasedKeywordFilter
-from llm_secondary_filter import LLMSecondaryFilter
+from llm_secondary_filter import LLMSecondaryFilter, RuleEvidenceTriage
+from result_store import (FORMAT_SUFFIXES, export_csv_copy, hybrid_result_stats, load_results,
+                          rescued_mask, result_path, save_results, unique_keywords)
 
 class HybridFilterPipeline:
-    def __init__(self, llm_model: str = "gpt-4o", debug: bool = False):
+    def __init__(self, llm_model: str = "gpt-4o", debug: bool = False,
+                 triage: Optional[RuleEvidenceTriage] = None,
+                 cheap_llm_model: Optional[str] = None,
+                 requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None):
         """
         하이브리드 필터 파이프라인 초기화
         
         Args:
             llm_model: LLM 모델명
             debug: 디버그 모드 활성화
+            triage: LLM 검토 전 exclude 논문 사전 선별기 (None이면 전부 검토)
+            cheap_llm_model: 사전 선별에서 'cheap'으로 분류된 논문을 검토할 모델명
+            requests_per_minute: LLM 분당 최대 요청 수 (None이면 제한 없음)
+            tokens_per_minute: LLM 분당 최대 토큰 수 (None이면 제한 없음)
         """
         self.llm_model = llm_model
         self.debug = debug
@@ -47,17 +58,31 @@ class HybridFilterPipeline:
         
         # 필터 시스템 초기화
         self.rule_filter = RuleBasedKeywordFilter()
-        self.llm_filter = LLMSecondaryFilter(model_name=llm_model, debug=debug)
+        self.llm_filter = LLMSecondaryFilter(model_name=llm_model, debug=debug, triage=triage,
+                                             cheap_model_name=cheap_llm_model,
+                                             requests_per_minute=requests_per_minute,
+                                             tokens_per_minute=tokens_per_minute)
         
         self.logger.info(f"HybridFilterPipeline 초기화 완료 - LLM 모델: {llm_model}")
     
-    def run_pipeline(self, input_file: str, output_dir: str = "output") -> Dict:
+    def run_pipeline(self, input_file: str, output_dir: str = "output",
+                     chunk_size: Optional[int] = None, result_format: str = "csv",
+                     export_csv: bool = True, persist_rule_results: bool = True,
+                     max_concurrency: int = 1, batch_size: int = 1) -> Dict:
         """
         하이브리드 필터링 파이프라인 실행
         
         Args:
             input_file: 입력 CSV 파일 경로
             output_dir: 출력 디렉토리
+            chunk_size: 지정하면 규칙 기반 단계에서 입력 CSV를 이 행 수 단위로 스트리밍 처리하고,
+                청크 결과를 만드는 대로 LLM 2차 검토에 넘겨 검토가 끝난 창부터 최종 결과 CSV에 이어서 기록
+                (이 경우 단계별 결과는 항상 CSV)
+            result_format: 단계별 결과 저장 형식 ('csv', 'parquet', 'feather')
+            export_csv: result_format이 CSV가 아닐 때 최종 결과의 검토자용 CSV 사본도 저장
+            persist_rule_results: 규칙 기반 중간 결과도 파일로 저장 (LLM 단계에는 항상 메모리로 전달)
+            max_concurrency: LLM 2차 검토에서 동시에 보낼 최대 요청 수 (1이면 순차 처리)
+            batch_size: LLM 2차 검토에서 한 요청에 묶어 보낼 논문 수 (1이면 논문별 요청)
             
         Returns:
             결과 요약 딕셔너리
@@ -69,49 +94,82 @@ class HybridFilterPipeline:
         os.makedirs("rule_base_output", exist_ok=True)
         
         # 파일 경로 설정
-        rule_output = f"rule_base_output/hybrid_rule_results_{timestamp}.csv"
-        final_output = f"{output_dir}/hybrid_final_results_{timestamp}.csv"
+        # (스트리밍 모드는 단계별 결과를 CSV로만 기록)
+        if chunk_size:
+            result_format = "csv"
+        rule_output = result_path(f"rule_base_output/hybrid_rule_results_{timestamp}",
+                                  result_format) if persist_rule_results else None
+        final_output = result_path(f"{output_dir}/hybrid_final_results_{timestamp}", result_format)
         
         try:
             self.logger.info("=== 하이브리드 필터링 파이프라인 시작 ===")
             
-            # 1단계: 원본 데이터 로드
-            self.logger.info(f"1단계: 데이터 로드 - {input_file}")
-            df = pd.read_csv(input_file, encoding='utf-8-sig')
-            self.logger.info(f"총 {len(df)}개 논문 로드 완료")
-            
-            # 2단계: 규칙 기반 필터링
-            self.logger.info("2단계: 규칙 기반 필터링 시작")
-            rule_results = self.rule_filter.process_dataframe(df)
-            rule_results.to_csv(rule_output, index=False, encoding='utf-8-sig')
-            
-            # 규칙 기반 결과 요약
-            rule_include = sum(1 for _, row in rule_results.iterrows() if row['result'] == 'include')
-            rule_exclude = len(rule_results) - rule_include
-            
-            self.logger.info(f"규칙 기반 결과: {rule_include}개 포함, {rule_exclude}개 제외")
-            self.logger.info(f"규칙 기반 결과 저장: {rule_output}")
-            
-            # 3단계: LLM 2차 검토 (exclude된 논문들만)
-            self.logger.info("3단계: LLM 2차 검토 시작")
-            final_results = self.llm_filter.process_exclude_papers(rule_output, final_output)
-            
-            # 최종 결과 요약
-            final_include = sum(1 for _, row in final_results.iterrows() if row['final_result'] == 'include')
-            final_exclude = len(final_results) - final_include
+            if chunk_size:
+                # 1-3단계: 입력을 청크 단위로 규칙 기반 필터링하면서 결과 레코드를 바로 LLM 2차 검토에 전달
+                self.logger.info(f"1-3단계: 스트리밍 규칙 기반 필터링 ({chunk_size}개 단위) 및 "
+                                 f"LLM 2차 검토 - {input_file}")
+                rule_stats = {'total': 0, 'include': 0, 'exclude': 0}
+                rule_records = (
+                    record
+                    for chunk_result in self.rule_filter.iter_csv_stream(
+                        input_file, rule_output, chunk_size, stats=rule_stats)
+                    for record in chunk_result.to_dict('records')
+                )
+                stream_stats = self.llm_filter.stream_exclude_papers(
+                    rule_records, final_output, max_concurrency=max_concurrency, batch_size=batch_size
+                )
+                rule_include = rule_stats['include']
+                rule_exclude = rule_stats['exclude']
+                
+                self.logger.info(f"규칙 기반 결과: {rule_include}개 포함, {rule_exclude}개 제외")
+                
+                # 최종 결과는 이미 파일에 기록됨 (누적 건수와 구제 키워드만 사용)
+                rescued_keywords = stream_stats.pop('rescued_keywords')
+                result_stats = stream_stats
+                final_csv_output = None
+            else:
+                # 1단계: 원본 데이터 로드
+                self.logger.info(f"1단계: 데이터 로드 - {input_file}")
+                df = pd.read_csv(input_file, encoding='utf-8-sig')
+                self.logger.info(f"총 {len(df)}개 논문 로드 완료")
+                
+                # 2단계: 규칙 기반 필터링
+                self.logger.info("2단계: 규칙 기반 필터링 시작")
+                rule_results = self.rule_filter.process_dataframe(df)
+                if rule_output:
+                    save_results(rule_results, rule_output)
+                
+                # 규칙 기반 결과 요약
+                rule_counts = rule_results['result'].value_counts()
+                rule_include = int(rule_counts.get('include', 0))
+                rule_exclude = len(rule_results) - rule_include
+                self.logger.info(f"규칙 기반 결과: {rule_include}개 포함, {rule_exclude}개 제외")
+                
+                # 3단계: LLM 2차 검토 (exclude된 논문들만, 규칙 기반 결과를 메모리로 전달)
+                self.logger.info("3단계: LLM 2차 검토 시작")
+                final_results = self.llm_filter.process_exclude_papers(
+                    rule_results, final_output, max_concurrency=max_concurrency, batch_size=batch_size
+                )
+                final_csv_output = export_csv_copy(final_results, final_output) if export_csv else None
+                
+                # 최종 결과 요약 (LLM에 의해 include로 변경된 논문 수 포함)
+                result_stats = hybrid_result_stats(final_results)
+                # 구제된 논문들의 고유 키워드
+                rescued_keywords = unique_keywords(final_results[rescued_mask(final_results)])
             
-            # LLM에 의해 include로 변경된 논문 수
-            llm_rescued = sum(1 for _, row in final_results.iterrows() 
-                            if row['rule_result'] == 'exclude' and row['final_result'] == 'include')
+            if rule_output:
+                self.logger.info(f"규칙 기반 결과 저장: {rule_output}")
             
-            self.logger.info(f"최종 결과: {final_include}개 포함, {final_exclude}개 제외")
-            self.logger.info(f"LLM 2차 검토로 구제된 논문: {llm_rescued}개")
+            self.logger.info(f"최종 결과: {result_stats['final_include']}개 포함, "
+                             f"{result_stats['final_exclude']}개 제외")
+            self.logger.info(f"LLM 2차 검토로 구제된 논문: {result_stats['llm_rescued']}개")
             self.logger.info(f"최종 결과 저장: {final_output}")
+            if final_csv_output:
+                self.logger.info(f"검토용 CSV 사본 저장: {final_csv_output}")
             
             # 4단계: 결과 분석 및 요약
             pipeline_summary = self._generate_pipeline_summary(
-                rule_results, final_results, rule_include, rule_exclude, 
-                final_include, final_exclude, llm_rescued
+                rule_include, rule_exclude, result_stats, rescued_keywords
             )
             
             # 요약 저장
@@ -126,6 +184,7 @@ class HybridFilterPipeline:
             return {
                 'rule_output_file': rule_output,
                 'final_output_file': final_output,
+                'final_csv_file': final_csv_output or (final_output if final_output.endswith('.csv') else None),
                 'summary_file': summary_output,
                 'pipeline_summary': pipeline_summary
             }
@@ -134,72 +193,49 @@ class HybridFilterPipeline:
             self.logger.error(f"파이프라인 실행 중 오류: {e}")
             raise
     
-    def _generate_pipeline_summary(self, rule_results: pd.DataFrame, 
-                                 final_results: pd.DataFrame,
-                                 rule_include: int, rule_exclude: int,
-                                 final_include: int, final_exclude: int,
-                                 llm_rescued: int) -> Dict:
-        """파이프라인 실행 요약 생성"""
-        
-        # LLM 검토 대상 논문들의 상세 분석
-        llm_processed = final_results[final_results['rule_result'] == 'exclude']
-        llm_include_papers = llm_processed[llm_processed['final_result'] == 'include']
-        
-        # 구제된 논문들의 키워드 분석
-        rescued_keywords = {
-            'depression': [],
-            'mobile': [],
-            'behavioral': []
-        }
-        
-        for _, row in llm_include_papers.iterrows():
-            if row['llm_depression_keywords']:
-                rescued_keywords['depression'].extend(
-                    [k.strip() for k in str(row['llm_depression_keywords']).split(',') if k.strip()]
-                )
-            if row['llm_mobile_keywords']:
-                rescued_keywords['mobile'].extend(
-                    [k.strip() for k in str(row['llm_mobile_keywords']).split(',') if k.strip()]
-                )
-            if row['llm_behavioral_keywords']:
-                rescued_keywords['behavioral'].extend(
-                    [k.strip() for k in str(row['llm_behavioral_keywords']).split(',') if k.strip()]
-                )
-        
-        # 고유 키워드 집계
-        for category in rescued_keywords:
-            rescued_keywords[category] = list(set(rescued_keywords[category]))
+    def _generate_pipeline_summary(self, rule_include: int, rule_exclude: int,
+                                 result_stats: Dict[str, int],
+                                 rescued_keywords: Dict[str, List[str]]) -> Dict:
+        """파이프라인 실행 요약 생성 (result_stats: hybrid_result_stats 집계,
+        rescued_keywords: 구제된 논문들의 카테고리별 고유 키워드)"""
+        total_papers = rule_include + rule_exclude
+        final_include = result_stats['final_include']
+        final_exclude = result_stats['final_exclude']
+        llm_rescued = result_stats['llm_rescued']
+        llm_processed_count = result_stats['llm_processed']
         
         summary = {
             'pipeline_info': {
                 'execution_time': datetime.now().isoformat(),
-                'total_papers': len(rule_results),
+                'total_papers': total_papers,
                 'llm_model': self.llm_model
             },
             'rule_based_results': {
                 'include_count': rule_include,
                 'exclude_count': rule_exclude,
-                'include_rate': round(rule_include / len(rule_results) * 100, 2)
+                'include_rate': round(rule_include / total_papers * 100, 2) if total_papers > 0 else 0
             },
             'llm_secondary_results': {
-                'processed_count': len(llm_processed),
+                'processed_count': llm_processed_count,
                 'rescued_count': llm_rescued,
-                'rescue_rate': round(llm_rescued / len(llm_processed) * 100, 2) if len(llm_processed) > 0 else 0
+                'rescue_rate': round(llm_rescued / llm_processed_count * 100, 2) if llm_processed_count > 0 else 0
+            },
+            'triage': {
+                'enabled': self.llm_filter.triage is not None,
+                **self.llm_filter.triage_stats
             },
             'final_results': {
                 'include_count': final_include,
                 'exclude_count': final_exclude,
-                'include_rate': round(final_include / len(final_results) * 100, 2),
-                'improvement_over_rule_based': round((final_include - rule_include) / len(rule_results) * 100, 2)
+                'include_rate': (round(final_include / result_stats['total'] * 100, 2)
+                                 if result_stats['total'] > 0 else 0),
+                'improvement_over_rule_based': (round((final_include - rule_include) / total_papers * 100, 2)
+                                                if total_papers > 0 else 0)
             },
             'rescued_papers_analysis': {
                 'count': llm_rescued,
                 'unique_keywords': rescued_keywords,
-                'keyword_counts': {
-                    'depression': len(rescued_keywords['depression']),
-                    'mobile': len(rescued_keywords['mobile']),
-                    'behavioral': len(rescued_keywords['behavioral'])
-                }
+                'keyword_counts': {category: len(keywords) for category, keywords in rescued_keywords.items()}
             }
         }
         
@@ -211,17 +247,17 @@ class HybridFilterPipeline:
         report_file = f"{output_dir}/hybrid_comparison_report_{timestamp}.md"
         
         # 결과 데이터 로드
-        df = pd.read_csv(results_file, encoding='utf-8-sig')
+        df = load_results(results_file)
         
         # 분석 수행
-        total_papers = len(df)
-        rule_include = sum(1 for _, row in df.iterrows() if row['rule_result'] == 'include')
-        final_include = sum(1 for _, row in df.iterrows() if row['final_result'] == 'include')
-        llm_rescued = sum(1 for _, row in df.iterrows() 
-                         if row['rule_result'] == 'exclude' and row['final_result'] == 'include')
+        result_stats = hybrid_result_stats(df)
+        total_papers = result_stats['total']
+        rule_include = result_stats['rule_include']
+        final_include = result_stats['final_include']
+        llm_rescued = result_stats['llm_rescued']
         
         # 구제된 논문들 분석
-        rescued_papers = df[(df['rule_result'] == 'exclude') & (df['final_result'] == 'include')]
+        rescued_papers = df[rescued_mask(df)]
         
         # 리포트 작성
         report_content = f"""# 하이브리드 키워드 필터링 비교 분석 리포트
@@ -280,14 +316,52 @@ class HybridFilterPipeline:
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="하이브리드 키워드 필터링 파이프라인")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="지정하면 입력 CSV를 이 행 수 단위로 스트리밍 처리하고 "
+                             "LLM 검토가 끝난 창부터 최종 결과에 이어서 기록")
+    parser.add_argument("--max-concurrency", type=int, default=1,
+                        help="LLM 2차 검토에서 동시에 보낼 최대 요청 수 (기본값: 1, 순차 처리)")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="LLM 2차 검토에서 한 요청에 묶어 보낼 논문 수 (기본값: 1, 논문별 요청)")
+    parser.add_argument("--rpm", type=int, default=None,
+                        help="LLM 분당 최대 요청 수 (기본값: 제한 없음)")
+    parser.add_argument("--tpm", type=int, default=None,
+                        help="LLM 분당 최대 토큰 수 (기본값: 제한 없음)")
+    parser.add_argument("--triage-skip-below", type=float, default=None,
+                        help="사전 선별 점수(0~3)가 이 값 미만인 exclude 논문은 LLM 검토 없이 제외 "
+                             "(기본값: 사전 선별 안 함)")
+    parser.add_argument("--triage-cheap-below", type=float, default=None,
+                        help="사전 선별 점수가 이 값 미만인 exclude 논문은 --cheap-model로 검토")
+    parser.add_argument("--cheap-model", type=str, default=None,
+                        help="--triage-cheap-below 미만 논문을 검토할 저렴한 LLM 모델명")
+    parser.add_argument("--format", choices=sorted(FORMAT_SUFFIXES), default="csv",
+                        help="단계별 결과 저장 형식 (기본값: csv, 스트리밍 모드는 항상 csv)")
+    parser.add_argument("--export-csv", action=argparse.BooleanOptionalAction, default=True,
+                        help="--format이 csv가 아닐 때 최종 결과의 검토자용 CSV 사본도 저장 (기본값: 저장)")
+    args = parser.parse_args()
+    
+    # 사전 선별 설정 (임계값 중 하나라도 지정하면 사용, 제외 임계값이 없으면 제외하지 않음)
+    triage = None
+    if args.triage_skip_below is not None or args.triage_cheap_below is not None:
+        triage = RuleEvidenceTriage(
+            skip_below=args.triage_skip_below if args.triage_skip_below is not None else 0.0,
+            cheap_below=args.triage_cheap_below
+        )
+    
     # 설정
     input_file = "data/meta_article_data.csv"
     output_dir = "output"
     
     try:
         # 파이프라인 실행
-        pipeline = HybridFilterPipeline(llm_model="gpt-4o", debug=True)
-        results = pipeline.run_pipeline(input_file, output_dir)
+        pipeline = HybridFilterPipeline(llm_model="gpt-4o", debug=True, triage=triage,
+                                        cheap_llm_model=args.cheap_model,
+                                        requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+        results = pipeline.run_pipeline(input_file, output_dir, chunk_size=args.chunk_size,
+                                        result_format=args.format,
+                                        export_csv=args.export_csv, max_concurrency=args.max_concurrency,
+                                        batch_size=args.batch_size)
         
         # 비교 분석 리포트 생성
         report_file = pipeline.generate_comparison_report(
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+단계별 결과 저장소 및 집계
+
+규칙 기반 / LLM 2차 검토 / 하이브리드 파이프라인의 결과 DataFrame을
+파일 확장자에 맞는 형식(CSV, Parquet, Arrow/Feather)으로 저장하고 읽는다.
+Arrow 계열 형식은 판정 컬럼을 category 타입으로 저장해 다음 단계가
+CSV를 다시 파싱하지 않고 타입이 유지된 컬럼을 그대로 읽을 수 있다.
+
+요약과 리포트에 쓰는 건수/키워드 집계도 행 단위 반복 없이 컬럼 연산으로 계산한다.
+"""
+
+import hashlib
+import re
+from collections import namedtuple
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+# 판정 값만 담는 컬럼 (Arrow 계열 형식에서 category로 저장)
+CATEGORICAL_COLUMNS = ('result', 'rule_result', 'llm_result', 'final_result')
+
+# 키워드 카테고리 (결과 컬럼은 {접두어}{카테고리}_keywords)
+KEYWORD_CATEGORIES = ('depression', 'mobile', 'behavioral')
+
+# DOI 앞의 URL/접두어 (논문 고유 키 정규화용)
+DOI_PREFIX = re.compile(r'^(?:https?://)?(?:dx\.)?doi\.org/|^doi:\s*')
+# 논문 고유 키로 인정하는 DOI 형식 (접두어 제거 후, 'Health Canada' 같은 잘못된 값 제외)
+DOI_PATTERN = re.compile(r'^10\.\d{4,9}/')
+
+# 형식 이름 → 기본 확장자
+FORMAT_SUFFIXES = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather',
+}
+
+ResultFormat = namedtuple('ResultFormat', ['reader', 'writer'])
+
+def typed_results(df: pd.DataFrame) -> pd.DataFrame:
+    """Arrow 저장용으로 컬럼 타입 정리
+    
+    판정 컬럼은 category로, 문자열과 숫자가 섞인 object 컬럼은 문자열로 통일한다
+    (결측값은 그대로 유지).
+    """
+    typed = df.copy()
+    
+    for column in typed.columns:
+        if column in CATEGORICAL_COLUMNS:
+            typed[column] = typed[column].astype('category')
+        elif typed[column].dtype == object:
+            if pd.api.types.infer_dtype(typed[column], skipna=True) not in ('string', 'empty'):
+                typed[column] = typed[column].map(lambda v: v if pd.isna(v) else str(v))
+    
+    return typed
+
+def _read_csv(path: str) -> pd.DataFrame:
+    return pd.read_csv(path, encoding='utf-8-sig')
+
+def _write_csv(df: pd.DataFrame, path: str):
+    df.to_csv(path, index=False, encoding='utf-8-sig')
+
+def _read_parquet(path: str) -> pd.DataFrame:
+    return pd.read_parquet(path)
+
+def _write_parquet(df: pd.DataFrame, path: str):
+    typed_results(df).to_parquet(path, index=False)
+
+def _read_feather(path: str) -> pd.DataFrame:
+    return pd.read_feather(path)
+
+def _write_feather(df: pd.DataFrame, path: str):
+    typed_results(df).reset_index(drop=True).to_feather(path)
+
+# 확장자 → 읽기/쓰기 함수
+RESULT_FORMATS: Dict[str, ResultFormat] = {
+    '.csv': ResultFormat(_read_csv, _write_csv),
+    '.parquet': ResultFormat(_read_parquet, _write_parquet),
+    '.feather': ResultFormat(_read_feather, _write_feather),
+    '.arrow': ResultFormat(_read_feather, _write_feather),
+}
+
+def register_result_format(suffixes: Iterable[str],
+                           reader: Callable[[str], pd.DataFrame],
+                           writer: Callable[[pd.DataFrame, str], None]):
+    """새 결과 저장 형식 등록 (suffixes: '.xlsx'처럼 점을 포함한 확장자)"""
+    for suffix in suffixes:
+        RESULT_FORMATS[suffix.lower()] = ResultFormat(reader, writer)
+
+def _result_format(path: str) -> ResultFormat:
+    suffix = Path(path).suffix.lower()
+    if suffix not in RESULT_FORMATS:
+        raise ValueError(f"지원하지 않는 결과 파일 형식: {path} "
+                         f"(지원 형식: {', '.join(sorted(RESULT_FORMATS))})")
+    return RESULT_FORMATS[suffix]
+
+def result_path(path: str, result_format: str) -> str:
+    """경로의 확장자를 형식 이름('csv', 'parquet', 'feather')에 맞게 변경"""
+    if result_format not in FORMAT_SUFFIXES:
+        raise ValueError(f"지원하지 않는 결과 형식: {result_format} "
+                         f"(지원 형식: {', '.join(FORMAT_SUFFIXES)})")
+    return str(Path(path).with_suffix(FORMAT_SUFFIXES[result_format]))
+
+def load_results(path: str) -> pd.DataFrame:
+    """결과 파일 로드 (형식은 확장자로 결정)"""
+    return _result_format(path).reader(path)
+
+def export_csv_copy(df: pd.DataFrame, path: str) -> Optional[str]:
+    """검토자용 CSV 사본 저장 (path와 같은 이름의 .csv, path가 이미 CSV면 저장하지 않음)"""
+    csv_path = str(Path(path).with_suffix('.csv'))
+    if csv_path == path:
+        return None
+    _write_csv(df, csv_path)
+    return csv_path
+
+def save_results(df: pd.DataFrame, path: str, export_csv: bool = False) -> Optional[str]:
+    """결과 DataFrame 저장 (형식은 확장자로 결정)
+    
+    Args:
+        df: 저장할 결과
+        path: 저장 경로
+        export_csv: CSV가 아닌 형식으로 저장할 때 검토자용 CSV 사본도 같은 이름으로 저장
+    
+    Returns:
+        CSV 사본을 저장했으면 그 경로, 아니면 None
+    """
+    _result_format(path).writer(df, path)
+    return export_csv_copy(df, path) if export_csv else None
+
+def hybrid_result_stats(final_results: pd.DataFrame) -> Dict[str, int]:
+    """하이브리드 최종 결과의 포함/제외/구제 건수
+    
+    llm_processed는 규칙 기반에서 제외되어 실제로 LLM 검토를 받은 논문 수
+    (사전 선별로 생략된 논문 제외), llm_rescued는 규칙 기반 exclude에서 최종 include로 바뀐 논문 수.
+    """
+    rule_exclude = final_results['rule_result'] == 'exclude'
+    final_include = final_results['final_result'] == 'include'
+    llm_processed = rule_exclude & (final_results['llm_result'] != 'skipped')
+    
+    return {
+        'total': len(final_results),
+        'rule_include': int((final_results['rule_result'] == 'include').sum()),
+        'final_include': int(final_include.sum()),
+        'final_exclude': int((~final_include).sum()),
+        'llm_processed': int(llm_processed.sum()),
+        'llm_rescued': int((rule_exclude & final_include).sum())
+    }
+
+def rescued_mask(final_results: pd.DataFrame) -> pd.Series:
+    """규칙 기반 exclude에서 최종 include로 바뀐 논문"""
+    return (final_results['rule_result'] == 'exclude') & (final_results['final_result'] == 'include')
+
+def explode_keywords(values: pd.Series) -> pd.Series:
+    """쉼표로 구분된 키워드 문자열 컬럼을 키워드 하나당 한 행으로 펼침 (빈 값 제외)"""
+    keywords = values.dropna().astype(str).str.split(',').explode().str.strip()
+    return keywords[keywords != '']
+
+def unique_keywords(df: pd.DataFrame, prefix: str = 'llm_') -> Dict[str, List[str]]:
+    """카테고리별 고유 키워드 (처음 나온 순서)"""
+    return {
+        category: explode_keywords(df[f"{prefix}{category}_keywords"]).unique().tolist()
+        for category in KEYWORD_CATEGORIES
+    }
+
+def _title_key(title) -> str:
+    normalized = ' '.join(str(title).lower().split())
+    return 'title:' + hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+def paper_key(row) -> str:
+    """논문 고유 키 (정규화한 DOI, DOI 형식이 아니거나 없으면 정규화한 제목의 해시)"""
+    doi = row.get('DOI', '')
+    if isinstance(doi, str):
+        doi = DOI_PREFIX.sub('', doi.strip().lower())
+        if DOI_PATTERN.match(doi):
+            return 'doi:' + doi
+    return _title_key(row.get('Title', ''))
+
+def paper_keys(df: pd.DataFrame) -> pd.Series:
+    """DataFrame 행별 paper_key (DOI 정규화는 컬럼 연산, 제목 해시는 DOI가 없는 행만 계산)"""
+    if 'DOI' in df.columns:
+        doi = df['DOI'].where(df['DOI'].map(lambda v: isinstance(v, str)), '').str.strip().str.lower()
+    else:
+        doi = pd.Series('', index=df.index, dtype=object)
+    doi = doi.str.replace(DOI_PREFIX, '', regex=True)
+    has_doi = doi.str.match(DOI_PATTERN).astype(bool)
+    
+    keys = 'doi:' + doi
+    titles = df['Title'] if 'Title' in df.columns else pd.Series('', index=df.index)
+    keys[~has_doi] = [_title_key(title) for title in titles[~has_doi]]
+    return keys
+
+def occurrence_key(key: str, occurrence: int) -> str:
+    """같은 키의 occurrence번째(0부터) 논문 키 (두 번째부터 '#순번' 추가)"""
+    return key if occurrence == 0 else f"{key}#{occurrence}"
+
+def unique_paper_keys(df: pd.DataFrame) -> pd.Series:
+    """행별로 겹치지 않는 논문 키 (같은 키가 여러 번 나오면 두 번째부터 '#순번' 추가)
+    
+    DOI가 여러 행에 잘못 들어가 있어도 행마다 다른 키가 되어, 한 행의 결과가 다른 행에 쓰이지 않는다.
+    """
+    keys = paper_keys(df)
+    occurrence = keys.groupby(keys).cumcount()
+    return keys.where(occurrence == 0, keys + '#' + occurrence.astype(str))
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+여러 검토자가 함께 쓰는 검토 저장소
+
+같은 결과 파일을 여러 검토자가 동시에 검토할 때 논문별 검토 결정과 점유(claim) 상태를
+SQLite(WAL 모드) 파일 하나에 모은다. 검토자는 아직 검토되지 않은 논문을 묶음 단위로 점유해
+서로 겹치지 않게 나눠 받고, 결정은 논문 단위로 기록되므로 다른 검토자의 결정을 덮어쓰지 않는다.
+점유는 lease_seconds 동안만 유효해 창을 닫고 떠난 검토자의 묶음은 다시 다른 검토자에게 돌아간다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 검토가 끝난 것으로 보는 검토 상태 (나머지는 점유 대상)
+REVIEWED_STATUSES = ('완료', 'include', 'exclude')
+
+class ReviewStore:
+    """
+    SQLite(WAL) 기반 논문별 검토 결정/점유 저장소
+    
+    논문은 결과 파일 안에서의 고유 키(paper_id)로 구분하고, 검토 값(검토 컬럼 → 값)은 논문별로
+    병합해 저장한다. 기록할 때마다 증가하는 순번(seq)을 함께 저장해 각 세션이
+    마지막으로 본 순번 이후의 결정만 가져갈 수 있다.
+    """
+    
+    def __init__(self, db_path: str, lease_seconds: float = 600.0):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        
+        # 트랜잭션은 직접 시작 (점유/기록은 BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡는다)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30.0, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS reviews (
+                paper_id TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                review_status TEXT NOT NULL DEFAULT '미완료',
+                review_values TEXT,
+                claimed_by TEXT,
+                lease_until REAL,
+                updated_by TEXT,
+                seq INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_reviews_status ON reviews (review_status, position)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_reviews_seq ON reviews (seq)")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+    
+    def _write(self, callback):
+        """쓰기 트랜잭션 안에서 callback(conn) 실행 (다른 프로세스와도 직렬화)"""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = callback(self.conn)
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            return result
+    
+    def _next_seq(self, conn) -> int:
+        return conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM reviews").fetchone()[0]
+    
+    def register_papers(self, paper_ids: Sequence[str], statuses: Sequence[str]):
+        """결과 파일의 논문 등록 (이미 있는 논문은 위치만 갱신하고 검토 결정은 유지)"""
+        rows = [
+            (paper_id, position, status if isinstance(status, str) else '')
+            for position, (paper_id, status) in enumerate(zip(paper_ids, statuses))
+        ]
+        self._write(lambda conn: conn.executemany(
+            "INSERT INTO reviews (paper_id, position, review_status) VALUES (?, ?, ?) "
+            "ON CONFLICT(paper_id) DO UPDATE SET position = excluded.position",
+            rows
+        ))
+    
+    @staticmethod
+    def _check_reviewer(reviewer: str):
+        """점유/기록에 쓸 검토자 이름 확인 (빈 이름은 모든 익명 세션이 같은 검토자가 되므로 거부)"""
+        if not isinstance(reviewer, str) or not reviewer.strip():
+            raise ValueError("검토자 이름이 비어 있습니다")
+    
+    def claim_batch(self, reviewer: str, batch_size: int = 10) -> List[str]:
+        """검토되지 않은 논문 최대 batch_size편 점유 (이미 점유 중인 논문 포함, 파일 순서)
+        
+        다른 검토자가 점유 중인 논문은 점유 기간이 끝날 때까지 건너뛴다.
+        """
+        self._check_reviewer(reviewer)
+        placeholders = ', '.join('?' for _ in REVIEWED_STATUSES)
+        
+        def claim(conn):
+            now = time.time()
+            paper_ids = [row[0] for row in conn.execute(
+                f"SELECT paper_id FROM reviews WHERE review_status NOT IN ({placeholders}) "
+                "AND (claimed_by IS NULL OR claimed_by = ? OR lease_until < ?) "
+                "ORDER BY claimed_by = ? DESC, position LIMIT ?",
+                (*REVIEWED_STATUSES, reviewer, now, reviewer, batch_size)
+            )]
+            conn.executemany(
+                "UPDATE reviews SET claimed_by = ?, lease_until = ? WHERE paper_id = ?",
+                [(reviewer, now + self.lease_seconds, paper_id) for paper_id in paper_ids]
+            )
+            return paper_ids
+        
+        return self._write(claim)
+    
+    def claim(self, paper_id: str, reviewer: str, lease_seconds: Optional[float] = None) -> Optional[str]:
+        """논문 하나 점유 (묶음 없이 직접 고른 논문, 기본은 lease_seconds 동안)
+        
+        Returns:
+            다른 검토자가 점유 중이거나 이미 검토한 논문이면 그 검토자 이름, 점유했으면 None
+        """
+        self._check_reviewer(reviewer)
+        lease_seconds = self.lease_seconds if lease_seconds is None else lease_seconds
+        
+        def claim(conn):
+            row = conn.execute(
+                "SELECT review_status, claimed_by, lease_until, updated_by FROM reviews WHERE paper_id = ?",
+                (paper_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"등록되지 않은 논문: {paper_id}")
+            
+            holder = self._holder(row, reviewer, time.time())
+            if holder:
+                return holder
+            
+            status, claimed_by, lease_until, _ = row
+            lease = time.time() + lease_seconds
+            if claimed_by == reviewer and lease_until:
+                lease = max(lease, lease_until)
+            conn.execute(
+                "UPDATE reviews SET claimed_by = ?, lease_until = ? WHERE paper_id = ?",
+                (reviewer, lease, paper_id)
+            )
+            return None
+        
+        return self._write(claim)
+    
+    @staticmethod
+    def _holder(row, reviewer: str, now: float, reset: bool = False) -> Optional[str]:
+        """(review_status, claimed_by, lease_until, updated_by) 행에서 reviewer의 기록을 막는 검토자
+        
+        다른 검토자의 점유가 살아 있거나, 다른 검토자가 이미 검토를 끝낸 논문이면 그 검토자
+        (reset이면 이미 끝난 검토는 막지 않는다).
+        """
+        status, claimed_by, lease_until, updated_by = row
+        if claimed_by and claimed_by != reviewer and lease_until is not None and lease_until >= now:
+            return claimed_by
+        if not reset and status in REVIEWED_STATUSES and updated_by is not None and updated_by != reviewer:
+            return updated_by
+        return None
+    
+    def release(self, reviewer: str):
+        """검토자의 남은 점유 해제"""
+        self._write(lambda conn: conn.execute(
+            "UPDATE reviews SET claimed_by = NULL, lease_until = NULL WHERE claimed_by = ?",
+            (reviewer,)
+        ))
+    
+    def record_decision(self, paper_id: str, reviewer: str, values: Dict, reset: bool = False) -> Optional[str]:
+        """논문 하나의 검토 값 기록 (기존 값과 병합하고 점유 해제)
+        
+        다른 검토자가 점유 중이거나 이미 검토를 끝낸 논문에는 기록하지 않는다.
+        reset=True(검토 재설정)는 다른 검토자의 끝난 검토도 되돌릴 수 있지만 살아 있는 점유는 넘지 않는다.
+        
+        Returns:
+            기록하지 못했으면 막은 검토자 이름, 기록했으면 None
+        """
+        self._check_reviewer(reviewer)
+        
+        def record(conn):
+            row = conn.execute(
+                "SELECT review_status, review_values, claimed_by, lease_until, updated_by "
+                "FROM reviews WHERE paper_id = ?",
+                (paper_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"등록되지 않은 논문: {paper_id}")
+            
+            status, stored, claimed_by, lease_until, updated_by = row
+            holder = self._holder((status, claimed_by, lease_until, updated_by), reviewer, time.time(), reset)
+            if holder:
+                return holder
+            
+            merged = json.loads(stored) if stored else {}
+            merged.update(values)
+            conn.execute(
+                "UPDATE reviews SET review_status = ?, review_values = ?, claimed_by = NULL, "
+                "lease_until = NULL, updated_by = ?, seq = ? WHERE paper_id = ?",
+                (merged.get('review_status', status), json.dumps(merged, ensure_ascii=False, default=str),
+                 reviewer, self._next_seq(conn), paper_id)
+            )
+            return None
+        
+        return self._write(record)
+    
+    def decisions(self, since_seq: int = 0) -> List[Tuple[str, Dict, int]]:
+        """since_seq 이후에 기록된 (paper_id, 검토 값, seq) 목록 (seq 순)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT paper_id, review_values, seq FROM reviews "
+                "WHERE seq > ? AND review_values IS NOT NULL ORDER BY seq",
+                (since_seq,)
+            ).fetchall()
+        return [(paper_id, json.loads(stored), seq) for paper_id, stored, seq in rows]
+    
+    def get(self, paper_id: str) -> Optional[Dict]:
+        """논문의 기록된 검토 값 (없으면 None)"""
+        with self._lock:
+            row = self.conn.execute("SELECT review_values FROM reviews WHERE paper_id = ?", (paper_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+    
+    def last_seq(self) -> int:
+        """가장 최근 기록의 seq"""
+        with self._lock:
+            return self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM reviews").fetchone()[0]
+    
+    def claimed_by(self, reviewer: str) -> List[str]:
+        """검토자가 점유 중인 논문 (파일 순서, 점유 기간이 남은 것만)"""
+        with self._lock:
+            return [row[0] for row in self.conn.execute(
+                "SELECT paper_id FROM reviews WHERE claimed_by = ? AND lease_until >= ? ORDER BY position",
+                (reviewer, time.time())
+            )]
+    
+    def progress(self) -> Dict[str, int]:
+        """전체/검토 완료/점유 중 논문 수"""
+        placeholders = ', '.join('?' for _ in REVIEWED_STATUSES)
+        with self._lock:
+            total, reviewed, claimed = self.conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(review_status IN ({placeholders})), 0), "
+                "COALESCE(SUM(claimed_by IS NOT NULL AND lease_until >= ?), 0) FROM reviews",
+                (*REVIEWED_STATUSES, time.time())
+            ).fetchone()
+        return {'total': total, 'reviewed': reviewed, 'claimed': claimed}
+    
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+    
+    def set_meta(self, key: str, value: str):
+        self._write(lambda conn: conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, str(value))
+        ))
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
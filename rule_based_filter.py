@@ -7,11 +7,287 @@
 """
 
 import pandas as pd
+import numpy as np
 import re
-from typing import List, Dict, Tuple, Set
+import argparse
+import math
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Iterator, Tuple, Set, Optional
 import os
 from datetime import datetime
 
+from result_store import FORMAT_SUFFIXES, paper_keys, result_path, save_results
+
+class KeywordMatcher:
+    """카테고리별 키워드와 와일드카드 패턴을 한 번에 찾는 컴파일된 매칭 엔진
+    
+    모든 키워드/패턴의 리터럴 접두어를 하나의 정규식으로 결합해 텍스트를 한 번만 훑고,
+    접두어가 발견된 위치에서만 해당 키워드의 정확한 패턴을 검증한다.
+    """
+    
+    SENTENCE_SPLIT = re.compile(r'[.!?]+')
+    # 컬럼 단위 검색 시 행 사이에 넣는 구분자 (단어/공백 문자가 아니므로 매칭이 행을 넘지 않음)
+    ROW_SEPARATOR = '\x00'
+    # 소문자 변환 후에도 IGNORECASE에서 ASCII 문자(i, s)와 같게 취급되는 문자
+    CASEFOLD_CHARS = ('\u0131', '\u017f')
+    # 와일드카드 패턴 앞부분의 리터럴 접두어 (예: r"\bbehavio\w*" -> "behavio")
+    PATTERN_HEAD = re.compile(r'(?:\\b)?([^\\()\[\]{}|.*+?^$]*)')
+    
+    def __init__(self, categories: Dict[str, Tuple[List[str], List[str]]]):
+        """
+        매칭 엔진 초기화
+        
+        Args:
+            categories: 카테고리명 -> (일반 키워드 목록, 와일드카드 정규식 패턴 목록)
+        """
+        self.categories = categories
+        
+        # 검사 대상 항목: (라벨, 컴파일된 패턴, 와일드카드 여부)
+        self._terms: List[Tuple[str, re.Pattern, bool]] = []
+        self._category_terms: Dict[str, List[int]] = {}
+        term_heads: Dict[int, str] = {}
+        # 리터럴 접두어가 없어 단독으로 검색해야 하는 패턴들
+        self._unindexed: List[int] = []
+        self._wildcard_ids: List[int] = []
+        # 컬럼 단위 검색용 패턴 (단어 경계를 접두어 뒤에서 확인해 정규식 엔진의 접두어 탐색 활용)
+        self._column_patterns: Dict[int, re.Pattern] = {}
+        # 소문자로 바꿔도 남는 대소문자 동치 문자(ı, ſ)가 있을 때 쓰는 전체 IGNORECASE 패턴
+        self._casefold_patterns: Dict[int, re.Pattern] = {}
+        
+        for category, (keywords, patterns) in categories.items():
+            term_ids = []
+            for keyword in keywords:
+                keyword_lower = keyword.lower()
+                if len(keyword.split()) == 1:
+                    # 단일 단어는 단어 경계 확인
+                    compiled = re.compile(r'\b' + re.escape(keyword_lower) + r'\b')
+                    self._column_patterns[len(self._terms)] = self._head_first_pattern(
+                        re.escape(keyword_lower), keyword_lower, r'\b'
+                    )
+                else:
+                    # 구문은 부분 문자열 매칭
+                    compiled = re.compile(re.escape(keyword_lower))
+                term_ids.append(len(self._terms))
+                term_heads[len(self._terms)] = keyword_lower
+                self._terms.append((keyword, compiled, False))
+            
+            for pattern in patterns:
+                term_id = len(self._terms)
+                term_ids.append(term_id)
+                self._wildcard_ids.append(term_id)
+                self._terms.append((pattern, re.compile(pattern, re.IGNORECASE), True))
+                head = self._pattern_head(pattern)
+                if head:
+                    term_heads[term_id] = head.lower()
+                    if pattern.startswith(r'\b'):
+                        rest = pattern[2 + len(head):]
+                        self._column_patterns[term_id] = self._head_first_pattern(
+                            head.lower(), head, f'(?i:{rest})'
+                        )
+                        self._casefold_patterns[term_id] = self._head_first_pattern(
+                            head, head, rest, re.IGNORECASE
+                        )
+                else:
+                    self._unindexed.append(term_id)
+            
+            self._category_terms[category] = term_ids
+        
+        # 다른 접두어의 접두어가 되는 것만 남겨 한 위치에서 최대 하나의 접두어만 매칭되도록 함
+        minimal_heads: List[str] = []
+        for head in sorted(set(term_heads.values()), key=len):
+            if not any(head.startswith(shorter) for shorter in minimal_heads):
+                minimal_heads.append(head)
+        
+        self._term_heads = term_heads
+        self._candidates: Dict[str, List[int]] = {head: [] for head in minimal_heads}
+        for term_id, head in sorted(term_heads.items()):
+            for minimal in minimal_heads:
+                if head.startswith(minimal):
+                    self._candidates[minimal].append(term_id)
+                    break
+        
+        self._head_regex = None
+        if minimal_heads:
+            self._head_regex = re.compile('|'.join(re.escape(head) for head in minimal_heads))
+    
+    @classmethod
+    def _pattern_head(cls, pattern: str) -> str:
+        """정규식 패턴이 반드시 시작하는 리터럴 접두어 추출"""
+        if '|' in pattern:
+            # 선택 분기가 있으면 공통 접두어를 보장할 수 없음
+            return ""
+        head_match = cls.PATTERN_HEAD.match(pattern)
+        head = head_match.group(1)
+        # 수량자가 붙은 마지막 문자는 선택적이므로 제외
+        if head and pattern[head_match.end():head_match.end() + 1] in ('*', '?', '{'):
+            head = head[:-1]
+        return head
+    
+    @staticmethod
+    def _head_first_pattern(head_regex: str, head: str, rest: str, flags: int = 0) -> re.Pattern:
+        r"""
+        r'\b' + 접두어 + 나머지 패턴과 같은 매칭을 하되 리터럴 접두어로 시작하는 패턴 생성
+        
+        앞의 단어 경계는 접두어 뒤의 부정 후방탐색 (?<!\w.{len(head)})으로 확인한다.
+        """
+        if not re.match(r'\w', head):
+            return re.compile(r'\b' + head_regex + rest, flags)
+        return re.compile(head_regex + r'(?<!\w' + '.' * len(head) + ')' + rest, flags)
+    
+    def scan(self, text: str, with_sentences: bool = True) -> Dict[str, Tuple[List[str], List[str]]]:
+        """
+        텍스트를 한 번 훑어 모든 카테고리의 키워드 찾기
+        
+        Args:
+            text: 검색할 텍스트
+            with_sentences: 키워드가 포함된 문장도 함께 반환할지 여부
+        
+        Returns:
+            카테고리명 -> (발견된 키워드 목록, 키워드가 포함된 문장 목록)
+        """
+        text_lower = text.lower()
+        terms = self._terms
+        
+        # 일반 키워드는 첫 등장 위치, 와일드카드는 겹치지 않는 모든 매칭 기록
+        first_pos: Dict[int, int] = {}
+        wildcard_hits: Dict[int, List[Tuple[int, str]]] = {}
+        wildcard_end: Dict[int, int] = {}
+        
+        # ı, ſ가 있으면 와일드카드(IGNORECASE)는 접두어 탐색 없이 패턴 전체로 검색
+        casefold = any(char in text_lower for char in self.CASEFOLD_CHARS)
+        unindexed = self._unindexed + self._wildcard_ids if casefold else self._unindexed
+        
+        head_regex = self._head_regex
+        match = head_regex.search(text_lower) if head_regex else None
+        while match:
+            pos = match.start()
+            for term_id in self._candidates[match.group(0)]:
+                label, compiled, is_wildcard = terms[term_id]
+                if is_wildcard:
+                    if casefold or pos < wildcard_end.get(term_id, 0):
+                        continue
+                    term_match = compiled.match(text_lower, pos)
+                    if term_match:
+                        wildcard_hits.setdefault(term_id, []).append((pos, term_match.group(0)))
+                        wildcard_end[term_id] = term_match.end()
+                elif term_id not in first_pos and compiled.match(text_lower, pos):
+                    first_pos[term_id] = pos
+            match = head_regex.search(text_lower, pos + 1)
+        
+        for term_id in unindexed:
+            compiled = terms[term_id][1]
+            wildcard_hits[term_id] = [(m.start(), m.group(0)) for m in compiled.finditer(text_lower)]
+        
+        locate_sentence = self._sentence_locator(text, text_lower) if with_sentences else None
+        
+        results = {}
+        for category, term_ids in self._category_terms.items():
+            found_keywords = []
+            found_positions = []
+            
+            # 1. 일반 키워드 (키워드 목록 순서)
+            for term_id in term_ids:
+                if term_id in first_pos:
+                    found_keywords.append(terms[term_id][0])
+                    found_positions.append(first_pos[term_id])
+            
+            # 2. 와일드카드 패턴 (패턴 순서, 텍스트 등장 순서, 중복 제외)
+            found_lower = [k.lower() for k in found_keywords]
+            for term_id in term_ids:
+                for _, matched_text in wildcard_hits.get(term_id, []):
+                    if matched_text not in found_lower:
+                        found_keywords.append(matched_text)
+                        found_lower.append(matched_text)
+                        found_positions.append(text_lower.find(matched_text))
+            
+            found_sentences = []
+            if locate_sentence:
+                found_sentences = [locate_sentence(pos) for pos in found_positions]
+            
+            results[category] = (found_keywords, found_sentences)
+        
+        return results
+    
+    def scan_column(self, texts: pd.Series) -> Dict[str, pd.Series]:
+        """
+        텍스트 컬럼 전체를 한 번에 검색하는 배치 매칭 (행 단위 Python 루프 없음)
+        
+        컬럼을 행 구분자로 이어 붙인 하나의 문자열에서 키워드별로 검색한 뒤,
+        매칭 위치를 행 시작 오프셋으로 되돌려 행별 결과를 만든다.
+        
+        Args:
+            texts: 검색할 텍스트 Series
+            
+        Returns:
+            카테고리명 -> 발견된 키워드를 ', '로 연결한 문자열 Series (scan()과 같은 순서)
+        """
+        lowered = texts.astype(str).str.lower()
+        joined_text = self.ROW_SEPARATOR.join(lowered)
+        lengths = lowered.str.len().to_numpy(dtype=np.int64)
+        row_starts = np.concatenate(([0], np.cumsum(lengths + len(self.ROW_SEPARATOR))[:-1]))
+        column_patterns = dict(self._column_patterns)
+        if any(char in joined_text for char in self.CASEFOLD_CHARS):
+            column_patterns.update(self._casefold_patterns)
+        
+        results = {}
+        for category, term_ids in self._category_terms.items():
+            frames = []
+            for order, term_id in enumerate(term_ids):
+                label, compiled, is_wildcard = self._terms[term_id]
+                pattern = column_patterns.get(term_id, compiled)
+                matches = list(pattern.finditer(joined_text))
+                positions = np.fromiter((m.start() for m in matches), dtype=np.int64, count=len(matches))
+                rows = np.searchsorted(row_starts, positions, side='right') - 1
+                
+                if is_wildcard:
+                    # 와일드카드는 겹치지 않는 모든 매칭 텍스트를 등장 순서대로 수집
+                    found_texts = [m.group(0) for m in matches]
+                else:
+                    # 일반 키워드는 행별 포함 여부만 필요
+                    rows = np.unique(rows)
+                    found_texts = [label] * len(rows)
+                
+                frames.append(pd.DataFrame({
+                    'row': rows,
+                    'order': order,
+                    'text': pd.Series(found_texts, dtype=object),
+                    'wildcard': is_wildcard
+                }))
+            
+            found = pd.concat(frames, ignore_index=True)
+            found = found.sort_values(['row', 'order'], kind='stable')
+            
+            # 와일드카드 매칭 중 이미 발견된 키워드(대소문자 무시)와 같은 것은 제외
+            duplicated = found.assign(key=found['text'].str.lower()).duplicated(['row', 'key'])
+            found = found[~(duplicated & found['wildcard'])]
+            
+            # 행별 순번을 컬럼으로 펼친 뒤 컬럼 단위로 ', ' 연결
+            found = found.assign(rank=found.groupby('row').cumcount())
+            wide = found.pivot(index='row', columns='rank', values='text')
+            joined = pd.Series('', index=wide.index, dtype=object)
+            for rank in wide.columns:
+                piece = wide[rank]
+                separator = ', ' if rank > 0 else ''
+                joined = joined.where(piece.isna(), joined + separator + piece)
+            column = joined.reindex(range(len(texts)), fill_value='')
+            results[category] = column.set_axis(texts.index)
+        
+        return results
+    
+    @classmethod
+    def _sentence_locator(cls, text: str, text_lower: str):
+        """소문자 텍스트의 위치를 원문 문장으로 변환하는 함수 생성"""
+        sentences = cls.SENTENCE_SPLIT.split(text)
+        delimiter_starts = [m.start() for m in cls.SENTENCE_SPLIT.finditer(text_lower)]
+        
+        def locate(pos: int) -> str:
+            sentence_idx = min(bisect_right(delimiter_starts, pos), len(sentences) - 1)
+            return sentences[sentence_idx].strip()
+        
+        return locate
+
 class RuleBasedKeywordFilter:
     def __init__(self):
         """규칙 기반 키워드 필터 초기화"""
@@ -48,87 +324,47 @@ class RuleBasedKeywordFilter:
             r"\bbehavio\w*\s+interven\w*",  # behavio* interven*
             r"\bbehavio\w*\s+therap\w*"  # behavio* therap*
         ]
+        
+        # 모든 카테고리를 한 번에 훑는 매칭 엔진 (생성 시 한 번만 컴파일)
+        self.matcher = KeywordMatcher({
+            'depression': (self.depression_keywords, []),
+            'mobile': (self.mobile_keywords, []),
+            'behavioral': (self.behavioral_base_keywords, self.behavioral_patterns)
+        })
+        self._matcher_cache: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], KeywordMatcher] = {}
+    
+    def _get_matcher(self, keywords: List[str], patterns: List[str]) -> KeywordMatcher:
+        """키워드/패턴 조합별로 컴파일된 매칭 엔진 반환 (캐시)"""
+        cache_key = (tuple(keywords), tuple(patterns))
+        if cache_key not in self._matcher_cache:
+            self._matcher_cache[cache_key] = KeywordMatcher({'keywords': (keywords, patterns)})
+        return self._matcher_cache[cache_key]
     
     def find_keywords_in_text(self, text: str, keywords: List[str]) -> Tuple[List[str], List[str]]:
         """텍스트에서 일반 키워드 찾기 (정확한 단어 매칭)"""
         if not text or pd.isna(text):
             return [], []
         
-        text_lower = str(text).lower()
-        found_keywords = []
-        found_sentences = []
-        
-        # 문장 단위로 분리
-        sentences = re.split(r'[.!?]+', text)
-        
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            
-            # 단어 경계를 고려한 매칭
-            if len(keyword.split()) == 1:
-                # 단일 단어의 경우 단어 경계 확인
-                pattern = r'\b' + re.escape(keyword_lower) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_keywords.append(keyword)
-                    # 키워드가 포함된 문장 찾기
-                    for sentence in sentences:
-                        if re.search(pattern, sentence.lower()):
-                            found_sentences.append(sentence.strip())
-                            break
-            else:
-                # 구문의 경우 전체 매칭
-                if keyword_lower in text_lower:
-                    found_keywords.append(keyword)
-                    # 키워드가 포함된 문장 찾기
-                    for sentence in sentences:
-                        if keyword_lower in sentence.lower():
-                            found_sentences.append(sentence.strip())
-                            break
-        
-        return found_keywords, found_sentences
+        return self._get_matcher(keywords, []).scan(str(text))['keywords']
     
     def find_behavioral_keywords_in_text(self, text: str) -> Tuple[List[str], List[str]]:
         """행동활성화/치료 키워드 찾기 (와일드카드 패턴 포함)"""
         if not text or pd.isna(text):
             return [], []
         
-        text_lower = str(text).lower()
-        found_keywords = []
-        found_sentences = []
-        
-        # 문장 단위로 분리
-        sentences = re.split(r'[.!?]+', text)
-        
-        # 1. 기본 키워드 검색
-        base_found, base_sentences = self.find_keywords_in_text(text, self.behavioral_base_keywords)
-        found_keywords.extend(base_found)
-        found_sentences.extend(base_sentences)
-        
-        # 2. 와일드카드 패턴 검색
-        for pattern in self.behavioral_patterns:
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
-            for match in matches:
-                matched_text = match.group(0)
-                if matched_text not in [k.lower() for k in found_keywords]:
-                    found_keywords.append(matched_text)
-                    
-                    # 매칭된 텍스트가 포함된 문장 찾기
-                    for sentence in sentences:
-                        if matched_text in sentence.lower():
-                            found_sentences.append(sentence.strip())
-                            break
-        
-        return found_keywords, found_sentences
+        matcher = self._get_matcher(self.behavioral_base_keywords, self.behavioral_patterns)
+        return matcher.scan(str(text))['keywords']
     
     def evaluate_single_paper(self, title: str, abstract: str) -> Dict:
         """단일 논문 평가"""
         # 제목과 초록 결합
         full_text = f"{title} {abstract}"
         
-        # 각 카테고리별 키워드 검색
-        depression_found, depression_sentences = self.find_keywords_in_text(full_text, self.depression_keywords)
-        mobile_found, mobile_sentences = self.find_keywords_in_text(full_text, self.mobile_keywords)  
-        behavioral_found, behavioral_sentences = self.find_behavioral_keywords_in_text(full_text)
+        # 모든 카테고리 키워드를 한 번의 스캔으로 검색
+        found = self.matcher.scan(full_text, with_sentences=False)
+        depression_found, _ = found['depression']
+        mobile_found, _ = found['mobile']
+        behavioral_found, _ = found['behavioral']
         
         # 포함/제외 결정
         has_depression = len(depression_found) > 0
@@ -158,8 +394,18 @@ class RuleBasedKeywordFilter:
             'result': result
         }
     
-    def process_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        """DataFrame 전체 처리"""
+    def process_dataframe(self, df: pd.DataFrame, vectorized: bool = True) -> pd.DataFrame:
+        """
+        DataFrame 전체 처리
+        
+        Args:
+            df: Title/Abstract 컬럼을 포함한 논문 DataFrame
+            vectorized: True(기본값)이면 컬럼 단위로 처리, False이면 논문마다 진행 상황을
+                출력하며 행 단위로 처리
+        """
+        if vectorized:
+            return self.process_dataframe_vectorized(df)
+        
         results = []
         
         for idx, row in df.iterrows():
@@ -207,67 +453,258 @@ class RuleBasedKeywordFilter:
             print(f"처리 완료 {idx+1}/{len(df)}: {title[:50]}... -> {result['result']}")
         
         return pd.DataFrame(results)
-
-def compare_results(llm_df: pd.DataFrame, rule_df: pd.DataFrame) -> Dict:
-    """LLM과 규칙 기반 결과 비교"""
-    total_papers = len(llm_df)
     
-    # 결과 일치도 비교
-    result_matches = 0
-    keyword_matches = {'depression': 0, 'mobile': 0, 'behavioral': 0}
-    
-    detailed_comparison = []
+    def process_dataframe_vectorized(self, df: pd.DataFrame) -> pd.DataFrame:
+        """DataFrame 전체를 컬럼 단위 연산으로 처리 (process_dataframe과 같은 출력 컬럼)"""
+        def text_column(name: str) -> pd.Series:
+            if name not in df.columns:
+                return pd.Series('', index=df.index, dtype=object)
+            column = df[name].astype(str)
+            return column.mask(column == 'nan', '')
+        
+        def original_column(name: str):
+            return df[name] if name in df.columns else ''
+        
+        titles = text_column('Title')
+        abstracts = text_column('Abstract')
+        
+        # 제목 + 초록 결합 컬럼에서 세 카테고리 검색
+        found = self.matcher.scan_column(titles + ' ' + abstracts)
+        has_all = (found['depression'] != '') & (found['mobile'] != '') & (found['behavioral'] != '')
+        
+        results = pd.DataFrame({
+            'DOI': original_column('DOI'),
+            'Title': titles,
+            'Authors': original_column('Authors'),
+            'Journal/Book': original_column('Journal/Book'),
+            'Publication Year': original_column('Publication Year'),
+            'Abstract': abstracts,
+            'depression_keywords': found['depression'],
+            'mobile_keywords': found['mobile'],
+            'behavioral_keywords': found['behavioral'],
+            'result': has_all.map({True: 'include', False: 'exclude'})
+        }, index=df.index)
+        
+        return results.reset_index(drop=True)
     
-    for idx in range(total_papers):
-        llm_row = llm_df.iloc[idx]
-        rule_row = rule_df.iloc[idx]
+    def process_dataframe_parallel(self, df: pd.DataFrame, workers: int,
+                                   chunk_size: Optional[int] = None) -> pd.DataFrame:
+        """
+        DataFrame을 청크로 나눠 여러 프로세스에서 처리한 뒤 원래 순서로 병합
         
-        # 결과 일치 확인
-        llm_result = llm_row.get('result', '').lower()
-        rule_result = rule_row.get('result', '').lower()
+        Args:
+            df: Title/Abstract 컬럼을 포함한 논문 DataFrame
+            workers: 작업 프로세스 수
+            chunk_size: 작업 단위 행 수 (기본값: 프로세스당 약 4개 청크)
+            
+        Returns:
+            process_dataframe과 같은 컬럼의 결과 DataFrame
+        """
+        if workers <= 1 or len(df) == 0:
+            return self.process_dataframe_vectorized(df)
+        
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(df) / (workers * 4)))
+        chunks = [df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size)]
+        
+        # 필터 설정(키워드 목록, 컴파일된 패턴)은 프로세스마다 한 번만 전달
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker_filter,
+                                 initargs=(self,)) as executor:
+            chunk_results = list(executor.map(_screen_chunk, chunks))
         
-        result_match = llm_result == rule_result
-        if result_match:
-            result_matches += 1
+        return pd.concat(chunk_results, ignore_index=True)
+    
+    def process_csv_stream(self, input_file: str, output_file: str, chunk_size: int = 10000,
+                           workers: int = 1) -> Dict[str, int]:
+        """
+        입력 CSV를 고정 크기 청크로 읽어 처리하고, 청크 결과를 출력 CSV에 바로 이어서 기록
+        
+        입력과 결과 전체를 메모리에 올리지 않으므로 말뭉치 크기와 관계없이 메모리 사용량이 일정하다.
         
-        # 키워드 일치도 확인 (간단한 비교)
-        for category in ['depression', 'mobile', 'behavioral']:
-            llm_keywords = str(llm_row.get(f'{category}_keywords', '')).lower()
-            rule_keywords = str(rule_row.get(f'{category}_keywords', '')).lower()
+        Args:
+            input_file: 입력 CSV 파일 경로 (Title/Abstract 컬럼 포함)
+            output_file: 결과 CSV 파일 경로 (process_dataframe과 같은 컬럼)
+            chunk_size: 한 번에 읽어 처리할 행 수
+            workers: 작업 프로세스 수 (1이면 현재 프로세스에서 처리)
             
-            # 빈 문자열 처리
-            if not llm_keywords and not rule_keywords:
-                keyword_matches[category] += 1
-            elif llm_keywords and rule_keywords:
-                # 둘 다 키워드가 있는 경우 - 간단한 포함 관계 확인
-                llm_set = set(k.strip() for k in llm_keywords.split(',') if k.strip())
-                rule_set = set(k.strip() for k in rule_keywords.split(',') if k.strip())
-                if llm_set & rule_set:  # 교집합이 있으면 부분 일치로 간주
-                    keyword_matches[category] += 1
-        
-        detailed_comparison.append({
-            'index': idx,
-            'title': llm_row.get('Title', '')[:50],
-            'llm_result': llm_result,
-            'rule_result': rule_result,
-            'result_match': result_match,
-            'llm_depression': llm_row.get('depression_keywords', ''),
-            'rule_depression': rule_row.get('depression_keywords', ''),
-            'llm_mobile': llm_row.get('mobile_keywords', ''),
-            'rule_mobile': rule_row.get('mobile_keywords', ''),
-            'llm_behavioral': llm_row.get('behavioral_keywords', ''),
-            'rule_behavioral': rule_row.get('behavioral_keywords', '')
-        })
+        Returns:
+            {'total': 전체 논문 수, 'include': 포함 수, 'exclude': 제외 수}
+        """
+        stats = {'total': 0, 'include': 0, 'exclude': 0}
+        for _ in self.iter_csv_stream(input_file, output_file, chunk_size, workers, stats):
+            pass
+        return stats
+    
+    def iter_csv_stream(self, input_file: str, output_file: Optional[str] = None,
+                        chunk_size: int = 10000, workers: int = 1,
+                        stats: Optional[Dict[str, int]] = None) -> Iterator[pd.DataFrame]:
+        """
+        process_csv_stream과 같이 처리하되 청크 결과를 만드는 대로 하나씩 반환
+        
+        다음 단계가 규칙 기반 처리가 끝나기 전에 앞 청크의 결과부터 사용할 수 있다.
+        
+        Args:
+            input_file: 입력 CSV 파일 경로 (Title/Abstract 컬럼 포함)
+            output_file: 지정하면 청크 결과를 이 CSV에도 이어서 기록
+            chunk_size: 한 번에 읽어 처리할 행 수
+            workers: 작업 프로세스 수 (1이면 현재 프로세스에서 처리)
+            stats: 지정하면 {'total', 'include', 'exclude'} 누적 건수를 여기에 기록
+        """
+        if stats is None:
+            stats = {'total': 0, 'include': 0, 'exclude': 0}
+        header_written = False
+        
+        def emit_chunk(chunk_result: pd.DataFrame) -> pd.DataFrame:
+            nonlocal header_written
+            if output_file:
+                # 첫 청크만 헤더(와 BOM)를 쓰고 이후 청크는 이어서 기록
+                is_first = not header_written
+                chunk_result.to_csv(output_file, mode='w' if is_first else 'a', header=is_first,
+                                    index=False, encoding='utf-8-sig' if is_first else 'utf-8')
+            header_written = True
+            include_count = int((chunk_result['result'] == 'include').sum())
+            stats['total'] += len(chunk_result)
+            stats['include'] += include_count
+            stats['exclude'] += len(chunk_result) - include_count
+            print(f"청크 처리 완료: 누적 {stats['total']}개 논문 ({stats['include']}개 포함)")
+            return chunk_result
+        
+        # 청크마다 타입 추론이 달라지지 않도록 모든 컬럼을 문자열로 읽어 원본 값을 그대로 유지
+        reader = pd.read_csv(input_file, encoding='utf-8-sig', chunksize=chunk_size, dtype=str)
+        
+        if workers > 1:
+            # 처리 중인 청크 수를 제한해 읽기가 처리보다 앞서 나가지 않도록 함
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker_filter,
+                                     initargs=(self,)) as executor:
+                pending = deque()
+                for chunk in reader:
+                    pending.append(executor.submit(_screen_chunk, chunk))
+                    if len(pending) >= workers * 2:
+                        yield emit_chunk(pending.popleft().result())
+                while pending:
+                    yield emit_chunk(pending.popleft().result())
+        else:
+            for chunk in reader:
+                yield emit_chunk(self.process_dataframe_vectorized(chunk))
+        
+        if output_file and not header_written:
+            # 입력이 비어 있어도 헤더만 있는 결과 파일 생성
+            empty_result = self.process_dataframe_vectorized(pd.DataFrame(columns=['Title', 'Abstract']))
+            empty_result.to_csv(output_file, index=False, encoding='utf-8-sig')
+
+# 작업 프로세스별 필터 인스턴스 (ProcessPoolExecutor initializer에서 설정)
+_worker_filter: Optional[RuleBasedKeywordFilter] = None
+
+def _init_worker_filter(filter_system: RuleBasedKeywordFilter):
+    """작업 프로세스 초기화: 부모 프로세스의 필터 설정 복사"""
+    global _worker_filter
+    _worker_filter = filter_system
+
+def _screen_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """작업 프로세스에서 DataFrame 청크 하나 처리"""
+    return _worker_filter.process_dataframe_vectorized(chunk)
+
+def _keyword_pairs(keywords: pd.Series) -> pd.DataFrame:
+    """쉼표로 구분된 키워드 컬럼을 (행 위치, 소문자 키워드) 쌍으로 펼침 (행 내 중복 제거)"""
+    exploded = keywords.fillna('').astype(str).str.lower().str.split(',').explode().str.strip()
+    exploded = exploded[exploded != '']
+    return pd.DataFrame({'pos': exploded.index, 'keyword': exploded.values}).drop_duplicates()
+
+def _keyword_overlap(llm_keywords: pd.Series, rule_keywords: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """행별 키워드 일치 여부(둘 다 비었거나 교집합이 있음)와 Jaccard 유사도
+    
+    두 Series는 0부터 시작하는 같은 위치 인덱스를 가져야 한다.
+    """
+    positions = pd.RangeIndex(len(llm_keywords))
+    llm_pairs = _keyword_pairs(llm_keywords)
+    rule_pairs = _keyword_pairs(rule_keywords)
+    
+    llm_count = llm_pairs.groupby('pos').size().reindex(positions, fill_value=0)
+    rule_count = rule_pairs.groupby('pos').size().reindex(positions, fill_value=0)
+    common = llm_pairs.merge(rule_pairs, on=['pos', 'keyword']).groupby('pos').size()
+    common = common.reindex(positions, fill_value=0)
+    
+    both_empty = (llm_count == 0) & (rule_count == 0)
+    union = llm_count + rule_count - common
+    jaccard = (common / union.where(union > 0)).where(~both_empty, 1.0)
+    return both_empty | (common > 0), jaccard
+
+def _cohen_kappa(confusion: pd.DataFrame) -> float:
+    """혼동 행렬(행: LLM, 열: 규칙 기반)로 Cohen's kappa 계산"""
+    total = confusion.values.sum()
+    if total == 0:
+        return float('nan')
+    observed = np.trace(confusion.values) / total
+    expected = (confusion.sum(axis=1).values * confusion.sum(axis=0).values).sum() / total ** 2
+    if expected == 1:
+        return 1.0
+    return float((observed - expected) / (1 - expected))
+
+def compare_results(llm_df: pd.DataFrame, rule_df: pd.DataFrame) -> Dict:
+    """LLM과 규칙 기반 결과 비교
+    
+    두 결과를 논문 고유 키(DOI, 없으면 제목 해시)로 결합하므로 행 순서가 달라도 되며,
+    같은 키가 여러 번 나오면 나온 순서대로 짝을 짓는다. 한쪽에만 있는 논문은 비교에서 제외한다.
+    """
+    categories = ['depression', 'mobile', 'behavioral']
+    columns = ['Title', 'result'] + [f'{category}_keywords' for category in categories]
+    
+    def keyed(df: pd.DataFrame) -> pd.DataFrame:
+        frame = df.reindex(columns=columns).reset_index(drop=True)
+        frame['paper_key'] = paper_keys(df).values
+        frame['occurrence'] = frame.groupby('paper_key').cumcount()
+        return frame
+    
+    llm_keyed = keyed(llm_df)
+    llm_keyed['index'] = llm_keyed.index
+    merged = llm_keyed.merge(keyed(rule_df), on=['paper_key', 'occurrence'], how='inner',
+                             suffixes=('_llm', '_rule'))
+    total_papers = len(merged)
+    
+    # 결과 일치도 비교
+    llm_result = merged['result_llm'].fillna('').astype(str).str.lower()
+    rule_result = merged['result_rule'].fillna('').astype(str).str.lower()
+    result_match = llm_result == rule_result
+    result_matches = int(result_match.sum())
+    
+    # 혼동 행렬 (행: LLM 판정, 열: 규칙 기반 판정)
+    labels = sorted(set(llm_result) | set(rule_result) | {'include', 'exclude'})
+    confusion = pd.crosstab(llm_result, rule_result).reindex(index=labels, columns=labels, fill_value=0)
+    confusion = confusion.rename_axis(index='llm', columns='rule')
+    
+    detailed_comparison = pd.DataFrame({
+        'index': merged['index'],
+        'title': merged['Title_llm'].fillna('').astype(str).str[:50],
+        'llm_result': llm_result,
+        'rule_result': rule_result,
+        'result_match': result_match
+    })
+    
+    # 키워드 일치도 (둘 다 비었거나 교집합이 있으면 일치) 및 Jaccard 유사도
+    keyword_matches, keyword_jaccard = {}, {}
+    for category in categories:
+        llm_keywords = merged[f'{category}_keywords_llm']
+        rule_keywords = merged[f'{category}_keywords_rule']
+        matched, jaccard = _keyword_overlap(llm_keywords, rule_keywords)
+        keyword_matches[category] = int(matched.sum())
+        keyword_jaccard[category] = float(jaccard.mean()) if total_papers else 0.0
+        detailed_comparison[f'llm_{category}'] = llm_keywords.fillna('')
+        detailed_comparison[f'rule_{category}'] = rule_keywords.fillna('')
+        detailed_comparison[f'{category}_jaccard'] = jaccard.round(3)
     
     comparison_stats = {
         'total_papers': total_papers,
+        'unmatched_llm': len(llm_df) - total_papers,
+        'unmatched_rule': len(rule_df) - total_papers,
         'result_matches': result_matches,
-        'result_accuracy': result_matches / total_papers * 100,
+        'result_accuracy': result_matches / total_papers * 100 if total_papers else 0.0,
+        'confusion_matrix': confusion,
+        'cohen_kappa': _cohen_kappa(confusion),
         'keyword_accuracy': {
-            'depression': keyword_matches['depression'] / total_papers * 100,
-            'mobile': keyword_matches['mobile'] / total_papers * 100,
-            'behavioral': keyword_matches['behavioral'] / total_papers * 100
+            category: keyword_matches[category] / total_papers * 100 if total_papers else 0.0
+            for category in categories
         },
+        'keyword_jaccard': keyword_jaccard,
         'detailed_comparison': detailed_comparison
     }
     
@@ -275,18 +712,43 @@ def compare_results(llm_df: pd.DataFrame, rule_df: pd.DataFrame) -> Dict:
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="규칙 기반 키워드 필터링")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="규칙 기반 필터링에 사용할 프로세스 수 (기본값: 1)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="지정하면 입력 CSV를 이 행 수 단위로 스트리밍 처리 (LLM 결과 비교 생략)")
+    parser.add_argument("--per-row", action="store_true",
+                        help="컬럼 단위 처리 대신 논문마다 진행 상황을 출력하며 행 단위로 처리")
+    parser.add_argument("--format", choices=sorted(FORMAT_SUFFIXES), default="csv",
+                        help="규칙 기반 결과 저장 형식 (기본값: csv, 스트리밍 모드는 항상 csv). "
+                             "csv가 아니면 검토용 CSV 사본도 함께 저장")
+    args = parser.parse_args()
+    
     # 입력 파일
     input_file = "data/meta_article_data.csv"
     
     # 출력 파일
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    rule_output = f"rule_base_output/rule_based_results_{timestamp}.csv"
+    rule_output = result_path(f"rule_base_output/rule_based_results_{timestamp}",
+                              "csv" if args.chunk_size else args.format)
     comparison_output = f"rule_base_output/comparison_results_{timestamp}.csv"
     
     # 출력 디렉토리 생성
     os.makedirs("rule_base_output", exist_ok=True)
     
     try:
+        if args.chunk_size:
+            # 스트리밍 모드: 청크 단위로 읽고 처리 결과를 바로 파일에 기록
+            print(f"\n규칙 기반 필터링 시작 (스트리밍, {args.chunk_size}개 단위): {input_file}")
+            filter_system = RuleBasedKeywordFilter()
+            stats = filter_system.process_csv_stream(
+                input_file, rule_output, chunk_size=args.chunk_size, workers=args.workers
+            )
+            print(f"규칙 기반 결과 저장: {rule_output}")
+            print(f"규칙 기반 결과: {stats['include']}개 포함, {stats['exclude']}개 제외")
+            print("\n규칙 기반 필터링 완료!")
+            return
+        
         # 원본 데이터 로드
         print(f"데이터 로드: {input_file}")
         df = pd.read_csv(input_file, encoding='utf-8-sig')
@@ -295,14 +757,20 @@ def main():
         # 규칙 기반 필터링 실행
         print("\n규칙 기반 필터링 시작...")
         filter_system = RuleBasedKeywordFilter()
-        rule_results = filter_system.process_dataframe(df)
+        if args.workers > 1:
+            print(f"{args.workers}개 프로세스로 병렬 처리")
+            rule_results = filter_system.process_dataframe_parallel(df, workers=args.workers)
+        else:
+            rule_results = filter_system.process_dataframe(df, vectorized=not args.per_row)
         
         # 규칙 기반 결과 저장
-        rule_results.to_csv(rule_output, index=False, encoding='utf-8-sig')
+        csv_copy = save_results(rule_results, rule_output, export_csv=True)
         print(f"규칙 기반 결과 저장: {rule_output}")
+        if csv_copy:
+            print(f"검토용 CSV 사본 저장: {csv_copy}")
         
         # 요약 통계
-        include_count = sum(1 for _, row in rule_results.iterrows() if row['result'] == 'include')
+        include_count = int((rule_results['result'] == 'include').sum())
         exclude_count = len(rule_results) - include_count
         print(f"규칙 기반 결과: {include_count}개 포함, {exclude_count}개 제외")
         
@@ -323,22 +791,26 @@ def main():
             # 비교 결과 출력
             print(f"\n=== 비교 결과 ===")
             print(f"전체 논문 수: {comparison['total_papers']}")
+            if comparison['unmatched_llm'] or comparison['unmatched_rule']:
+                print(f"짝이 없는 논문: LLM {comparison['unmatched_llm']}개, 규칙 {comparison['unmatched_rule']}개")
             print(f"결과 일치도: {comparison['result_matches']}/{comparison['total_papers']} ({comparison['result_accuracy']:.1f}%)")
-            print(f"키워드 일치도:")
-            print(f"  - 우울증: {comparison['keyword_accuracy']['depression']:.1f}%")
-            print(f"  - 모바일/디지털: {comparison['keyword_accuracy']['mobile']:.1f}%")
-            print(f"  - 행동활성화/치료: {comparison['keyword_accuracy']['behavioral']:.1f}%")
+            print(f"Cohen's kappa: {comparison['cohen_kappa']:.3f}")
+            print(f"혼동 행렬 (행: LLM, 열: 규칙):\n{comparison['confusion_matrix'].to_string()}")
+            print(f"키워드 일치도 (평균 Jaccard):")
+            print(f"  - 우울증: {comparison['keyword_accuracy']['depression']:.1f}% ({comparison['keyword_jaccard']['depression']:.2f})")
+            print(f"  - 모바일/디지털: {comparison['keyword_accuracy']['mobile']:.1f}% ({comparison['keyword_jaccard']['mobile']:.2f})")
+            print(f"  - 행동활성화/치료: {comparison['keyword_accuracy']['behavioral']:.1f}% ({comparison['keyword_jaccard']['behavioral']:.2f})")
             
             # 상세 비교 결과 저장
-            comparison_df = pd.DataFrame(comparison['detailed_comparison'])
+            comparison_df = comparison['detailed_comparison']
             comparison_df.to_csv(comparison_output, index=False, encoding='utf-8-sig')
             print(f"상세 비교 결과 저장: {comparison_output}")
             
             # 불일치 사례 출력
-            mismatches = [item for item in comparison['detailed_comparison'] if not item['result_match']]
-            if mismatches:
+            mismatches = comparison_df[~comparison_df['result_match']]
+            if len(mismatches):
                 print(f"\n=== 불일치 사례 ({len(mismatches)}개) ===")
-                for mismatch in mismatches[:5]:  # 처음 5개만 출력
+                for mismatch in mismatches.head(5).to_dict('records'):  # 처음 5개만 출력
                     print(f"#{mismatch['index']+1}: {mismatch['title']}...")
                     print(f"  LLM: {mismatch['llm_result']} vs 규칙: {mismatch['rule_result']}")
         else:
@@ -8,8 +8,11 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import io
 import os
 import re
+from collections import namedtuple
 from datetime import datetime
 
 # 와이드 모드 설정
@@ -137,7 +140,15 @@ st.markdown("""
 if 'current_idx' not in st.session_state:
     st.session_state.current_idx = 0
 if 'df' not in st.session_state:
-    st.session_state.df = None
+    st.session_state.df = None  # 공유 기본 데이터셋 (읽기 전용)
+if 'review_edits' not in st.session_state:
+    st.session_state.review_edits = {}  # 이 세션의 검토 수정분 {행 번호: {컬럼: 값}}
+if 'filter_index' not in st.session_state:
+    st.session_state.filter_index = None  # 공유 필터 인덱스 (읽기 전용)
+if 'status_rows' not in st.session_state:
+    st.session_state.status_rows = None  # 이 세션의 검토 상태별 행 마스크
+if 'review_version' not in st.session_state:
+    st.session_state.review_version = 0  # 검토 상태가 바뀔 때마다 증가
 if 'file_name' not in st.session_state:
     st.session_state.file_name = None
 if 'changes_made' not in st.session_state:
@@ -149,20 +160,51 @@ if 'selected_keywords' not in st.session_state:
 if 'use_word_boundary' not in st.session_state:
     st.session_state.use_word_boundary = True
 
+# 인간 검토 컬럼과 기본값 (세션별 검토 수정분은 이 컬럼들만 가진다)
+REVIEW_COLUMNS = {
+    'human_depression_keywords': '',
+    'human_mobile_keywords': '',
+    'human_behavioral_keywords': '',
+    'human_result': '',
+    'reviewer_name': '',
+    'review_status': '미완료',
+    'review_date': None
+}
+
+# 상태 필터 '완료'에 해당하는 검토 상태
+REVIEWED_STATUSES = ('완료', 'include', 'exclude')
+
+# 공유 기본 데이터셋과 필터 인덱스
+BaseDataset = namedtuple('BaseDataset', ['df', 'filter_index'])
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_base_dataset(file_path, mtime_ns, size):
+    """파일 버전(경로, 수정 시각, 크기)별로 한 번만 파싱해 모든 세션이 공유하는 기본 데이터셋과 필터 인덱스
+    
+    반환된 DataFrame은 읽기 전용으로 다루고, 검토 수정은 세션별 review_edits에만 기록한다.
+    """
+    df = process_loaded_df(pd.read_csv(file_path, encoding='utf-8-sig'))
+    return BaseDataset(df, build_filter_index(df))
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_uploaded_dataset(data):
+    """업로드된 파일 내용별로 한 번만 파싱해 모든 세션이 공유하는 기본 데이터셋과 필터 인덱스 (읽기 전용)"""
+    df = process_loaded_df(pd.read_csv(io.BytesIO(data), encoding='utf-8-sig'))
+    return BaseDataset(df, build_filter_index(df))
+
 def load_csv(file_path):
-    """CSV 파일 로드 (로컬 버전용)"""
+    """CSV 파일 로드 (로컬 버전용, 파일이 바뀌지 않았으면 캐시된 공유 데이터셋 재사용)"""
     try:
-        df = pd.read_csv(file_path, encoding='utf-8-sig')
-        return process_loaded_df(df)
+        stat = os.stat(file_path)
+        return load_base_dataset(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
     except Exception as e:
         st.error(f"파일 로드 오류: {e}")
         return None
 
 def load_csv_from_upload(uploaded_file):
-    """업로드된 CSV 파일 로드 (클라우드 버전용)"""
+    """업로드된 CSV 파일 로드 (클라우드 버전용, 같은 내용이면 캐시된 공유 데이터셋 재사용)"""
     try:
-        df = pd.read_csv(uploaded_file, encoding='utf-8-sig')
-        return process_loaded_df(df)
+        return load_uploaded_dataset(uploaded_file.getvalue())
     except Exception as e:
         st.error(f"파일 로드 오류: {e}")
         return None
@@ -189,21 +231,10 @@ def process_loaded_df(df):
     
     missing_columns = [col for col in required_columns if col not in df.columns]
     if missing_columns:
-        st.error(f"필수 컬럼이 없습니다: {missing_columns}")
-        return None
+        raise ValueError(f"필수 컬럼이 없습니다: {missing_columns}")
     
     # 인간 검토 컬럼 추가 (없으면)
-    review_columns = {
-        'human_depression_keywords': '',
-        'human_mobile_keywords': '',
-        'human_behavioral_keywords': '',
-        'human_result': '',
-        'reviewer_name': '',
-        'review_status': '미완료',
-        'review_date': None
-    }
-    
-    for col, default_val in review_columns.items():
+    for col, default_val in REVIEW_COLUMNS.items():
         if col not in df.columns:
             df[col] = default_val
     
@@ -211,6 +242,128 @@ def process_loaded_df(df):
 
 # save_csv 함수 제거 - 클라우드 버전에서는 메모리 기반 작업만 수행
 
+def build_filter_index(df):
+    """논문 목록 필터용 인덱스 (기본 데이터셋당 한 번 계산해 모든 세션이 공유)
+    
+    출간연도 선택지와 행별 연도 코드, 최종 결과/불일치 행 마스크,
+    파일에 저장된 검토 상태별 행 마스크를 담는다.
+    """
+    if 'Publication Year' in df.columns:
+        year_codes, years = pd.factorize(df['Publication Year'], sort=True)
+        years = years.tolist()
+    else:
+        year_codes, years = np.full(len(df), -1), []
+    
+    final_rows = {}
+    if 'final_result' in df.columns:
+        rule_col = 'rule_result' if 'rule_result' in df.columns else 'result'
+        final_rows = {
+            'Include': (df['final_result'] == 'include').to_numpy(),
+            'Exclude': (df['final_result'] == 'exclude').to_numpy(),
+            '불일치': (df[rule_col] != df['final_result']).to_numpy()
+        }
+    
+    return {
+        'years': years,
+        'year_codes': {year: code for code, year in enumerate(years)},
+        'year_rows': year_codes,
+        'final_rows': final_rows,
+        'status_rows': {
+            '완료': df['review_status'].isin(REVIEWED_STATUSES).to_numpy(),
+            '미완료': (df['review_status'] == '미완료').to_numpy()
+        }
+    }
+
+def set_base_dataset(dataset):
+    """불러온 공유 데이터셋으로 현재 세션의 검토 상태 초기화"""
+    st.session_state.df = dataset.df
+    st.session_state.filter_index = dataset.filter_index
+    st.session_state.review_edits = {}
+    st.session_state.status_rows = {status: rows.copy() for status, rows in dataset.filter_index['status_rows'].items()}
+    st.session_state.filtered_rows = None
+    st.session_state.review_version += 1
+
+def set_review_values(idx, values):
+    """현재 세션의 검토 수정분에 행 idx의 검토 컬럼 값 기록 (공유 기본 데이터셋은 수정하지 않음)
+    
+    검토 상태가 바뀌면 세션의 상태별 행 마스크에서 해당 행만 갱신한다.
+    """
+    st.session_state.review_edits.setdefault(idx, {}).update(values)
+    
+    if 'review_status' in values:
+        status = values['review_status']
+        st.session_state.status_rows['완료'][idx] = status in REVIEWED_STATUSES
+        st.session_state.status_rows['미완료'][idx] = status == '미완료'
+        st.session_state.review_version += 1
+
+def count_completed():
+    """(검토 완료 수, 전체 수)"""
+    total = len(st.session_state.df)
+    return total - int(np.count_nonzero(st.session_state.status_rows['미완료'])), total
+
+def get_dataset():
+    """공유 기본 데이터셋에 현재 세션의 검토 수정분을 반영한 DataFrame
+    
+    수정분이 없으면 기본 데이터셋을 그대로 반환하고, 있으면 수정된 검토 컬럼만 새로 만든다.
+    """
+    base = st.session_state.df
+    edits = st.session_state.review_edits
+    if base is None or not edits:
+        return base
+    
+    dataset = base.copy(deep=False)
+    for col in REVIEW_COLUMNS:
+        values = {idx: row[col] for idx, row in edits.items() if col in row}
+        if values:
+            column = base[col].astype(object)
+            column.loc[list(values)] = list(values.values())
+            dataset[col] = column
+    
+    return dataset
+
+def filter_rows(status_filter, year_filter, final_filter):
+    """필터 조건에 맞는 행 번호 배열 (조건과 검토 상태가 그대로면 이전 결과 재사용)"""
+    index = st.session_state.filter_index
+    
+    # 상태 필터가 없으면 검토 결정이 바뀌어도 결과가 같다
+    version = st.session_state.review_version if status_filter != "전체" else None
+    key = (status_filter, tuple(year_filter), tuple(final_filter), version)
+    cached = st.session_state.get('filtered_rows')
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    mask = np.ones(len(st.session_state.df), dtype=bool)
+    if status_filter != "전체":
+        mask &= st.session_state.status_rows[status_filter]
+    if year_filter:
+        mask &= np.isin(index['year_rows'], [index['year_codes'][year] for year in year_filter])
+    if final_filter:
+        mask &= np.logical_or.reduce([index['final_rows'][value] for value in final_filter])
+    
+    rows = np.flatnonzero(mask)
+    st.session_state.filtered_rows = (key, rows)
+    return rows
+
+def get_rows(positions):
+    """positions 위치의 논문 행들 (현재 세션의 검토 수정분 반영, 행 수에 비례하는 비용)"""
+    rows = st.session_state.df.iloc[positions].copy()
+    edits = st.session_state.review_edits
+    
+    for idx in positions:
+        for col, value in edits.get(idx, {}).items():
+            if rows[col].dtype != object:
+                rows[col] = rows[col].astype(object)
+            rows.at[idx, col] = value
+    
+    return rows
+
+def get_paper_row(idx):
+    """idx번째 논문 행 (현재 세션의 검토 수정분 반영)"""
+    row = st.session_state.df.iloc[idx].copy()
+    for col, value in st.session_state.review_edits.get(idx, {}).items():
+        row[col] = value
+    return row
+
 def parse_keywords(keywords_str):
     """키워드 문자열 파싱"""
     if pd.isna(keywords_str) or not str(keywords_str).strip():
@@ -234,20 +387,15 @@ def convert_wildcard_to_regex(keyword):
     else:
         return None
 
-def highlight_all_keywords(text, all_selected_keywords):
-    """모든 선택된 키워드들을 텍스트에서 한번에 하이라이트"""
-    if not text:
-        return text
+@st.cache_resource(max_entries=64, show_spinner=False)
+def compile_keyword_patterns(keyword_key, use_word_boundary):
+    """선택된 키워드 집합을 (정규식, CSS 클래스) 목록으로 컴파일 (키워드 집합과 단어 경계 설정별로 한 번만)
     
-    highlighted_text = str(text)
+    keyword_key: ((카테고리, (키워드, ...)), ...) 형태의 튜플
+    """
+    patterns = []
     
-    # 모든 키워드와 그 매칭 패턴을 수집
-    all_matches = []
-    
-    for category, keywords in all_selected_keywords.items():
-        if not keywords:
-            continue
-            
+    for category, keywords in keyword_key:
         class_name = f"highlight-{category}"
         
         for keyword in keywords:
@@ -255,54 +403,57 @@ def highlight_all_keywords(text, all_selected_keywords):
             wildcard_pattern = convert_wildcard_to_regex(keyword)
             
             if wildcard_pattern:
-                # 와일드카드 패턴 사용
-                pattern = re.compile(wildcard_pattern, re.IGNORECASE)
+                pattern = wildcard_pattern
+            elif use_word_boundary and len(keyword.split()) == 1:
+                # 단일 단어의 경우 단어 경계 확인 (구문은 전체 매칭)
+                pattern = r'\b' + re.escape(keyword) + r'\b'
             else:
-                # 일반 키워드 처리
-                if st.session_state.use_word_boundary:
-                    # 단어 경계를 사용한 정확한 매칭
-                    if len(keyword.split()) == 1:
-                        # 단일 단어의 경우 단어 경계 확인
-                        pattern = re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE)
-                    else:
-                        # 구문의 경우 전체 매칭
-                        pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-                else:
-                    # 부분 문자열 매칭 (기존 방식)
-                    pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+                # 부분 문자열 매칭
+                pattern = re.escape(keyword)
             
-            # 모든 매칭 찾기
-            for match in pattern.finditer(highlighted_text):
-                all_matches.append({
-                    'start': match.start(),
-                    'end': match.end(),
-                    'text': match.group(0),
-                    'class': class_name
-                })
-    
-    # 매칭된 위치 기준으로 정렬 (뒤에서부터 처리하기 위해 역순)
-    all_matches.sort(key=lambda x: x['start'], reverse=True)
-    
-    # 겹치는 매칭 제거 (더 긴 매칭을 우선)
-    filtered_matches = []
-    for match in all_matches:
-        is_overlap = False
-        for existing in filtered_matches:
-            if (match['start'] < existing['end'] and match['end'] > existing['start']):
-                is_overlap = True
-                break
-        if not is_overlap:
-            filtered_matches.append(match)
-    
-    # 뒤에서부터 하이라이트 적용 (인덱스 변경 방지)
-    for match in filtered_matches:
-        highlighted_text = (
-            highlighted_text[:match['start']] +
-            f'<span class="{match["class"]}">{match["text"]}</span>' +
-            highlighted_text[match['end']:]
-        )
+            patterns.append((re.compile(pattern, re.IGNORECASE), class_name))
     
-    return highlighted_text
+    return patterns
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def render_highlighted_text(text, keyword_key, use_word_boundary):
+    """키워드 매칭 구간을 하이라이트한 HTML 생성 (논문 텍스트와 키워드 집합별로 메모이즈)"""
+    # 모든 키워드의 매칭 구간 수집 (시작, 끝, 패턴 순서, 클래스)
+    matches = []
+    for order, (pattern, class_name) in enumerate(compile_keyword_patterns(keyword_key, use_word_boundary)):
+        for match in pattern.finditer(text):
+            matches.append((match.start(), match.end(), order, class_name))
+    
+    # 뒤에서 시작하는 매칭부터 (시작이 같으면 더 긴 매칭 우선) 한 번 훑으며 겹치지 않는 구간만 선택
+    matches.sort(key=lambda m: (-m[0], m[0] - m[1], m[2]))
+    selected = []
+    boundary = len(text)  # 지금까지 선택한 구간 중 가장 앞의 시작 위치
+    for start, end, _, class_name in matches:
+        if end <= boundary:
+            selected.append((start, end, class_name))
+            boundary = start
+    
+    # 앞에서부터 조각을 모아 한 번에 결합
+    parts = []
+    cursor = 0
+    for start, end, class_name in reversed(selected):
+        parts.append(text[cursor:start])
+        parts.append(f'<span class="{class_name}">{text[start:end]}</span>')
+        cursor = end
+    parts.append(text[cursor:])
+    
+    return ''.join(parts)
+
+def highlight_all_keywords(text, all_selected_keywords):
+    """모든 선택된 키워드들을 텍스트에서 한번에 하이라이트"""
+    if not text:
+        return text
+    
+    keyword_key = tuple(
+        (category, tuple(sorted(keywords)))
+        for category, keywords in all_selected_keywords.items() if keywords
+    )
+    return render_highlighted_text(str(text), keyword_key, st.session_state.use_word_boundary)
 
 def toggle_keyword_selection(category, keyword):
     """키워드 선택 토글"""
@@ -329,13 +480,15 @@ def update_paper_data():
     human_result = 'include' if has_all_categories else 'exclude'
     
     # DataFrame 업데이트
-    st.session_state.df.at[idx, 'human_depression_keywords'] = human_depression
-    st.session_state.df.at[idx, 'human_mobile_keywords'] = human_mobile
-    st.session_state.df.at[idx, 'human_behavioral_keywords'] = human_behavioral
-    st.session_state.df.at[idx, 'human_result'] = human_result
-    st.session_state.df.at[idx, 'reviewer_name'] = st.session_state.reviewer_name
-    st.session_state.df.at[idx, 'review_status'] = '완료'
-    st.session_state.df.at[idx, 'review_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    set_review_values(idx, {
+        'human_depression_keywords': human_depression,
+        'human_mobile_keywords': human_mobile,
+        'human_behavioral_keywords': human_behavioral,
+        'human_result': human_result,
+        'reviewer_name': st.session_state.reviewer_name,
+        'review_status': '완료',
+        'review_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    })
     
     st.session_state.changes_made = True
 
@@ -407,9 +560,9 @@ def render_sidebar():
                 )
                 
                 if st.button("로컬 파일 로드", use_container_width=True):
-                    df = load_csv(selected_file)
-                    if df is not None:
-                        st.session_state.df = df
+                    dataset = load_csv(selected_file)
+                    if dataset is not None:
+                        set_base_dataset(dataset)
                         st.session_state.file_name = os.path.basename(selected_file)
                         st.session_state.current_idx = 0
                         load_current_paper_keywords()
@@ -432,9 +585,9 @@ def render_sidebar():
             
             if uploaded_file is not None:
                 if st.button("업로드 파일 로드", use_container_width=True):
-                    df = load_csv_from_upload(uploaded_file)
-                    if df is not None:
-                        st.session_state.df = df
+                    dataset = load_csv_from_upload(uploaded_file)
+                    if dataset is not None:
+                        set_base_dataset(dataset)
                         st.session_state.file_name = uploaded_file.name  # 파일명만 저장
                         st.session_state.current_idx = 0
                         load_current_paper_keywords()
@@ -505,8 +658,7 @@ def render_sidebar():
             st.header("📥 결과 다운로드")
             
             # 진행 상황 표시
-            total = len(st.session_state.df)
-            completed = (st.session_state.df['review_status'] != '미완료').sum()
+            completed, total = count_completed()
             progress = completed / total if total > 0 else 0
             
             st.metric(
@@ -522,7 +674,7 @@ def render_sidebar():
                 st.success("✅ 모든 변경사항이 메모리에 저장되었습니다.")
             
             # 다운로드 버튼
-            csv_data = st.session_state.df.to_csv(index=False, encoding='utf-8-sig')
+            csv_data = get_dataset().to_csv(index=False, encoding='utf-8-sig')
             current_time = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"reviewed_results_{current_time}.csv"
             
@@ -544,8 +696,8 @@ def render_data_navigation():
     # 하이브리드 파일인지 확인
     is_hybrid_file = 'final_result' in st.session_state.df.columns
     
-    # 필터링된 데이터 초기화
-    df = st.session_state.df.copy()
+    # 미리 계산된 필터 인덱스
+    filter_index = st.session_state.filter_index
     
     # 필터링 옵션
     if is_hybrid_file:
@@ -559,10 +711,9 @@ def render_data_navigation():
         
         with col2:
             # Publication Year 필터
-            all_years = sorted(df['Publication Year'].dropna().unique()) if 'Publication Year' in df.columns else []
             year_filter = st.multiselect(
                 "출간연도 필터",
-                options=all_years,
+                options=filter_index['years'],
                 default=[],
                 key="year_filter"
             )
@@ -588,48 +739,19 @@ def render_data_navigation():
         
         with col2:
             # Publication Year 필터
-            all_years = sorted(df['Publication Year'].dropna().unique()) if 'Publication Year' in df.columns else []
             year_filter = st.multiselect(
                 "출간연도 필터",
-                options=all_years,
+                options=filter_index['years'],
                 default=[],
                 key="year_filter"
             )
             final_filter = []  # 일반 파일은 빈 리스트로 설정
     
-    if status_filter != "전체":
-        if status_filter == "완료":
-            df = df[df['review_status'].isin(['완료', 'include', 'exclude'])]
-        else:
-            df = df[df['review_status'] == '미완료']
-    
-    # Publication Year 필터링
-    if year_filter:
-        df = df[df['Publication Year'].isin(year_filter)]
-    
-    # 최종 결과 필터링 (다중 선택 대응)
-    if is_hybrid_file and final_filter:
-        filter_conditions = []
-        for filter_val in final_filter:
-            if filter_val == "Include":
-                filter_conditions.append(df['final_result'] == 'include')
-            elif filter_val == "Exclude":
-                filter_conditions.append(df['final_result'] == 'exclude')
-            elif filter_val == "불일치":
-                # rule_result와 final_result가 다른 경우
-                rule_col = 'rule_result' if 'rule_result' in df.columns else 'result'
-                filter_conditions.append(df[rule_col] != df['final_result'])
-        
-        # OR 조건으로 결합 (하나라도 해당하면 포함)
-        if filter_conditions:
-            combined_condition = filter_conditions[0]
-            for condition in filter_conditions[1:]:
-                combined_condition = combined_condition | condition
-            df = df[combined_condition]
+    rows = filter_rows(status_filter, year_filter, final_filter)
     
     # 페이지네이션
     items_per_page = 10
-    total_items = len(df)
+    total_items = len(rows)
     total_pages = (total_items + items_per_page - 1) // items_per_page
     
     if 'data_page' not in st.session_state:
@@ -654,7 +776,7 @@ def render_data_navigation():
     # 현재 페이지 데이터
     start_idx = st.session_state.data_page * items_per_page
     end_idx = min(start_idx + items_per_page, total_items)
-    page_data = df.iloc[start_idx:end_idx]
+    page_data = get_rows(rows[start_idx:end_idx])
     
     # 데이터 행들
     for row_idx, row_data in page_data.iterrows():
@@ -783,13 +905,15 @@ def render_data_navigation():
                 'behavioral': {"behavioral activation"}
             }
             current_idx = st.session_state.current_idx
-            st.session_state.df.at[current_idx, 'human_depression_keywords'] = 'depression'
-            st.session_state.df.at[current_idx, 'human_mobile_keywords'] = 'mobile'
-            st.session_state.df.at[current_idx, 'human_behavioral_keywords'] = 'behavioral activation'
-            st.session_state.df.at[current_idx, 'human_result'] = 'include'
-            st.session_state.df.at[current_idx, 'reviewer_name'] = st.session_state.reviewer_name
-            st.session_state.df.at[current_idx, 'review_status'] = 'include'
-            st.session_state.df.at[current_idx, 'review_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            set_review_values(current_idx, {
+                'human_depression_keywords': 'depression',
+                'human_mobile_keywords': 'mobile',
+                'human_behavioral_keywords': 'behavioral activation',
+                'human_result': 'include',
+                'reviewer_name': st.session_state.reviewer_name,
+                'review_status': 'include',
+                'review_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            })
             st.session_state.changes_made = True
             
             # 메모리에서만 작업 (자동 저장 제거)
@@ -817,13 +941,15 @@ def render_data_navigation():
                 'behavioral': set()
             }
             current_idx = st.session_state.current_idx
-            st.session_state.df.at[current_idx, 'human_depression_keywords'] = ''
-            st.session_state.df.at[current_idx, 'human_mobile_keywords'] = ''
-            st.session_state.df.at[current_idx, 'human_behavioral_keywords'] = ''
-            st.session_state.df.at[current_idx, 'human_result'] = 'exclude'
-            st.session_state.df.at[current_idx, 'reviewer_name'] = st.session_state.reviewer_name
-            st.session_state.df.at[current_idx, 'review_status'] = 'exclude'
-            st.session_state.df.at[current_idx, 'review_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            set_review_values(current_idx, {
+                'human_depression_keywords': '',
+                'human_mobile_keywords': '',
+                'human_behavioral_keywords': '',
+                'human_result': 'exclude',
+                'reviewer_name': st.session_state.reviewer_name,
+                'review_status': 'exclude',
+                'review_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            })
             st.session_state.changes_made = True
             
             # 메모리에서만 작업 (자동 저장 제거)
@@ -845,12 +971,14 @@ def render_data_navigation():
     # 재설정 버튼
     if st.button("🔄 재설정", use_container_width=True, help="현재 논문의 검토 상태를 미완료로 되돌립니다"):
         current_idx = st.session_state.current_idx
-        st.session_state.df.at[current_idx, 'human_depression_keywords'] = ''
-        st.session_state.df.at[current_idx, 'human_mobile_keywords'] = ''
-        st.session_state.df.at[current_idx, 'human_behavioral_keywords'] = ''
-        st.session_state.df.at[current_idx, 'human_result'] = ''
-        st.session_state.df.at[current_idx, 'review_status'] = '미완료'
-        st.session_state.df.at[current_idx, 'review_date'] = None
+        set_review_values(current_idx, {
+            'human_depression_keywords': '',
+            'human_mobile_keywords': '',
+            'human_behavioral_keywords': '',
+            'human_result': '',
+            'review_status': '미완료',
+            'review_date': None
+        })
         st.session_state.changes_made = True
         
         # 키워드도 재설정
@@ -864,7 +992,7 @@ def render_data_navigation():
 def render_main_content():
     """메인 컨텐츠 렌더링"""
     idx = st.session_state.current_idx
-    row = st.session_state.df.iloc[idx]
+    row = get_paper_row(idx)
     
     
     # 하이브리드 파일인지 확인
@@ -8,10 +8,16 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
 import re
+import threading
+from collections import namedtuple
 from datetime import datetime
 
+from result_store import load_results, save_results, unique_paper_keys
+from review_store import REVIEWED_STATUSES, ReviewStore
+
 # 와이드 모드 설정
 st.set_page_config(page_title="키워드 라벨링 검토", layout="wide")
 
@@ -137,7 +143,27 @@ st.markdown("""
 if 'current_idx' not in st.session_state:
     st.session_state.current_idx = 0
 if 'df' not in st.session_state:
-    st.session_state.df = None
+    st.session_state.df = None  # 공유 기본 데이터셋 (읽기 전용)
+if 'review_edits' not in st.session_state:
+    st.session_state.review_edits = {}  # 이 세션의 검토 수정분 {행 번호: {컬럼: 값}}
+if 'filter_index' not in st.session_state:
+    st.session_state.filter_index = None  # 공유 필터 인덱스 (읽기 전용)
+if 'status_rows' not in st.session_state:
+    st.session_state.status_rows = None  # 이 세션의 검토 상태별 행 마스크
+if 'review_version' not in st.session_state:
+    st.session_state.review_version = 0  # 검토 상태가 바뀔 때마다 증가
+if 'paper_ids' not in st.session_state:
+    st.session_state.paper_ids = None  # 행별 검토 저장소 키 (공유)
+if 'paper_rows' not in st.session_state:
+    st.session_state.paper_rows = None  # 검토 저장소 키 → 행 번호 (공유)
+if 'unsaved_rows' not in st.session_state:
+    st.session_state.unsaved_rows = set()  # 검토 저장소에 아직 기록하지 않은 수정 행
+if 'store_seq' not in st.session_state:
+    st.session_state.store_seq = 0  # 마지막으로 반영한 검토 저장소 기록 순번
+if 'claimed_rows' not in st.session_state:
+    st.session_state.claimed_rows = []  # 이 세션이 점유한 검토 묶음 (행 번호)
+if 'review_conflicts' not in st.session_state:
+    st.session_state.review_conflicts = []  # 다른 검토자가 점유 중이거나 이미 검토해 점유/저장하지 못한 (행 번호, 검토자)
 if 'file_path' not in st.session_state:
     st.session_state.file_path = None
 if 'changes_made' not in st.session_state:
@@ -149,64 +175,410 @@ if 'selected_keywords' not in st.session_state:
 if 'use_word_boundary' not in st.session_state:
     st.session_state.use_word_boundary = True
 
+# 인간 검토 컬럼과 기본값 (세션별 검토 수정분은 이 컬럼들만 가진다)
+REVIEW_COLUMNS = {
+    'human_depression_keywords': '',
+    'human_mobile_keywords': '',
+    'human_behavioral_keywords': '',
+    'human_result': '',
+    'reviewer_name': '',
+    'review_status': '미완료',
+    'review_date': None
+}
+
+# 한 번에 점유하는 검토 묶음 크기와 점유 유지 시간(초)
+CLAIM_BATCH_SIZE = 10
+CLAIM_LEASE_SECONDS = 600
+
+# 묶음 없이 직접 고른 논문의 점유 유지 시간(초)
+PAPER_LEASE_SECONDS = 120
+
+# 검토자 선택지 (OTHER_REVIEWER를 고르면 이름을 직접 입력)
+REVIEWERS = ["황가네", "이가네", "김가네"]
+OTHER_REVIEWER = "이방인"
+
+# 스냅샷 이후 기록된 결정이 이만큼 쌓이면 백그라운드에서 스냅샷 파일에 반영
+COMPACT_DECISIONS = 200
+
+# 공유 기본 데이터셋, 필터 인덱스, 행별 검토 저장소 키와 키 → 행 번호
+BaseDataset = namedtuple('BaseDataset', ['df', 'filter_index', 'paper_ids', 'paper_rows'])
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_base_dataset(file_path, mtime_ns, size):
+    """파일 버전(경로, 수정 시각, 크기)별로 한 번만 파싱해 모든 세션이 공유하는 기본 데이터셋과 필터 인덱스
+    
+    반환된 DataFrame은 읽기 전용으로 다루고, 검토 수정은 세션별 review_edits에만 기록한다.
+    """
+    df = load_results(file_path)
+    
+    # 하이브리드 결과 파일인지 확인
+    is_hybrid = all(col in df.columns for col in ['rule_result', 'llm_result', 'final_result'])
+    
+    if is_hybrid:
+        # 하이브리드 파일의 경우 호환성을 위해 컬럼 매핑
+        if 'depression_keywords' not in df.columns:
+            df['depression_keywords'] = df.get('rule_depression_keywords', '')
+        if 'mobile_keywords' not in df.columns:
+            df['mobile_keywords'] = df.get('rule_mobile_keywords', '')
+        if 'behavioral_keywords' not in df.columns:
+            df['behavioral_keywords'] = df.get('rule_behavioral_keywords', '')
+        if 'result' not in df.columns:
+            df['result'] = df.get('rule_result', '')
+    
+    # 필수 컬럼 확인
+    required_columns = ['Title', 'Abstract', 'depression_keywords', 'mobile_keywords', 
+                       'behavioral_keywords', 'result']
+    
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"필수 컬럼이 없습니다: {missing_columns}")
+    
+    # 인간 검토 컬럼 추가 (없으면)
+    for col, default_val in REVIEW_COLUMNS.items():
+        if col not in df.columns:
+            df[col] = default_val
+    
+    paper_ids = review_paper_ids(df)
+    paper_rows = {paper_id: idx for idx, paper_id in enumerate(paper_ids)}
+    return BaseDataset(df, build_filter_index(df), paper_ids, paper_rows)
+
 def load_csv(file_path):
-    """CSV 파일 로드"""
+    """CSV 파일 로드 (파일이 바뀌지 않았으면 캐시된 공유 데이터셋 재사용)"""
     try:
-        df = pd.read_csv(file_path, encoding='utf-8-sig')
-        
-        # 하이브리드 결과 파일인지 확인
-        is_hybrid = all(col in df.columns for col in ['rule_result', 'llm_result', 'final_result'])
-        
-        if is_hybrid:
-            # 하이브리드 파일의 경우 호환성을 위해 컬럼 매핑
-            if 'depression_keywords' not in df.columns:
-                df['depression_keywords'] = df.get('rule_depression_keywords', '')
-            if 'mobile_keywords' not in df.columns:
-                df['mobile_keywords'] = df.get('rule_mobile_keywords', '')
-            if 'behavioral_keywords' not in df.columns:
-                df['behavioral_keywords'] = df.get('rule_behavioral_keywords', '')
-            if 'result' not in df.columns:
-                df['result'] = df.get('rule_result', '')
-        
-        # 필수 컬럼 확인
-        required_columns = ['Title', 'Abstract', 'depression_keywords', 'mobile_keywords', 
-                           'behavioral_keywords', 'result']
-        
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            st.error(f"필수 컬럼이 없습니다: {missing_columns}")
-            return None
-        
-        # 인간 검토 컬럼 추가 (없으면)
-        review_columns = {
-            'human_depression_keywords': '',
-            'human_mobile_keywords': '',
-            'human_behavioral_keywords': '',
-            'human_result': '',
-            'reviewer_name': '',
-            'review_status': '미완료',
-            'review_date': None
-        }
+        stat = os.stat(file_path)
+        return load_base_dataset(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    except Exception as e:
+        st.error(f"파일 로드 오류: {e}")
+        return None
+
+def review_paper_ids(df):
+    """행별 검토 저장소 키 (논문 고유 키, 같은 논문이 여러 번 나오면 두 번째부터 '#순번' 추가)"""
+    return unique_paper_keys(df).tolist()
+
+@st.cache_resource(show_spinner=False)
+def open_review_store(file_path):
+    """결과 파일별로 모든 세션(검토자)이 공유하는 검토 저장소"""
+    return ReviewStore(f"{file_path}.reviews.sqlite", lease_seconds=CLAIM_LEASE_SECONDS)
+
+@st.cache_resource(show_spinner=False)
+def compaction_state(file_path):
+    """결과 파일별 스냅샷 압축 진행 여부 (모든 세션 공유)"""
+    return {'lock': threading.Lock(), 'compacting': False}
+
+def current_review_store():
+    return open_review_store(os.path.abspath(st.session_state.file_path))
+
+def apply_review_entries(df, entries, paper_rows):
+    """검토 값을 DataFrame의 검토 컬럼에 반영 (같은 논문은 나중 항목 우선)"""
+    for paper_id, values in entries:
+        idx = paper_rows.get(paper_id)
+        if idx is None:
+            continue
+        for col, value in values.items():
+            if df[col].dtype != object:
+                df[col] = df[col].astype(object)
+            df.iat[idx, df.columns.get_loc(col)] = value
+
+def compact_review_store(file_path, store, state):
+    """검토 저장소의 결정을 스냅샷 파일에 반영 (백그라운드 스레드에서 실행)
+    
+    새 스냅샷은 임시 파일에 쓴 뒤 원자적으로 교체한다. 저장소의 결정은 그대로 두므로
+    압축 중에 기록된 결정이나 중단된 압축도 다음 압축과 로드 때 다시 반영된다.
+    """
+    try:
+        seq = store.last_seq()
+        entries = [(paper_id, values) for paper_id, values, _ in store.decisions()]
         
-        for col, default_val in review_columns.items():
+        df = load_results(file_path)
+        for col, default_val in REVIEW_COLUMNS.items():
             if col not in df.columns:
                 df[col] = default_val
         
-        return df
+        paper_ids = review_paper_ids(df)
+        apply_review_entries(df, entries, {paper_id: idx for idx, paper_id in enumerate(paper_ids)})
+        
+        stem, suffix = os.path.splitext(file_path)
+        snapshot_path = f"{stem}.compacting-{os.getpid()}{suffix}"
+        save_results(df, snapshot_path)
+        os.replace(snapshot_path, file_path)
+        store.set_meta('snapshot_seq', seq)
         
+        print(f"🗜️ 검토 결정 스냅샷 반영 완료: {len(entries)}건 → {os.path.basename(file_path)}")
     except Exception as e:
-        st.error(f"파일 로드 오류: {e}")
-        return None
+        print(f"⚠️ 검토 결정 스냅샷 반영 오류: {e}")
+    finally:
+        state['compacting'] = False
 
-def save_csv(df, file_path):
-    """CSV 파일 저장"""
-    try:
-        df.to_csv(file_path, index=False, encoding='utf-8-sig')
-        st.session_state.changes_made = False
+def maybe_compact_review_store(file_path, store):
+    """스냅샷 이후 기록된 결정이 COMPACT_DECISIONS건 이상이면 백그라운드 압축 시작 (진행 중이면 생략)"""
+    if store.last_seq() - int(store.get_meta('snapshot_seq', '0')) < COMPACT_DECISIONS:
+        return
+    
+    state = compaction_state(os.path.abspath(file_path))
+    with state['lock']:
+        if state['compacting']:
+            return
+        state['compacting'] = True
+    
+    threading.Thread(target=compact_review_store, args=(file_path, store, state), daemon=True).start()
+
+def load_review_store(file_path):
+    """검토 저장소의 결정을 현재 세션의 검토 수정분으로 복원 (스냅샷 + 저장소)"""
+    dataset_df = st.session_state.df
+    store = open_review_store(os.path.abspath(file_path))
+    store.register_papers(st.session_state.paper_ids, dataset_df['review_status'].tolist())
+    
+    st.session_state.store_seq = 0
+    sync_review_store(store)
+    st.session_state.claimed_rows = []
+    maybe_compact_review_store(file_path, store)
+
+def sync_review_store(store=None):
+    """마지막으로 본 이후에 기록된 결정(다른 검토자 포함)을 현재 세션에 반영
+    
+    저장하지 않은 수정이 있는 행은 덮어쓰지 않는다.
+    """
+    store = store or current_review_store()
+    paper_rows = st.session_state.paper_rows
+    
+    for paper_id, values, seq in store.decisions(st.session_state.store_seq):
+        idx = paper_rows.get(paper_id)
+        if idx is not None and idx not in st.session_state.unsaved_rows:
+            set_review_values(idx, values, unsaved=False)
+        st.session_state.store_seq = seq
+
+def restore_review_values(idx, store):
+    """현재 세션의 행 idx 수정분을 버리고 저장소(없으면 스냅샷)의 값으로 되돌림"""
+    st.session_state.review_edits.pop(idx, None)
+    update_status_rows(idx, st.session_state.df['review_status'].iat[idx])
+    
+    values = store.get(st.session_state.paper_ids[idx])
+    if values:
+        set_review_values(idx, values, unsaved=False)
+
+def save_review_decisions(reset_rows=()):
+    """저장하지 않은 검토 수정분을 검토 저장소에 논문 단위로 기록
+    
+    다른 검토자가 점유 중이거나 이미 검토한 논문은 기록하지 않고 저장소의 값으로 되돌린다.
+    reset_rows(재설정한 행)는 다른 검토자가 끝낸 검토라도 되돌린다.
+    """
+    rows = st.session_state.unsaved_rows
+    if not rows:
         return True
+    if not reviewer_ready():
+        st.warning("검토자 이름을 정해야 검토 결과를 저장할 수 있습니다.")
+        return False
+    
+    store = current_review_store()
+    conflicts = []
+    try:
+        for idx in sorted(rows):
+            holder = store.record_decision(
+                st.session_state.paper_ids[idx], st.session_state.reviewer_name, st.session_state.review_edits[idx],
+                reset=idx in reset_rows
+            )
+            if holder:
+                conflicts.append((idx, holder))
     except Exception as e:
         st.error(f"저장 오류: {e}")
         return False
+    
+    rows.clear()
+    for idx, holder in conflicts:
+        restore_review_values(idx, store)
+    st.session_state.review_conflicts.extend(conflicts)
+    st.session_state.changes_made = False
+    
+    maybe_compact_review_store(st.session_state.file_path, store)
+    return not conflicts
+
+def reviewer_ready():
+    """점유/기록에 쓸 검토자 이름이 정해졌는지 (비어 있거나 OTHER_REVIEWER 선택지 그대로면 아님)
+    
+    이름 없는 세션끼리 같은 검토자로 취급되어 서로의 점유와 결정을 덮어쓰지 않도록 한다.
+    """
+    reviewer_name = st.session_state.reviewer_name
+    return bool(reviewer_name) and reviewer_name != OTHER_REVIEWER
+
+def set_reviewer_name(reviewer_name):
+    """검토자 이름 변경 (이전 이름으로 받은 묶음은 반납하고, 정해진 이름으로 현재 논문 점유)"""
+    if reviewer_name == st.session_state.reviewer_name:
+        return
+    
+    if st.session_state.claimed_rows:
+        release_review_batch()
+    st.session_state.reviewer_name = reviewer_name
+    if reviewer_ready() and len(st.session_state.df):
+        claim_paper(st.session_state.current_idx)
+
+def claim_paper(idx):
+    """행 idx 논문을 현재 검토자 이름으로 잠깐 점유 (묶음 없이 고른 논문을 다른 검토자와 동시에 검토하지 않도록)
+    
+    다른 검토자가 점유 중이거나 이미 검토한 논문이면 안내 목록에 올리고 그 검토자 이름을 반환한다.
+    검토자 이름이 정해지지 않았으면 점유하지 않는다.
+    """
+    if not reviewer_ready():
+        return None
+    
+    holder = current_review_store().claim(
+        st.session_state.paper_ids[idx], st.session_state.reviewer_name, PAPER_LEASE_SECONDS
+    )
+    if holder:
+        st.session_state.review_conflicts.append((idx, holder))
+    return holder
+
+def claim_review_batch():
+    """현재 검토자 이름으로 검토되지 않은 논문 묶음 점유 (다른 검토자와 겹치지 않음)"""
+    if not reviewer_ready():
+        return []
+    
+    store = current_review_store()
+    paper_rows = st.session_state.paper_rows
+    claimed = store.claim_batch(st.session_state.reviewer_name, CLAIM_BATCH_SIZE)
+    
+    st.session_state.claimed_rows = [paper_rows[paper_id] for paper_id in claimed if paper_id in paper_rows]
+    st.session_state.review_version += 1
+    return st.session_state.claimed_rows
+
+def release_review_batch():
+    """현재 검토자가 점유한 논문 반납"""
+    current_review_store().release(st.session_state.reviewer_name)
+    st.session_state.claimed_rows = []
+    st.session_state.review_version += 1
+
+def next_paper_idx(current_idx):
+    """다음에 검토할 논문 번호 (검토 묶음을 받았으면 묶음 안의 다음 논문, 묶음을 다 검토하면 새 묶음 점유)
+    
+    묶음이 없으면 다음 행으로 넘어가면서 그 논문을 잠깐 점유한다.
+    """
+    claimed = st.session_state.claimed_rows
+    if not claimed:
+        if current_idx + 1 >= len(st.session_state.df):
+            return None
+        claim_paper(current_idx + 1)
+        return current_idx + 1
+    
+    if current_idx in claimed:
+        claimed.remove(current_idx)
+        st.session_state.review_version += 1
+    if not claimed:
+        claimed = claim_review_batch()
+    return claimed[0] if claimed else None
+
+def build_filter_index(df):
+    """논문 목록 필터용 인덱스 (기본 데이터셋당 한 번 계산해 모든 세션이 공유)
+    
+    출간연도 선택지와 행별 연도 코드, 최종 결과/불일치 행 마스크,
+    파일에 저장된 검토 상태별 행 마스크를 담는다.
+    """
+    if 'Publication Year' in df.columns:
+        year_codes, years = pd.factorize(df['Publication Year'], sort=True)
+        years = years.tolist()
+    else:
+        year_codes, years = np.full(len(df), -1), []
+    
+    final_rows = {}
+    if 'final_result' in df.columns:
+        rule_col = 'rule_result' if 'rule_result' in df.columns else 'result'
+        final_rows = {
+            'Include': (df['final_result'] == 'include').to_numpy(),
+            'Exclude': (df['final_result'] == 'exclude').to_numpy(),
+            '불일치': (df[rule_col] != df['final_result']).to_numpy()
+        }
+    
+    return {
+        'years': years,
+        'year_codes': {year: code for code, year in enumerate(years)},
+        'year_rows': year_codes,
+        'final_rows': final_rows,
+        'status_rows': {
+            '완료': df['review_status'].isin(REVIEWED_STATUSES).to_numpy(),
+            '미완료': (df['review_status'] == '미완료').to_numpy()
+        }
+    }
+
+def set_base_dataset(dataset):
+    """불러온 공유 데이터셋으로 현재 세션의 검토 상태 초기화"""
+    st.session_state.df = dataset.df
+    st.session_state.filter_index = dataset.filter_index
+    st.session_state.paper_ids = dataset.paper_ids
+    st.session_state.paper_rows = dataset.paper_rows
+    st.session_state.review_edits = {}
+    st.session_state.unsaved_rows = set()
+    st.session_state.status_rows = {status: rows.copy() for status, rows in dataset.filter_index['status_rows'].items()}
+    st.session_state.filtered_rows = None
+    st.session_state.review_version += 1
+
+def set_review_values(idx, values, unsaved=True):
+    """현재 세션의 검토 수정분에 행 idx의 검토 컬럼 값 기록 (공유 기본 데이터셋은 수정하지 않음)
+    
+    검토 상태가 바뀌면 세션의 상태별 행 마스크에서 해당 행만 갱신한다.
+    unsaved=False는 검토 저장소에서 가져온 값처럼 이미 저장된 값을 반영할 때 쓴다.
+    """
+    st.session_state.review_edits.setdefault(idx, {}).update(values)
+    if unsaved:
+        st.session_state.unsaved_rows.add(idx)
+    
+    if 'review_status' in values:
+        update_status_rows(idx, values['review_status'])
+
+def update_status_rows(idx, status):
+    """세션의 상태별 행 마스크에서 행 idx 갱신"""
+    st.session_state.status_rows['완료'][idx] = status in REVIEWED_STATUSES
+    st.session_state.status_rows['미완료'][idx] = status == '미완료'
+    st.session_state.review_version += 1
+
+def count_completed():
+    """(검토 완료 수, 전체 수)"""
+    total = len(st.session_state.df)
+    return total - int(np.count_nonzero(st.session_state.status_rows['미완료'])), total
+
+def filter_rows(status_filter, year_filter, final_filter):
+    """필터 조건에 맞는 행 번호 배열 (조건과 검토 상태가 그대로면 이전 결과 재사용)"""
+    index = st.session_state.filter_index
+    
+    # 상태 필터가 없으면 검토 결정이 바뀌어도 결과가 같다
+    version = st.session_state.review_version if status_filter != "전체" else None
+    key = (status_filter, tuple(year_filter), final_filter, version)
+    cached = st.session_state.get('filtered_rows')
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    mask = np.ones(len(st.session_state.df), dtype=bool)
+    if status_filter == "내 묶음":
+        claimed = np.zeros(len(mask), dtype=bool)
+        claimed[st.session_state.claimed_rows] = True
+        mask &= claimed
+    elif status_filter != "전체":
+        mask &= st.session_state.status_rows[status_filter]
+    if year_filter:
+        mask &= np.isin(index['year_rows'], [index['year_codes'][year] for year in year_filter])
+    if final_filter != "전체":
+        mask &= index['final_rows'][final_filter]
+    
+    rows = np.flatnonzero(mask)
+    st.session_state.filtered_rows = (key, rows)
+    return rows
+
+def get_rows(positions):
+    """positions 위치의 논문 행들 (현재 세션의 검토 수정분 반영, 행 수에 비례하는 비용)"""
+    rows = st.session_state.df.iloc[positions].copy()
+    edits = st.session_state.review_edits
+    
+    for idx in positions:
+        for col, value in edits.get(idx, {}).items():
+            if rows[col].dtype != object:
+                rows[col] = rows[col].astype(object)
+            rows.at[idx, col] = value
+    
+    return rows
+
+def get_paper_row(idx):
+    """idx번째 논문 행 (현재 세션의 검토 수정분 반영)"""
+    row = st.session_state.df.iloc[idx].copy()
+    for col, value in st.session_state.review_edits.get(idx, {}).items():
+        row[col] = value
+    return row
 
 def parse_keywords(keywords_str):
     """키워드 문자열 파싱"""
@@ -231,20 +603,15 @@ def convert_wildcard_to_regex(keyword):
     else:
         return None
 
-def highlight_all_keywords(text, all_selected_keywords):
-    """모든 선택된 키워드들을 텍스트에서 한번에 하이라이트"""
-    if not text:
-        return text
+@st.cache_resource(max_entries=64, show_spinner=False)
+def compile_keyword_patterns(keyword_key, use_word_boundary):
+    """선택된 키워드 집합을 (정규식, CSS 클래스) 목록으로 컴파일 (키워드 집합과 단어 경계 설정별로 한 번만)
     
-    highlighted_text = str(text)
+    keyword_key: ((카테고리, (키워드, ...)), ...) 형태의 튜플
+    """
+    patterns = []
     
-    # 모든 키워드와 그 매칭 패턴을 수집
-    all_matches = []
-    
-    for category, keywords in all_selected_keywords.items():
-        if not keywords:
-            continue
-            
+    for category, keywords in keyword_key:
         class_name = f"highlight-{category}"
         
         for keyword in keywords:
@@ -252,54 +619,57 @@ def highlight_all_keywords(text, all_selected_keywords):
             wildcard_pattern = convert_wildcard_to_regex(keyword)
             
             if wildcard_pattern:
-                # 와일드카드 패턴 사용
-                pattern = re.compile(wildcard_pattern, re.IGNORECASE)
+                pattern = wildcard_pattern
+            elif use_word_boundary and len(keyword.split()) == 1:
+                # 단일 단어의 경우 단어 경계 확인 (구문은 전체 매칭)
+                pattern = r'\b' + re.escape(keyword) + r'\b'
             else:
-                # 일반 키워드 처리
-                if st.session_state.use_word_boundary:
-                    # 단어 경계를 사용한 정확한 매칭
-                    if len(keyword.split()) == 1:
-                        # 단일 단어의 경우 단어 경계 확인
-                        pattern = re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE)
-                    else:
-                        # 구문의 경우 전체 매칭
-                        pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-                else:
-                    # 부분 문자열 매칭 (기존 방식)
-                    pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+                # 부분 문자열 매칭
+                pattern = re.escape(keyword)
             
-            # 모든 매칭 찾기
-            for match in pattern.finditer(highlighted_text):
-                all_matches.append({
-                    'start': match.start(),
-                    'end': match.end(),
-                    'text': match.group(0),
-                    'class': class_name
-                })
-    
-    # 매칭된 위치 기준으로 정렬 (뒤에서부터 처리하기 위해 역순)
-    all_matches.sort(key=lambda x: x['start'], reverse=True)
-    
-    # 겹치는 매칭 제거 (더 긴 매칭을 우선)
-    filtered_matches = []
-    for match in all_matches:
-        is_overlap = False
-        for existing in filtered_matches:
-            if (match['start'] < existing['end'] and match['end'] > existing['start']):
-                is_overlap = True
-                break
-        if not is_overlap:
-            filtered_matches.append(match)
-    
-    # 뒤에서부터 하이라이트 적용 (인덱스 변경 방지)
-    for match in filtered_matches:
-        highlighted_text = (
-            highlighted_text[:match['start']] +
-            f'<span class="{match["class"]}">{match["text"]}</span>' +
-            highlighted_text[match['end']:]
-        )
+            patterns.append((re.compile(pattern, re.IGNORECASE), class_name))
+    
+    return patterns
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def render_highlighted_text(text, keyword_key, use_word_boundary):
+    """키워드 매칭 구간을 하이라이트한 HTML 생성 (논문 텍스트와 키워드 집합별로 메모이즈)"""
+    # 모든 키워드의 매칭 구간 수집 (시작, 끝, 패턴 순서, 클래스)
+    matches = []
+    for order, (pattern, class_name) in enumerate(compile_keyword_patterns(keyword_key, use_word_boundary)):
+        for match in pattern.finditer(text):
+            matches.append((match.start(), match.end(), order, class_name))
+    
+    # 뒤에서 시작하는 매칭부터 (시작이 같으면 더 긴 매칭 우선) 한 번 훑으며 겹치지 않는 구간만 선택
+    matches.sort(key=lambda m: (-m[0], m[0] - m[1], m[2]))
+    selected = []
+    boundary = len(text)  # 지금까지 선택한 구간 중 가장 앞의 시작 위치
+    for start, end, _, class_name in matches:
+        if end <= boundary:
+            selected.append((start, end, class_name))
+            boundary = start
+    
+    # 앞에서부터 조각을 모아 한 번에 결합
+    parts = []
+    cursor = 0
+    for start, end, class_name in reversed(selected):
+        parts.append(text[cursor:start])
+        parts.append(f'<span class="{class_name}">{text[start:end]}</span>')
+        cursor = end
+    parts.append(text[cursor:])
+    
+    return ''.join(parts)
+
+def highlight_all_keywords(text, all_selected_keywords):
+    """모든 선택된 키워드들을 텍스트에서 한번에 하이라이트"""
+    if not text:
+        return text
     
-    return highlighted_text
+    keyword_key = tuple(
+        (category, tuple(sorted(keywords)))
+        for category, keywords in all_selected_keywords.items() if keywords
+    )
+    return render_highlighted_text(str(text), keyword_key, st.session_state.use_word_boundary)
 
 def toggle_keyword_selection(category, keyword):
     """키워드 선택 토글"""
@@ -326,13 +696,15 @@ def update_paper_data():
     human_result = 'include' if has_all_categories else 'exclude'
     
     # DataFrame 업데이트
-    st.session_state.df.at[idx, 'human_depression_keywords'] = human_depression
-    st.session_state.df.at[idx, 'human_mobile_keywords'] = human_mobile
-    st.session_state.df.at[idx, 'human_behavioral_keywords'] = human_behavioral
-    st.session_state.df.at[idx, 'human_result'] = human_result
-    st.session_state.df.at[idx, 'reviewer_name'] = st.session_state.reviewer_name
-    st.session_state.df.at[idx, 'review_status'] = '완료'
-    st.session_state.df.at[idx, 'review_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    set_review_values(idx, {
+        'human_depression_keywords': human_depression,
+        'human_mobile_keywords': human_mobile,
+        'human_behavioral_keywords': human_behavioral,
+        'human_result': human_result,
+        'reviewer_name': st.session_state.reviewer_name,
+        'review_status': '완료',
+        'review_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    })
     
     st.session_state.changes_made = True
 
@@ -396,11 +768,14 @@ def render_sidebar():
             )
             
             if st.button("파일 로드", use_container_width=True):
-                df = load_csv(selected_file)
-                if df is not None:
-                    st.session_state.df = df
+                dataset = load_csv(selected_file)
+                if dataset is not None:
+                    set_base_dataset(dataset)
                     st.session_state.file_path = selected_file
+                    load_review_store(selected_file)
                     st.session_state.current_idx = 0
+                    if len(st.session_state.df):
+                        claim_paper(0)
                     load_current_paper_keywords()
                     st.success("파일이 성공적으로 로드되었습니다!")
                     st.rerun()
@@ -436,11 +811,13 @@ def render_sidebar():
             st.divider()
             st.header("👤 검토자 정보")
             
-            reviewers = ["황가네", "이가네", "김가네", "이방인"]
+            reviewers = REVIEWERS + [OTHER_REVIEWER]
             
             current_index = None
-            if st.session_state.reviewer_name in reviewers:
-                current_index = reviewers.index(st.session_state.reviewer_name)
+            if st.session_state.reviewer_name in REVIEWERS:
+                current_index = REVIEWERS.index(st.session_state.reviewer_name)
+            elif st.session_state.reviewer_name:
+                current_index = reviewers.index(OTHER_REVIEWER)
             
             selected_reviewer = st.radio(
                 "검토자를 선택하세요:",
@@ -449,28 +826,62 @@ def render_sidebar():
                 key="reviewer_radio"
             )
             
-            if selected_reviewer == "기타":
+            if selected_reviewer == OTHER_REVIEWER:
                 custom_name = st.text_input(
                     "검토자 이름 입력:",
-                    value=st.session_state.reviewer_name if st.session_state.reviewer_name not in reviewers[:-1] else "",
+                    value=st.session_state.reviewer_name if st.session_state.reviewer_name not in REVIEWERS else "",
                     key="custom_reviewer_input"
-                )
-                st.session_state.reviewer_name = custom_name
+                ).strip()
+                # 목록의 이름이나 선택지 이름은 다른 검토자와 겹치므로 받지 않음
+                if custom_name in reviewers:
+                    st.warning("목록에 없는 본인 이름을 입력해주세요")
+                    custom_name = ""
+                set_reviewer_name(custom_name)
             else:
-                st.session_state.reviewer_name = selected_reviewer
+                set_reviewer_name(selected_reviewer or "")
+            
+            if not reviewer_ready():
+                st.warning("검토자를 선택하거나 입력해야 논문을 점유하고 검토 결과를 저장할 수 있습니다")
+            
+            # 검토 묶음 (여러 검토자가 겹치지 않게 나눠 검토)
+            st.subheader("📦 검토 묶음")
+            store_progress = current_review_store().progress()
+            st.caption(
+                f"검토 완료 {store_progress['reviewed']}/{store_progress['total']} · "
+                f"점유 중 {store_progress['claimed']}편 · 내 묶음 {len(st.session_state.claimed_rows)}편"
+            )
             
-            if not st.session_state.reviewer_name:
-                st.warning("검토자를 선택하거나 입력해주세요")
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("📥 묶음 받기", use_container_width=True, disabled=not reviewer_ready(),
+                             help=f"다른 검토자와 겹치지 않는 미완료 논문 {CLAIM_BATCH_SIZE}편을 점유합니다"):
+                    claimed = claim_review_batch()
+                    if claimed:
+                        st.session_state.current_idx = claimed[0]
+                        st.session_state.data_page = claimed[0] // 10
+                        load_current_paper_keywords()
+                        st.rerun()
+                    else:
+                        st.info("남은 미완료 논문이 없습니다.")
+            with col2:
+                if st.button("📤 묶음 반납", use_container_width=True, disabled=not st.session_state.claimed_rows):
+                    release_review_batch()
+                    st.rerun()
 
 def render_data_navigation():
     """데이터 목록 네비게이션"""
     st.markdown("## 📋 논문 목록")
     
+    # 다른 검토자가 점유 중이거나 이미 검토해 점유/저장하지 못한 논문 안내
+    for idx, holder in st.session_state.review_conflicts:
+        st.warning(f"#{idx + 1} 논문은 {holder} 님이 검토 중이거나 이미 검토한 논문이라 저장할 수 없습니다.")
+    st.session_state.review_conflicts = []
+    
     # 하이브리드 파일인지 확인
     is_hybrid_file = 'final_result' in st.session_state.df.columns
     
-    # 필터링된 데이터 초기화
-    df = st.session_state.df.copy()
+    # 미리 계산된 필터 인덱스
+    filter_index = st.session_state.filter_index
     
     # 필터링 옵션
     if is_hybrid_file:
@@ -478,16 +889,16 @@ def render_data_navigation():
         with col1:
             status_filter = st.selectbox(
                 "상태 필터",
-                ["전체", "미완료", "완료"],
-                key="status_filter"
+                ["전체", "미완료", "완료", "내 묶음"],
+                key="status_filter",
+                help="내 묶음: '검토 묶음 받기'로 점유한 논문"
             )
         
         with col2:
             # Publication Year 필터
-            all_years = sorted(df['Publication Year'].dropna().unique()) if 'Publication Year' in df.columns else []
             year_filter = st.multiselect(
                 "출간연도 필터",
-                options=all_years,
+                options=filter_index['years'],
                 default=[],
                 key="year_filter"
             )
@@ -503,44 +914,26 @@ def render_data_navigation():
         with col1:
             status_filter = st.selectbox(
                 "상태 필터",
-                ["전체", "미완료", "완료"],
-                key="status_filter"
+                ["전체", "미완료", "완료", "내 묶음"],
+                key="status_filter",
+                help="내 묶음: '검토 묶음 받기'로 점유한 논문"
             )
         
         with col2:
             # Publication Year 필터
-            all_years = sorted(df['Publication Year'].dropna().unique()) if 'Publication Year' in df.columns else []
             year_filter = st.multiselect(
                 "출간연도 필터",
-                options=all_years,
+                options=filter_index['years'],
                 default=[],
                 key="year_filter"
             )
             final_filter = "전체"
     
-    if status_filter != "전체":
-        if status_filter == "완료":
-            df = df[df['review_status'].isin(['완료', 'include', 'exclude'])]
-        else:
-            df = df[df['review_status'] == '미완료']
-    
-    # Publication Year 필터링
-    if year_filter:
-        df = df[df['Publication Year'].isin(year_filter)]
-    
-    if is_hybrid_file and final_filter != "전체":
-        if final_filter == "Include":
-            df = df[df['final_result'] == 'include']
-        elif final_filter == "Exclude":
-            df = df[df['final_result'] == 'exclude']
-        elif final_filter == "불일치":
-            # rule_result와 final_result가 다른 경우
-            rule_col = 'rule_result' if 'rule_result' in df.columns else 'result'
-            df = df[df[rule_col] != df['final_result']]
+    rows = filter_rows(status_filter, year_filter, final_filter)
     
     # 페이지네이션
     items_per_page = 10
-    total_items = len(df)
+    total_items = len(rows)
     total_pages = (total_items + items_per_page - 1) // items_per_page
     
     if 'data_page' not in st.session_state:
@@ -565,7 +958,7 @@ def render_data_navigation():
     # 현재 페이지 데이터
     start_idx = st.session_state.data_page * items_per_page
     end_idx = min(start_idx + items_per_page, total_items)
-    page_data = df.iloc[start_idx:end_idx]
+    page_data = get_rows(rows[start_idx:end_idx])
     
     # 데이터 행들
     for row_idx, row_data in page_data.iterrows():
@@ -584,6 +977,8 @@ def render_data_navigation():
                 type="primary" if is_current else "secondary"
             ):
                 st.session_state.current_idx = row_idx
+                if row_idx not in st.session_state.claimed_rows:
+                    claim_paper(row_idx)
                 load_current_paper_keywords()
                 st.rerun()
         
@@ -682,8 +1077,7 @@ def render_data_navigation():
             st.rerun()
     
     # 진행률
-    total = len(st.session_state.df)
-    completed = (st.session_state.df['review_status'] != '미완료').sum()
+    completed, total = count_completed()
     progress = completed / total if total > 0 else 0
     
     st.progress(progress)
@@ -692,7 +1086,7 @@ def render_data_navigation():
     # 검토 버튼들
     col1, col2 = st.columns(2)
     with col1:
-        if st.button("✅ INCLUDE", use_container_width=True):
+        if st.button("✅ INCLUDE", use_container_width=True, disabled=not reviewer_ready()):
             # INCLUDE로 설정
             st.session_state.selected_keywords = {
                 'depression': {"depression"},
@@ -700,21 +1094,24 @@ def render_data_navigation():
                 'behavioral': {"behavioral activation"}
             }
             current_idx = st.session_state.current_idx
-            st.session_state.df.at[current_idx, 'human_depression_keywords'] = 'depression'
-            st.session_state.df.at[current_idx, 'human_mobile_keywords'] = 'mobile'
-            st.session_state.df.at[current_idx, 'human_behavioral_keywords'] = 'behavioral activation'
-            st.session_state.df.at[current_idx, 'human_result'] = 'include'
-            st.session_state.df.at[current_idx, 'reviewer_name'] = st.session_state.reviewer_name
-            st.session_state.df.at[current_idx, 'review_status'] = 'include'
-            st.session_state.df.at[current_idx, 'review_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            set_review_values(current_idx, {
+                'human_depression_keywords': 'depression',
+                'human_mobile_keywords': 'mobile',
+                'human_behavioral_keywords': 'behavioral activation',
+                'human_result': 'include',
+                'reviewer_name': st.session_state.reviewer_name,
+                'review_status': 'include',
+                'review_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            })
             st.session_state.changes_made = True
             
-            # 자동 저장
-            save_csv(st.session_state.df, st.session_state.file_path)
+            # 자동 저장 (검토 저장소에 기록)
+            save_review_decisions()
             
-            # 다음 순서로 이동 (인덱스+1)
-            if current_idx + 1 < len(st.session_state.df):
-                st.session_state.current_idx = current_idx + 1
+            # 다음 순서로 이동 (검토 묶음을 받았으면 묶음 안의 다음 논문, 아니면 인덱스+1)
+            next_idx = next_paper_idx(current_idx)
+            if next_idx is not None:
+                st.session_state.current_idx = next_idx
                 load_current_paper_keywords()
                 
                 # 페이지 자동 이동 (10개 단위)
@@ -727,7 +1124,7 @@ def render_data_navigation():
             st.rerun()
     
     with col2:
-        if st.button("❌ EXCLUDE", use_container_width=True):
+        if st.button("❌ EXCLUDE", use_container_width=True, disabled=not reviewer_ready()):
             # EXCLUDE로 설정
             st.session_state.selected_keywords = {
                 'depression': set(),
@@ -735,21 +1132,24 @@ def render_data_navigation():
                 'behavioral': set()
             }
             current_idx = st.session_state.current_idx
-            st.session_state.df.at[current_idx, 'human_depression_keywords'] = ''
-            st.session_state.df.at[current_idx, 'human_mobile_keywords'] = ''
-            st.session_state.df.at[current_idx, 'human_behavioral_keywords'] = ''
-            st.session_state.df.at[current_idx, 'human_result'] = 'exclude'
-            st.session_state.df.at[current_idx, 'reviewer_name'] = st.session_state.reviewer_name
-            st.session_state.df.at[current_idx, 'review_status'] = 'exclude'
-            st.session_state.df.at[current_idx, 'review_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            set_review_values(current_idx, {
+                'human_depression_keywords': '',
+                'human_mobile_keywords': '',
+                'human_behavioral_keywords': '',
+                'human_result': 'exclude',
+                'reviewer_name': st.session_state.reviewer_name,
+                'review_status': 'exclude',
+                'review_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            })
             st.session_state.changes_made = True
             
-            # 자동 저장
-            save_csv(st.session_state.df, st.session_state.file_path)
+            # 자동 저장 (검토 저장소에 기록)
+            save_review_decisions()
             
-            # 다음 순서로 이동 (인덱스+1)
-            if current_idx + 1 < len(st.session_state.df):
-                st.session_state.current_idx = current_idx + 1
+            # 다음 순서로 이동 (검토 묶음을 받았으면 묶음 안의 다음 논문, 아니면 인덱스+1)
+            next_idx = next_paper_idx(current_idx)
+            if next_idx is not None:
+                st.session_state.current_idx = next_idx
                 load_current_paper_keywords()
                 
                 # 페이지 자동 이동 (10개 단위)
@@ -762,21 +1162,24 @@ def render_data_navigation():
             st.rerun()
     
     # 재설정 버튼
-    if st.button("🔄 재설정", use_container_width=True, help="현재 논문의 검토 상태를 미완료로 되돌립니다"):
+    if st.button("🔄 재설정", use_container_width=True, disabled=not reviewer_ready(),
+                 help="현재 논문의 검토 상태를 미완료로 되돌립니다"):
         current_idx = st.session_state.current_idx
-        st.session_state.df.at[current_idx, 'human_depression_keywords'] = ''
-        st.session_state.df.at[current_idx, 'human_mobile_keywords'] = ''
-        st.session_state.df.at[current_idx, 'human_behavioral_keywords'] = ''
-        st.session_state.df.at[current_idx, 'human_result'] = ''
-        st.session_state.df.at[current_idx, 'review_status'] = '미완료'
-        st.session_state.df.at[current_idx, 'review_date'] = None
+        set_review_values(current_idx, {
+            'human_depression_keywords': '',
+            'human_mobile_keywords': '',
+            'human_behavioral_keywords': '',
+            'human_result': '',
+            'review_status': '미완료',
+            'review_date': None
+        })
         st.session_state.changes_made = True
         
         # 키워드도 재설정
         load_current_paper_keywords()
         
-        # 자동 저장
-        save_csv(st.session_state.df, st.session_state.file_path)
+        # 자동 저장 (검토 저장소에 기록, 다른 검토자가 끝낸 검토도 되돌림)
+        save_review_decisions(reset_rows={current_idx})
         
         st.success("재설정 완료!")
         st.rerun()
@@ -784,7 +1187,7 @@ def render_data_navigation():
 def render_main_content():
     """메인 컨텐츠 렌더링"""
     idx = st.session_state.current_idx
-    row = st.session_state.df.iloc[idx]
+    row = get_paper_row(idx)
     
     
     # 하이브리드 파일인지 확인
@@ -949,6 +1352,10 @@ def render_main_content():
         )
     
 
+# 다른 검토자가 기록한 결정 반영
+if st.session_state.df is not None:
+    sync_review_store()
+
 # 사이드바 렌더링
 render_sidebar()
 
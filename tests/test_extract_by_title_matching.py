@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+제목 기반 Abstract 추출 테스트
+"""
+
+import csv
+import json
+
+import pytest
+
+from extract_abstract import extract_by_title_matching as matching
+from extract_abstract.extract_by_title_matching import build_feature_store, build_title_features
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "features.json")
+
+def cached_titles(cache_path):
+    with open(cache_path, encoding='utf-8') as f:
+        return set(json.load(f)['titles'])
+
+def test_feature_cache_keeps_only_current_titles(cache_path):
+    build_feature_store({'Old title': {}, 'Shared title': {}}, cache_path)
+    
+    store = build_feature_store({'Shared title': {}, 'New title': {}}, cache_path)
+    
+    assert set(store) == {'Shared title', 'New title'}
+    assert cached_titles(cache_path) == {'Shared title', 'New title'}
+    
+    # 새 제목 없이 제목이 줄기만 해도 캐시에서 빠짐
+    build_feature_store({'New title': {}}, cache_path)
+    assert cached_titles(cache_path) == {'New title'}
+
+def test_feature_cache_discarded_when_settings_change(cache_path, monkeypatch):
+    titles = {'Mobile therapy for depression': {}}
+    build_feature_store(titles, cache_path)
+    
+    # 오래된 특징이 캐시에 남아 있어도 설정이 바뀌면 다시 계산
+    with open(cache_path, encoding='utf-8') as f:
+        data = json.load(f)
+    data['titles']['Mobile therapy for depression'][1] = ['stale']
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    monkeypatch.setattr(matching, 'STOPWORDS', matching.STOPWORDS | {'mobile'})
+    
+    store = build_feature_store(titles, cache_path)
+    
+    assert store['Mobile therapy for depression'] == build_title_features('Mobile therapy for depression')
+    assert 'mobile' not in store['Mobile therapy for depression'].keywords
+    
+    # 예전 형식(제목 -> 특징)의 캐시도 버림
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump({'Mobile therapy for depression': ['stale', [], []]}, f)
+    store = build_feature_store(titles, cache_path)
+    assert store['Mobile therapy for depression'].normalized == 'mobile therapy for depression'
+
+def abstract_record(title, doi='', pmid=''):
+    return {'number': 1, 'title': title, 'abstract': f'Abstract of {title}', 'doi': doi, 'pmid': pmid}
+
+def meta_row(title, doi='', pmid='', abstract=''):
+    return {'DOI': doi, 'PMID': pmid, 'Title': title, 'Abstract': abstract}
+
+def test_match_types_are_recorded_per_row(tmp_path):
+    records = [
+        abstract_record('Identifier matched paper', doi='10.1000/doi-a'),
+        abstract_record('Second identifier paper', doi='10.1000/doi-b'),
+        abstract_record('Smartphone behavioral activation for depression'),
+        abstract_record('Internet delivered cognitive therapy for adolescents with anxiety'),
+        abstract_record('PubMed only paper', pmid='12345'),
+    ]
+    abstracts_dict = {matching.normalize_title(record['title']): record for record in records}
+    meta_data = [
+        meta_row('', doi='https://doi.org/10.1000/DOI-A'),       # DOI, 제목 없음
+        meta_row('Cardiology outcomes', doi='10.1000/doi-b'),  # DOI, 아래 행과 같은 제목
+        meta_row('Cardiology outcomes'),                        # 같은 제목이지만 매칭 없음
+        meta_row('Smartphone Behavioral Activation for Depression.'),
+        meta_row('Internet-delivered cognitive therapy for adolescent anxiety'),
+        meta_row(''),                                           # 제목도 식별자도 없음
+        meta_row('Already has abstract', abstract='Existing abstract'),
+        meta_row('Different title', pmid='12345'),
+    ]
+    
+    matches = matching.match_titles_and_extract(meta_data, abstracts_dict, similarity_threshold=0.7)
+    output_file, _ = matching.save_results(meta_data, matches, str(tmp_path))
+    
+    with open(output_file, encoding='utf-8-sig') as f:
+        output_rows = list(csv.DictReader(f))
+    
+    assert [row['Match_Type'] for row in output_rows] == [
+        'DOI', 'DOI', 'None', 'Exact', 'Fuzzy', 'None', 'Existing', 'PMID'
+    ]
+    assert output_rows[0]['Matched_Title'] == 'Identifier matched paper'
+    assert output_rows[1]['Abstract'] == 'Abstract of Second identifier paper'
+    assert output_rows[2]['Abstract'] == ''
+    assert output_rows[5]['Match_Status'] == 'Failed: Empty title'
+    assert output_rows[4]['Matched_Title'] == 'Internet delivered cognitive therapy for adolescents with anxiety'
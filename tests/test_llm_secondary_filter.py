@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LLMSecondaryFilter 테스트 (가짜 채팅 모델로 LLM 호출 대체)
+"""
+
+import asyncio
+import json
+import os
+import types
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import llm_secondary_filter
+from llm_secondary_filter import (LLMRateLimiter, LLMResponseCache, LLMSecondaryFilter, ReviewJournal,
+                                  RuleEvidenceTriage)
+from result_store import load_results
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """템플릿만 보이는 임시 작업 폴더 (로그/결과 파일이 저장소에 남지 않도록)"""
+    os.symlink(REPO_ROOT / "templates", tmp_path / "templates")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+@pytest.fixture
+def clock(monkeypatch):
+    """llm_secondary_filter 모듈이 보는 가짜 시계 (sleep은 실제로 기다리지 않고 시각만 앞당김)"""
+    fake = types.SimpleNamespace(now=1000.0, sleeps=[])
+    
+    def sleep(seconds):
+        fake.sleeps.append(seconds)
+        fake.now += seconds
+    
+    monkeypatch.setattr(llm_secondary_filter, 'time', types.SimpleNamespace(
+        monotonic=lambda: fake.now, time=lambda: fake.now, sleep=sleep
+    ))
+    return fake
+
+def llm_response(result, reason):
+    return json.dumps({
+        'depression_keywords': 'depression' if result == 'include' else '',
+        'mobile_keywords': 'mobile' if result == 'include' else '',
+        'behavioral_keywords': 'behavioral activation' if result == 'include' else '',
+        'result': result,
+        'depression_highlight': '',
+        'mobile_highlight': '',
+        'behavioral_highlight': '',
+        'reason': reason
+    }, ensure_ascii=False)
+
+def exclude_papers(count):
+    return pd.DataFrame({
+        'DOI': [f'10.1/{i}' for i in range(count)],
+        'Title': [f'Paper {i}' for i in range(count)],
+        'Abstract': [f'Abstract of paper {i}' for i in range(count)],
+        'depression_keywords': '',
+        'mobile_keywords': '',
+        'behavioral_keywords': '',
+        'result': 'exclude'
+    })
+
+def make_filter(responses):
+    llm = FakeListChatModel(responses=responses)
+    return LLMSecondaryFilter(llm=llm, cache_path=None), llm
+
+def test_async_review_keeps_input_order():
+    papers = exclude_papers(6)
+    responses = [llm_response('include', f'답변 {i}') for i in range(len(papers))]
+    filter_system, llm = make_filter(responses)
+    
+    results = filter_system.process_exclude_papers(papers, max_concurrency=4)
+    
+    assert results['Title'].tolist() == papers['Title'].tolist()
+    assert results['DOI'].tolist() == papers['DOI'].tolist()
+    assert sorted(results['llm_reason']) == sorted(f'답변 {i}' for i in range(len(papers)))
+    assert (results['final_result'] == 'include').all()
+    # 논문마다 정확히 한 번 호출 (FakeListChatModel이 응답 목록을 한 바퀴 돌아 처음으로 돌아옴)
+    assert llm.i == 0
+
+def test_async_resume_skips_journaled_papers(workdir):
+    papers = exclude_papers(5)
+    output_file = str(workdir / "results.csv")
+    
+    # 앞의 두 논문은 이전 실행에서 이미 검토됨
+    journal = ReviewJournal(f"{output_file}.journal.jsonl")
+    journaled = {}
+    for idx in range(2):
+        row = papers.iloc[idx]
+        journaled[row['Title']] = {'Title': row['Title'], 'DOI': row['DOI'], 'llm_result': 'include',
+                                   'final_result': 'include', 'llm_reason': '저널'}
+        journal.append(ReviewJournal.paper_id(row), journaled[row['Title']])
+    journal.close()
+    
+    responses = [llm_response('exclude', '새 검토') for _ in range(3)] + [llm_response('include', '초과 호출')]
+    filter_system, llm = make_filter(responses)
+    
+    results = filter_system.process_exclude_papers(papers, output_file, max_concurrency=3)
+    
+    assert llm.i == 3
+    assert results['Title'].tolist() == papers['Title'].tolist()
+    assert results['llm_reason'].tolist() == ['저널', '저널', '새 검토', '새 검토', '새 검토']
+    assert not os.path.exists(f"{output_file}.journal.jsonl")
+
+@pytest.mark.parametrize("as_records", [False, True])
+def test_resume_keeps_duplicate_and_bogus_dois_apart(workdir, as_records):
+    papers = exclude_papers(4)
+    papers['DOI'] = ['Health Canada', 'Health Canada', 'https://doi.org/10.1000/dup', '10.1000/DUP']
+    output_file = str(workdir / "results.csv")
+    
+    # 각 DOI의 첫 번째 논문만 이전 실행에서 검토됨
+    journal = ReviewJournal(f"{output_file}.journal.jsonl")
+    for idx in (0, 2):
+        row = papers.iloc[idx]
+        journal.append(ReviewJournal.paper_id(row), {'Title': row['Title'], 'DOI': row['DOI'],
+                                                     'llm_result': 'include', 'final_result': 'include',
+                                                     'llm_reason': '저널'})
+    journal.close()
+    
+    responses = [llm_response('exclude', '새 검토') for _ in range(2)] + [llm_response('include', '초과 호출')]
+    filter_system, llm = make_filter(responses)
+    
+    if as_records:
+        filter_system.stream_exclude_papers(iter(papers.to_dict('records')), output_file)
+        results = load_results(output_file)
+    else:
+        results = filter_system.process_exclude_papers(papers, output_file)
+    
+    assert llm.i == 2
+    assert results['Title'].tolist() == papers['Title'].tolist()
+    assert results['llm_reason'].tolist() == ['저널', '새 검토', '저널', '새 검토']
+
+def output_rows(path):
+    return len(pd.read_csv(path, encoding='utf-8-sig')) if os.path.exists(path) else 0
+
+@pytest.mark.parametrize("max_concurrency", [1, 2])
+def test_stream_appends_each_window(workdir, max_concurrency):
+    papers = exclude_papers(6)
+    papers.loc[0, 'result'] = 'include'
+    output_file = str(workdir / "results.csv")
+    filter_system, llm = make_filter([llm_response('exclude', f'답변 {i}') for i in range(5)])
+    written_before = []
+    
+    def records():
+        for record in papers.to_dict('records'):
+            # 레코드를 넘기기 직전까지 결과 파일에 기록된 행 수
+            written_before.append(output_rows(output_file))
+            yield record
+    
+    stats = filter_system.stream_exclude_papers(records(), output_file, max_concurrency=max_concurrency)
+    
+    if max_concurrency == 1:
+        # include 논문과 exclude 논문 하나씩 검토가 끝나는 대로 기록
+        assert written_before == [0, 0, 2, 3, 4, 5]
+    else:
+        # 모든 레코드를 받기 전에 앞 창부터 기록
+        assert written_before[-1] > 0
+    results = load_results(output_file)
+    assert results['Title'].tolist() == papers['Title'].tolist()
+    assert results['final_result'].tolist() == ['include'] + ['exclude'] * 5
+    assert stats['rescued_keywords'] == {'depression': [], 'mobile': [], 'behavioral': []}
+    assert {key: stats[key] for key in ('total', 'rule_include', 'llm_processed', 'llm_rescued')} == {
+        'total': 6, 'rule_include': 1, 'llm_processed': 5, 'llm_rescued': 0
+    }
+    assert llm.i == 0
+    assert not os.path.exists(f"{output_file}.journal.jsonl")
+
+def test_stream_rejects_non_csv_output(workdir):
+    filter_system, _ = make_filter([])
+    
+    with pytest.raises(ValueError, match="CSV"):
+        filter_system.stream_exclude_papers(iter([]), str(workdir / "results.parquet"))
+
+def test_invalid_fallback_response_is_not_cached(workdir):
+    partial = json.dumps({'depression_keywords': 'depression', 'reason': '결정 누락'})
+    unknown_label = llm_response('maybe', '알 수 없는 결정')
+    llm = FakeListChatModel(responses=[partial, partial, unknown_label, unknown_label])
+    filter_system = LLMSecondaryFilter(llm=llm, cache_path=str(workdir / "cache.sqlite"))
+    
+    assert filter_system.process_single_article('Paper A', 'Abstract A') is None
+    assert filter_system.process_single_article('Paper B', 'Abstract B') is None
+    assert filter_system.cache.stats()['entries'] == 0
+
+def test_fallback_response_is_validated(workdir):
+    fenced = "결과입니다\n```json\n" + llm_response(' Include ', '재시도') + "\n```"
+    llm = FakeListChatModel(responses=["not json", fenced])
+    filter_system = LLMSecondaryFilter(llm=llm, cache_path=str(workdir / "cache.sqlite"))
+    
+    result = filter_system.process_single_article('Paper A', 'Abstract A')
+    
+    assert result['result'] == 'include'
+    assert result['reason'] == '재시도'
+    assert filter_system.cache.stats()['entries'] == 1
+
+def test_batch_retries_only_invalid_item():
+    items = [dict(json.loads(llm_response('include', f'배치 {i}')), paper_id=str(i)) for i in (1, 2, 3)]
+    del items[1]['reason']
+    batch = json.dumps({'results': items}, ensure_ascii=False)
+    responses = [batch, llm_response('exclude', '단일 재시도'), llm_response('exclude', '초과 호출')]
+    filter_system, llm = make_filter(responses)
+    articles = [{'title': f'Paper {i}', 'abstract': f'Abstract {i}', 'existing_depression': '',
+                 'existing_mobile': '', 'existing_behavioral': ''} for i in range(3)]
+    
+    results = filter_system.process_batch(articles)
+    
+    # 배치 요청 1번 + 검증에 실패한 논문 하나만 단일 요청 1번
+    assert llm.i == 2
+    assert [result['reason'] for result in results] == ['배치 1', '단일 재시도', '배치 3']
+    assert [result['result'] for result in results] == ['include', 'exclude', 'include']
+
+def test_cheap_filter_shares_response_cache(workdir):
+    full_llm = FakeListChatModel(responses=[llm_response('include', '전체 모델')])
+    cheap_llm = FakeListChatModel(responses=[llm_response('exclude', '저렴한 모델')])
+    filter_system = LLMSecondaryFilter(llm=full_llm, cheap_llm=cheap_llm,
+                                       cache_path=str(workdir / "cache.sqlite"), cache_max_entries=10)
+    
+    assert filter_system.cheap_filter.cache is filter_system.cache
+    
+    filter_system.process_single_article('Paper A', 'Abstract A')
+    filter_system.cheap_filter.process_single_article('Paper B', 'Abstract B')
+    
+    assert filter_system.cache.stats()['entries'] == 2
+
+def test_cheap_filter_does_not_share_cache_keys(workdir):
+    full_llm = FakeListChatModel(responses=[llm_response('include', '전체 모델'), llm_response('include', '초과 호출')])
+    cheap_llm = FakeListChatModel(responses=[llm_response('exclude', '저렴한 모델'), llm_response('exclude', '초과 호출')])
+    filter_system = LLMSecondaryFilter(llm=full_llm, cheap_llm=cheap_llm,
+                                       cache_path=str(workdir / "cache.sqlite"), cache_max_entries=10)
+    
+    # 주입된 두 모델 모두 model_name이 없어도 같은 논문의 캐시 항목을 따로 둠
+    assert filter_system.process_single_article('Paper A', 'Abstract A')['reason'] == '전체 모델'
+    assert filter_system.cheap_filter.process_single_article('Paper A', 'Abstract A')['reason'] == '저렴한 모델'
+    assert filter_system.process_single_article('Paper A', 'Abstract A')['reason'] == '전체 모델'
+    assert filter_system.cheap_filter.process_single_article('Paper A', 'Abstract A')['reason'] == '저렴한 모델'
+    
+    assert full_llm.i == 1
+    assert cheap_llm.i == 1
+    assert filter_system.cache.stats()['entries'] == 2
+
+def test_sync_concurrent_review_inside_event_loop_points_to_async_api():
+    papers = exclude_papers(2)
+    filter_system, llm = make_filter([llm_response('include', '비동기') for _ in range(2)])
+    
+    async def run_inside_loop():
+        with pytest.raises(RuntimeError, match="aprocess_exclude_papers"):
+            filter_system.process_exclude_papers(papers, max_concurrency=2)
+        return await filter_system.aprocess_exclude_papers(papers, max_concurrency=2)
+    
+    results = asyncio.run(run_inside_loop())
+    
+    assert results['llm_reason'].tolist() == ['비동기', '비동기']
+
+def test_rate_limiter_waits_for_rpm_window(clock):
+    limiter = LLMRateLimiter("gpt-4o", requests_per_minute=2)
+    
+    assert limiter._reserve(10) == 0
+    clock.now += 1
+    assert limiter._reserve(10) == 0
+    clock.now += 1
+    # 창 안에 이미 2건 -> 첫 요청이 창을 벗어날 때까지 (0초 + 60초 - 2초)
+    assert limiter._reserve(10) == pytest.approx(58)
+    
+    clock.now += 58
+    assert limiter._reserve(10) == 0
+    assert limiter._reserve(10) == pytest.approx(1)
+
+def test_rate_limiter_waits_for_tpm_window(clock):
+    limiter = LLMRateLimiter("gpt-4o", tokens_per_minute=100)
+    
+    assert limiter._reserve(60) == 0
+    clock.now += 10
+    assert limiter._reserve(30) == 0
+    clock.now += 10
+    # 창 안 90 토큰 + 50 토큰 = 40 초과 -> 60 토큰짜리 첫 요청이 빠질 때까지 (60초 - 20초)
+    assert limiter._reserve(50) == pytest.approx(40)
+    
+    clock.now += 40
+    assert limiter._reserve(50) == 0
+    assert limiter._window_tokens == 80
+
+def test_rate_limiter_sends_oversized_request_alone(clock):
+    limiter = LLMRateLimiter("gpt-4o", tokens_per_minute=100)
+    
+    # 예산보다 큰 요청도 창이 비어 있으면 바로 보냄
+    assert limiter._reserve(500) == 0
+    clock.now += 1
+    # 그 뒤 요청은 큰 요청이 창을 벗어날 때까지 대기
+    assert limiter._reserve(10) == pytest.approx(59)
+    
+    clock.now += 59
+    assert limiter._reserve(30) == 0
+    clock.now += 1
+    # 창에 다른 요청이 있으면 큰 요청은 창이 빌 때까지 대기 (예산 전체만큼만 계산)
+    assert limiter._reserve(500) == pytest.approx(59)
+    clock.now += 59
+    assert limiter._reserve(500) == 0
+
+class RateLimitError(Exception):
+    pass
+
+class FlakyChatModel(FakeListChatModel):
+    """처음 failures번은 속도 제한 오류를 내는 가짜 채팅 모델"""
+    failures: int = 1
+    
+    def _call(self, *args, **kwargs):
+        if self.failures > 0:
+            self.failures -= 1
+            raise RateLimitError("429 Too Many Requests")
+        return super()._call(*args, **kwargs)
+
+def test_rate_limit_error_retried_after_jittered_backoff(clock, monkeypatch):
+    monkeypatch.setattr(llm_secondary_filter.random, 'uniform', lambda low, high: high)
+    llm = FlakyChatModel(responses=[llm_response('include', '재시도 성공')])
+    filter_system = LLMSecondaryFilter(llm=llm, cache_path=None)
+    
+    result = filter_system.process_single_article('Paper A', 'Abstract A')
+    
+    assert result['reason'] == '재시도 성공'
+    assert llm.failures == 0
+    # 첫 재시도 백오프 base_delay * 2^0 동안 모든 호출을 멈춘 뒤 다시 보냄
+    assert clock.sleeps == [pytest.approx(filter_system.rate_limiter.base_delay)]
+    
+    # 속도 제한이 아닌 오류는 재시도하지 않음
+    assert not LLMRateLimiter.is_rate_limit_error(ValueError("bad request"))
+    assert LLMRateLimiter.is_rate_limit_error(RateLimitError("slow down"))
+
+def test_response_cache_evicts_least_recently_used(workdir, clock):
+    cache = LLMResponseCache(str(workdir / "cache.sqlite"), max_entries=3)
+    for name in ('a', 'b', 'c'):
+        cache.put(name, 'model', {'result': name})
+        clock.now += 1
+    
+    # 가장 오래된 'a'를 읽어 갱신하면 다음 삭제 대상은 'b'
+    assert cache.get('a') == {'result': 'a'}
+    clock.now += 1
+    cache.put('d', 'model', {'result': 'd'})
+    
+    assert cache.get('b') is None
+    assert [cache.get(name)['result'] for name in ('a', 'c', 'd')] == ['a', 'c', 'd']
+    assert cache.stats() == {'hits': 4, 'misses': 1, 'entries': 3}
+    
+    # 같은 키를 다시 저장해도 항목 수는 늘지 않음
+    cache.put('d', 'model', {'result': 'd'})
+    assert cache.stats()['entries'] == 3
+    cache.close()
+    
+    reopened = LLMResponseCache(str(workdir / "cache.sqlite"), max_entries=3)
+    assert reopened.stats() == {'hits': 0, 'misses': 0, 'entries': 3}
+    reopened.close()
+
+def triage_papers():
+    return pd.DataFrame({
+        'Title': ['Trial A', 'Trial B', 'Trial C', 'Trial D'],
+        'Abstract': [
+            'Heart failure outcomes.',                        # 근거 없음
+            'Patients with low mood.',                        # 유사 어휘 1개
+            'Depressed users of an online program.',          # 규칙 1개(+같은 카테고리 유사 어휘) + 유사 어휘 1개
+            'Depression app with behavioral activation.',     # 규칙 3개
+        ],
+        'depression_keywords': ['', '', 'depression', 'depression'],
+        'mobile_keywords': ['', '', '', 'app'],
+        'behavioral_keywords': ['', '', '', 'behavioral activation'],
+        'result': 'exclude'
+    })
+
+def test_triage_scores_rule_hits_and_near_misses():
+    scores = RuleEvidenceTriage().score(triage_papers())
+    
+    # 규칙 키워드 1점, 유사 어휘만 0.5점, 둘 다 있는 카테고리도 1점
+    assert scores.tolist() == [0.0, 0.5, 1.5, 3.0]
+
+@pytest.mark.parametrize("skip_below, cheap_below, expected", [
+    (1.0, None, ['skip', 'skip', 'full', 'full']),
+    (0.5, 1.5, ['skip', 'cheap', 'full', 'full']),
+    (0.6, 3.0, ['skip', 'skip', 'cheap', 'full']),
+    (0.0, None, ['full', 'full', 'full', 'full']),
+])
+def test_triage_route_thresholds(skip_below, cheap_below, expected):
+    triage = RuleEvidenceTriage(skip_below=skip_below, cheap_below=cheap_below)
+    
+    assert triage.routes(triage_papers()) == expected
+
+def test_triage_stats_accumulate_across_windows():
+    llm = FakeListChatModel(responses=[])
+    filter_system = LLMSecondaryFilter(llm=llm, cache_path=None, triage=RuleEvidenceTriage(skip_below=1.0))
+    papers = triage_papers()
+    
+    routes = filter_system._triage_routes(papers.iloc[:2], accumulate=True)
+    first = dict(filter_system.triage_stats)
+    filter_system._triage_routes(papers.iloc[2:], accumulate=True)
+    
+    assert routes == ['skip', 'skip']
+    assert first['skipped_count'] == 2 and first['estimated_saved_tokens'] > 0
+    assert filter_system.triage_stats == {
+        'skipped_count': 2,
+        'cheap_model_count': 0,
+        'full_review_count': 2,
+        'saved_requests': 2,
+        'estimated_saved_tokens': first['estimated_saved_tokens']
+    }
+    
+    # accumulate가 아니면 새로 계산
+    filter_system._triage_routes(papers.iloc[2:])
+    assert filter_system.triage_stats['skipped_count'] == 0
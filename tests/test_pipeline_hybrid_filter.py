@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HybridFilterPipeline 테스트
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from llm_secondary_filter import LLMSecondaryFilter, RuleEvidenceTriage
+from pipeline_hybrid_filter import HybridFilterPipeline
+from result_store import load_results
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+INCLUDE_ABSTRACT = "A smartphone app delivering behavioral activation for depression."
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """템플릿만 보이는 임시 작업 폴더 (로그/결과 파일이 저장소에 남지 않도록)"""
+    os.symlink(REPO_ROOT / "templates", tmp_path / "templates")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    return tmp_path
+
+@pytest.fixture
+def pipeline():
+    pipeline = HybridFilterPipeline()
+    # 호출되면 응답 목록이 비어 있어 실패하는 가짜 모델
+    pipeline.llm_filter = LLMSecondaryFilter(llm=FakeListChatModel(responses=[]), cache_path=None)
+    return pipeline
+
+def write_input(workdir, titles, abstracts=None):
+    input_file = workdir / "input.csv"
+    pd.DataFrame({
+        'DOI': [f'10.1/{i}' for i in range(len(titles))],
+        'Title': titles,
+        'Abstract': abstracts if abstracts is not None else [INCLUDE_ABSTRACT] * len(titles)
+    }, columns=['DOI', 'Title', 'Abstract']).to_csv(input_file, index=False, encoding='utf-8-sig')
+    return str(input_file)
+
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_empty_input_produces_final_schema(workdir, pipeline, chunk_size):
+    results = pipeline.run_pipeline(write_input(workdir, []), str(workdir / "output"), chunk_size=chunk_size)
+    
+    final_df = load_results(results['final_output_file'])
+    assert len(final_df) == 0
+    assert {'rule_result', 'llm_result', 'final_result', 'llm_reason'} <= set(final_df.columns)
+    assert results['pipeline_summary']['final_results']['include_count'] == 0
+
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_all_include_input_skips_llm(workdir, pipeline, chunk_size):
+    titles = [f'Mobile depression trial {i}' for i in range(3)]
+    
+    results = pipeline.run_pipeline(write_input(workdir, titles), str(workdir / "output"), chunk_size=chunk_size)
+    
+    final_df = load_results(results['final_output_file'])
+    assert final_df['Title'].tolist() == titles
+    assert (final_df['rule_result'] == 'include').all()
+    assert (final_df['llm_result'] == 'not_processed').all()
+    assert (final_df['final_result'] == 'include').all()
+    assert final_df['rule_mobile_keywords'].tolist() == final_df['mobile_keywords'].tolist()
+    summary = results['pipeline_summary']
+    assert summary['final_results']['include_count'] == 3
+    assert summary['llm_secondary_results']['processed_count'] == 0
+
+@pytest.mark.parametrize("chunk_size", [None, 1])
+def test_triage_stats_in_pipeline_summary(workdir, pipeline, chunk_size):
+    rescued = json.dumps({
+        'depression_keywords': 'depression', 'mobile_keywords': 'mobile',
+        'behavioral_keywords': 'behavioral activation', 'result': 'include',
+        'depression_highlight': '', 'mobile_highlight': '', 'behavioral_highlight': '', 'reason': '구제'
+    })
+    llm = FakeListChatModel(responses=[rescued])
+    pipeline.llm_filter = LLMSecondaryFilter(llm=llm, cache_path=None, triage=RuleEvidenceTriage(skip_below=1.0))
+    input_file = write_input(workdir, ['Included', 'Near miss', 'Unrelated', 'Also unrelated'], [
+        INCLUDE_ABSTRACT,
+        'Depression and mobile phone use.',  # 규칙 키워드 2개 -> LLM 검토
+        'Heart failure outcomes.',           # 근거 없음 -> 생략
+        'Renal function in adults.',         # 근거 없음 -> 생략
+    ])
+    
+    results = pipeline.run_pipeline(input_file, str(workdir / "output"), chunk_size=chunk_size)
+    
+    summary = results['pipeline_summary']
+    assert summary['triage']['enabled'] is True
+    assert summary['triage']['skipped_count'] == 2
+    assert summary['triage']['full_review_count'] == 1
+    assert summary['triage']['estimated_saved_tokens'] > 0
+    assert summary['llm_secondary_results'] == {'processed_count': 1, 'rescued_count': 1, 'rescue_rate': 100.0}
+    final_df = load_results(results['final_output_file'])
+    assert final_df['llm_result'].tolist() == ['not_processed', 'include', 'skipped', 'skipped']
+
+@pytest.mark.parametrize("max_concurrency", [1, 2])
+def test_chunked_pipeline_writes_final_results_per_chunk(workdir, pipeline, max_concurrency, monkeypatch):
+    unrelated = json.dumps({
+        'depression_keywords': '', 'mobile_keywords': '', 'behavioral_keywords': '', 'result': 'exclude',
+        'depression_highlight': '', 'mobile_highlight': '', 'behavioral_highlight': '', 'reason': '무관'
+    })
+    pipeline.llm_filter = LLMSecondaryFilter(llm=FakeListChatModel(responses=[unrelated]), cache_path=None)
+    titles = ['Included', 'Unrelated 1', 'Also included'] + [f'Unrelated {i}' for i in range(2, 9)]
+    abstracts = [INCLUDE_ABSTRACT, 'Heart failure outcomes.', INCLUDE_ABSTRACT] + ['Renal function.'] * 7
+    output_dir = workdir / "output"
+    
+    # 규칙 기반 청크를 넘길 때마다 그때까지 최종 결과 파일에 기록된 행 수
+    written_before = []
+    iter_csv_stream = pipeline.rule_filter.iter_csv_stream
+    
+    def recording_stream(*args, **kwargs):
+        for chunk_result in iter_csv_stream(*args, **kwargs):
+            final_files = list(output_dir.glob("hybrid_final_results_*.csv"))
+            written_before.append(len(load_results(str(final_files[0]))) if final_files else 0)
+            yield chunk_result
+    
+    monkeypatch.setattr(pipeline.rule_filter, 'iter_csv_stream', recording_stream)
+    
+    results = pipeline.run_pipeline(write_input(workdir, titles, abstracts), str(output_dir), chunk_size=1,
+                                    result_format="parquet", max_concurrency=max_concurrency)
+    
+    if max_concurrency == 1:
+        # include 논문은 다음 exclude 논문 검토가 끝날 때 함께 기록
+        assert written_before == [0, 0, 2, 2, 4, 5, 6, 7, 8, 9]
+    else:
+        # 진행 중인 창이 max_concurrency * 2개를 넘으면 앞 창부터 기록
+        assert written_before[-1] > 0
+    # 스트리밍 모드의 최종 결과는 항상 CSV
+    assert results['final_output_file'].endswith('.csv')
+    final_df = load_results(results['final_output_file'])
+    assert final_df['Title'].tolist() == titles
+    assert final_df['final_result'].tolist() == ['include', 'exclude', 'include'] + ['exclude'] * 7
+    summary = results['pipeline_summary']
+    assert summary['final_results']['include_count'] == 2
+    assert summary['final_results']['include_rate'] == 20.0
+    assert summary['llm_secondary_results']['processed_count'] == 8
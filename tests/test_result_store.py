@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+결과 저장소(result_store) 테스트
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import result_store
+from result_store import (CATEGORICAL_COLUMNS, load_results, register_result_format, result_path,
+                          save_results, typed_results)
+
+pytest.importorskip("pyarrow")
+
+def final_results():
+    return pd.DataFrame({
+        'DOI': ['10.1000/a', '10.1000/b', np.nan],
+        'Title': ['Mobile depression trial', 'Heart failure', 'Low mood app'],
+        'Publication Year': [2020, '2021', np.nan],  # 문자열과 숫자가 섞인 컬럼
+        'result': ['include', 'exclude', 'exclude'],
+        'rule_result': ['include', 'exclude', 'exclude'],
+        'llm_result': ['not_processed', 'skipped', 'include'],
+        'final_result': ['include', 'exclude', 'include'],
+        'llm_reason': ['이미 규칙 기반에서 포함됨', '', '구제'],
+    })
+
+def test_typed_results_categorizes_decision_columns():
+    typed = typed_results(final_results())
+    
+    for column in CATEGORICAL_COLUMNS:
+        assert isinstance(typed[column].dtype, pd.CategoricalDtype)
+    assert typed['Publication Year'].tolist()[:2] == ['2020', '2021']
+    assert pd.isna(typed['Publication Year'].iloc[2])
+    assert typed['Title'].dtype == object
+
+@pytest.mark.parametrize("result_format", ['parquet', 'feather'])
+def test_arrow_round_trip_keeps_categorical_columns(tmp_path, result_format):
+    df = final_results()
+    path = result_path(str(tmp_path / "hybrid_final_results"), result_format)
+    
+    csv_copy = save_results(df, path, export_csv=True)
+    loaded = load_results(path)
+    
+    assert path.endswith(f'.{result_format}')
+    for column in CATEGORICAL_COLUMNS:
+        assert isinstance(loaded[column].dtype, pd.CategoricalDtype)
+        assert loaded[column].astype(str).tolist() == df[column].tolist()
+    pd.testing.assert_frame_equal(loaded, typed_results(df), check_categorical=False)
+    
+    # 검토자용 CSV 사본은 같은 값을 평범한 문자열로 담음
+    assert csv_copy == str(tmp_path / "hybrid_final_results.csv")
+    assert load_results(csv_copy)['final_result'].tolist() == df['final_result'].tolist()
+
+def test_csv_results_have_no_copy(tmp_path):
+    path = result_path(str(tmp_path / "rule_based_results"), 'csv')
+    
+    assert save_results(final_results(), path, export_csv=True) is None
+    assert load_results(path)['llm_result'].tolist() == ['not_processed', 'skipped', 'include']
+
+def test_format_registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_store, 'RESULT_FORMATS', dict(result_store.RESULT_FORMATS))
+    written = {}
+    register_result_format(['.TSV'], lambda path: written[path],
+                           lambda df, path: written.__setitem__(path, df))
+    df = final_results()
+    
+    save_results(df, str(tmp_path / "results.tsv"))
+    
+    assert load_results(str(tmp_path / "results.tsv")) is df
+    with pytest.raises(ValueError, match="지원하지 않는 결과 파일 형식"):
+        load_results(str(tmp_path / "results.xlsx"))
+    with pytest.raises(ValueError, match="지원하지 않는 결과 형식"):
+        result_path(str(tmp_path / "results"), 'xlsx')
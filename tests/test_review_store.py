@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ReviewStore 테스트 (같은 SQLite 파일을 여는 여러 연결 = 여러 검토자 세션)
+"""
+
+import time
+
+import pytest
+
+from review_store import ReviewStore
+
+PAPER_IDS = [f"doi:10.1/{i}" for i in range(30)]
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "results.csv.reviews.sqlite")
+    store = ReviewStore(path)
+    store.register_papers(PAPER_IDS, ['미완료'] * len(PAPER_IDS))
+    store.close()
+    return path
+
+@pytest.fixture
+def stores(db_path):
+    opened = []
+    
+    def open_store(lease_seconds=600.0):
+        store = ReviewStore(db_path, lease_seconds=lease_seconds)
+        opened.append(store)
+        return store
+    
+    yield open_store
+    for store in opened:
+        store.close()
+
+def include(reviewer):
+    return {'review_status': 'include', 'human_result': 'include', 'reviewer_name': reviewer}
+
+def exclude(reviewer):
+    return {'review_status': 'exclude', 'human_result': 'exclude', 'reviewer_name': reviewer}
+
+def test_claim_batch_is_disjoint_across_connections(stores):
+    store_a, store_b = stores(), stores()
+    
+    batch_a = store_a.claim_batch('A', 10)
+    batch_b = store_b.claim_batch('B', 10)
+    
+    assert len(batch_a) == 10
+    assert len(batch_b) == 10
+    assert not set(batch_a) & set(batch_b)
+    # 다시 받으면 이미 점유한 묶음을 그대로 돌려받음
+    assert store_a.claim_batch('A', 10) == batch_a
+
+def test_expired_claim_is_taken_over(stores):
+    store_a = stores(lease_seconds=0.05)
+    store_b = stores()
+    
+    batch_a = store_a.claim_batch('A', 5)
+    assert not set(store_b.claim_batch('B', 5)) & set(batch_a)
+    store_b.release('B')
+    
+    time.sleep(0.1)
+    assert store_b.claim_batch('B', 5) == batch_a
+    assert store_a.claimed_by('A') == []
+
+def test_record_decision_rejected_on_claimed_paper(stores):
+    store_a, store_b = stores(), stores()
+    paper_id = store_a.claim_batch('A', 1)[0]
+    
+    assert store_b.record_decision(paper_id, 'B', exclude('B')) == 'A'
+    assert store_b.get(paper_id) is None
+    
+    assert store_a.record_decision(paper_id, 'A', include('A')) is None
+    assert store_b.get(paper_id)['review_status'] == 'include'
+
+def test_record_decision_unknown_paper(stores):
+    with pytest.raises(KeyError):
+        stores().record_decision('doi:none', 'A', include('A'))
+
+def test_decisions_since_seq(stores):
+    store_a, store_b = stores(), stores()
+    store_a.record_decision(PAPER_IDS[0], 'A', include('A'))
+    seen = store_b.last_seq()
+    
+    store_a.record_decision(PAPER_IDS[1], 'A', exclude('A'))
+    store_a.record_decision(PAPER_IDS[2], 'A', include('A'))
+    
+    newer = store_b.decisions(seen)
+    assert [paper_id for paper_id, _, _ in newer] == PAPER_IDS[1:3]
+    assert all(seq > seen for _, _, seq in newer)
+    assert store_b.decisions(store_b.last_seq()) == []
+    assert len(store_b.decisions()) == 3
+
+def test_reviewed_paper_not_overwritten_by_other_reviewer(stores):
+    store_a, store_b = stores(), stores()
+    paper_id = PAPER_IDS[0]
+    
+    assert store_a.record_decision(paper_id, 'A', include('A')) is None
+    assert store_b.record_decision(paper_id, 'B', exclude('B')) == 'A'
+    assert store_b.get(paper_id)['review_status'] == 'include'
+    assert store_b.claim(paper_id, 'B') == 'A'
+    
+    # 검토한 본인은 고칠 수 있음
+    assert store_a.record_decision(paper_id, 'A', exclude('A')) is None
+    assert store_b.get(paper_id)['review_status'] == 'exclude'
+    
+    # 재설정은 다른 검토자의 검토도 되돌림
+    assert store_b.record_decision(paper_id, 'B', {'review_status': '미완료'}, reset=True) is None
+    assert store_b.record_decision(paper_id, 'B', include('B')) is None
+    assert store_a.get(paper_id)['reviewer_name'] == 'B'
+
+def test_single_claim_blocks_other_reviewer(stores):
+    store_a, store_b = stores(), stores()
+    paper_id = PAPER_IDS[3]
+    
+    assert store_a.claim(paper_id, 'A', lease_seconds=60) is None
+    assert store_b.claim(paper_id, 'B') == 'A'
+    assert store_b.record_decision(paper_id, 'B', include('B')) == 'A'
+    assert store_b.record_decision(paper_id, 'B', {'review_status': '미완료'}, reset=True) == 'A'
+    assert paper_id not in store_b.claim_batch('B', len(PAPER_IDS))
+    
+    assert store_a.record_decision(paper_id, 'A', include('A')) is None
+    assert store_a.claimed_by('A') == []
+
+@pytest.mark.parametrize("reviewer", ["", "   ", None])
+def test_unnamed_reviewer_rejected(stores, reviewer):
+    store = stores()
+    
+    with pytest.raises(ValueError):
+        store.claim(PAPER_IDS[0], reviewer)
+    with pytest.raises(ValueError):
+        store.claim_batch(reviewer, 5)
+    with pytest.raises(ValueError):
+        store.record_decision(PAPER_IDS[0], reviewer, include(reviewer))
+    assert store.progress()['claimed'] == 0
+    assert store.get(PAPER_IDS[0]) is None
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RuleBasedKeywordFilter / KeywordMatcher 테스트
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rule_based_filter import KeywordMatcher, RuleBasedKeywordFilter, _cohen_kappa, compare_results
+
+TEXTS = [
+    # 겹치는 키워드 (구문과 그 안의 단일 단어, 와일드카드 중복)
+    "Digital therapeutics and a mobile application for depressive disorder and depression",
+    "Behavioral therapy, behavioural therapy and Behavioral Therapy with behavioral activation",
+    # 키워드 순서와 텍스트 등장 순서가 다른 경우
+    "mHealth app on android and iPhone; smartphone application; mobile first",
+    # 행 경계: 앞 행 끝과 다음 행 시작의 키워드가 이어 붙지 않아야 함
+    "ends with behavioral",
+    "intervention starts this row",
+    "app",
+    "",
+    np.nan,
+    "nan",
+    "activity scheduling, activity schedules and Activity Scheduled tasks",
+    "applications and apps are not the app keyword; undepression",
+    "ı casefold behavıoral therapy",
+]
+
+INCLUDE_ABSTRACT = "A smartphone app delivering behavioral activation for depression."
+
+@pytest.fixture(scope="module")
+def filter_system():
+    return RuleBasedKeywordFilter()
+
+def test_scan_column_matches_scan(filter_system):
+    matcher = filter_system.matcher
+    texts = pd.Series(TEXTS, index=range(100, 100 + len(TEXTS)))
+    
+    column_results = matcher.scan_column(texts)
+    
+    for category in matcher.categories:
+        assert column_results[category].index.equals(texts.index)
+        expected = [', '.join(matcher.scan(str(text), with_sentences=False)[category][0]) for text in TEXTS]
+        assert column_results[category].tolist() == expected
+
+def test_scan_column_respects_row_separator():
+    matcher = KeywordMatcher({'terms': (['a b'], [r"\bx\w*\s+y\w*"])})
+    texts = pd.Series(['a', 'b', 'x', 'y', 'a b', 'xx yy'])
+    
+    found = matcher.scan_column(texts)['terms']
+    
+    assert found.tolist() == ['', '', '', '', 'a b', 'xx yy']
+    assert KeywordMatcher.ROW_SEPARATOR not in ''.join(found)
+
+def test_process_dataframe_defaults_to_vectorized(filter_system, capsys):
+    df = pd.DataFrame({
+        'DOI': ['10.1/a', '10.1/b', np.nan],
+        'Title': ['Behavioral activation app for depression', np.nan, ''],
+        'Abstract': ['A mobile trial.', 'Depression only', np.nan],
+    })
+    
+    vectorized = filter_system.process_dataframe(df)
+    assert capsys.readouterr().out == ''
+    per_row = filter_system.process_dataframe(df, vectorized=False)
+    
+    pd.testing.assert_frame_equal(vectorized, per_row, check_dtype=False)
+    assert vectorized['result'].tolist() == ['include', 'exclude', 'exclude']
+
+def results_frame(dois, results, keywords=''):
+    return pd.DataFrame({
+        'DOI': dois,
+        'Title': [f'Paper {doi}' for doi in dois],
+        'result': results,
+        'depression_keywords': keywords,
+        'mobile_keywords': '',
+        'behavioral_keywords': ''
+    })
+
+def test_compare_results_perfect_agreement():
+    dois = [f'10.1000/{i}' for i in range(4)]
+    results = ['include', 'exclude', 'include', 'exclude']
+    
+    comparison = compare_results(results_frame(dois, results), results_frame(dois[::-1], results[::-1]))
+    
+    assert comparison['total_papers'] == 4
+    assert comparison['result_accuracy'] == 100.0
+    assert comparison['cohen_kappa'] == pytest.approx(1.0)
+    assert comparison['confusion_matrix'].loc['include', 'include'] == 2
+
+def test_compare_results_chance_level_kappa():
+    # LLM 절반 include, 규칙 절반 include이고 서로 독립 -> 관측 일치 0.5 = 기대 일치 0.5
+    dois = [f'10.1000/{i}' for i in range(4)]
+    llm_df = results_frame(dois, ['include', 'include', 'exclude', 'exclude'])
+    rule_df = results_frame(dois, ['include', 'exclude', 'include', 'exclude'])
+    
+    comparison = compare_results(llm_df, rule_df)
+    
+    assert comparison['result_matches'] == 2
+    assert comparison['cohen_kappa'] == pytest.approx(0.0)
+
+def test_compare_results_single_class_kappa():
+    # 모든 판정이 한 클래스이면 기대 일치가 1이라 kappa 분모가 0
+    dois = [f'10.1000/{i}' for i in range(3)]
+    
+    comparison = compare_results(results_frame(dois, ['exclude'] * 3), results_frame(dois, ['exclude'] * 3))
+    
+    assert comparison['cohen_kappa'] == 1.0
+    # 비교할 논문이 없으면 정의되지 않음
+    assert np.isnan(_cohen_kappa(pd.DataFrame([[0, 0], [0, 0]])))
+
+def test_compare_results_pairs_duplicate_keys_by_occurrence():
+    dois = ['10.1000/dup', '10.1000/dup', '10.1000/only-llm']
+    llm_df = results_frame(dois, ['include', 'exclude', 'include'], keywords=['depression', '', ''])
+    rule_df = results_frame(['10.1000/dup', '10.1000/dup'], ['include', 'include'],
+                            keywords=['depression, depressive symptoms', 'depression'])
+    
+    comparison = compare_results(llm_df, rule_df)
+    
+    assert comparison['total_papers'] == 2
+    assert comparison['unmatched_llm'] == 1
+    assert comparison['unmatched_rule'] == 0
+    assert comparison['detailed_comparison']['result_match'].tolist() == [True, False]
+    assert comparison['detailed_comparison']['depression_jaccard'].tolist() == [0.5, 0.0]
+    # 관측 일치 1/2, 기대 일치 (1/2 * 1 + 1/2 * 0) = 1/2 -> kappa 0
+    assert comparison['cohen_kappa'] == pytest.approx(0.0)
+
+def write_papers(tmp_path, count=5):
+    input_file = tmp_path / "input.csv"
+    texts = [text for text in TEXTS if isinstance(text, str)]
+    pd.DataFrame({
+        'DOI': [f'10.1000/{i}' for i in range(count)],
+        'Title': [texts[i % len(texts)] for i in range(count)],
+        'Abstract': [INCLUDE_ABSTRACT if i % 2 else texts[(i + 1) % len(texts)] if i % 4 else ''
+                     for i in range(count)],
+        'Publication Year': [str(2000 + i) for i in range(count)],
+    }).to_csv(input_file, index=False, encoding='utf-8-sig')
+    return input_file
+
+def read_papers(path):
+    return pd.read_csv(path, encoding='utf-8-sig', dtype=str)
+
+def read_papers_like(df, tmp_path):
+    """한 번에 저장했을 때와 같은 CSV를 다시 읽은 결과"""
+    path = tmp_path / "expected.csv"
+    df.to_csv(path, index=False, encoding='utf-8-sig')
+    return read_papers(path)
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_csv_stream_matches_process_dataframe(filter_system, tmp_path, workers):
+    input_file = write_papers(tmp_path)
+    output_file = tmp_path / "output.csv"
+    expected = filter_system.process_dataframe(read_papers(input_file))
+    
+    # 5행을 2행씩 -> 마지막 청크는 1행
+    chunks = list(filter_system.iter_csv_stream(str(input_file), str(output_file), chunk_size=2,
+                                                workers=workers))
+    
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+    pd.testing.assert_frame_equal(read_papers(output_file), read_papers_like(expected, tmp_path))
+    
+    # BOM과 헤더는 파일 맨 앞에 한 번만
+    raw = output_file.read_bytes()
+    assert raw.startswith(b'\xef\xbb\xbf') and raw.count(b'\xef\xbb\xbf') == 1
+    header = raw[3:].split(b'\r\n' if b'\r\n' in raw else b'\n')[0]
+    assert raw.count(header) == 1
+    
+    stats = filter_system.process_csv_stream(str(input_file), str(output_file), chunk_size=2,
+                                             workers=workers)
+    assert stats == {'total': 5, 'include': int((expected['result'] == 'include').sum()),
+                     'exclude': int((expected['result'] == 'exclude').sum())}
+    pd.testing.assert_frame_equal(read_papers(output_file), read_papers_like(expected, tmp_path))
+
+def test_process_dataframe_parallel_matches_process_dataframe(filter_system, tmp_path):
+    df = read_papers(write_papers(tmp_path, count=7))
+    df.index = range(100, 107)
+    
+    parallel = filter_system.process_dataframe_parallel(df, workers=2, chunk_size=3)
+    
+    pd.testing.assert_frame_equal(parallel, filter_system.process_dataframe(df))